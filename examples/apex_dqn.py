@@ -0,0 +1,98 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Ape-X DQN on a single host, with a throughput comparison against the single-process runner.
+
+Usage:
+
+    python examples/apex_dqn.py minimal -w 4 -u 5000 --baseline
+    python examples/apex_dqn.py CartPole-v0 -c examples/configs/dqn_agent.json -n examples/configs/dqn_network.json -w 8
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+from functools import partial
+import time
+
+import numpy as np
+
+from tensorforce import Configuration
+from tensorforce.agents import DQNAgent
+from tensorforce.core.networks import from_json, layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import ApeXRunner, Runner
+
+
+def create_environment(gym_id):
+    if gym_id == 'minimal':
+        return MinimalTest(definition=False)
+    else:
+        from tensorforce.contrib.openai_gym import OpenAIGym
+        return OpenAIGym(gym_id)
+
+
+def create_agent(args, environment):
+    if args.agent_config:
+        config = Configuration.from_json(args.agent_config)
+    else:
+        config = Configuration(batch_size=32, learning_rate=0.001, first_update=1000, target_update_frequency=1000)
+    if args.network_config:
+        network = from_json(args.network_config)
+    else:
+        network = layered_network_builder([dict(type='dense', size=64), dict(type='dense', size=64)])
+    config.default(dict(states=environment.states, actions=environment.actions, network=network))
+    return DQNAgent(config=config)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('gym_id', help="ID of the gym environment, or 'minimal' for the minimal test environment")
+    parser.add_argument('-c', '--agent-config', help="Agent configuration file")
+    parser.add_argument('-n', '--network-config', help="Network configuration file")
+    parser.add_argument('-w', '--actors', type=int, default=4, help="Number of actor processes")
+    parser.add_argument('-u', '--updates', type=int, default=10000, help="Number of learner updates")
+    parser.add_argument('-m', '--memory-capacity', type=int, default=100000, help="Replay memory capacity")
+    parser.add_argument('-t', '--max-timesteps', type=int, default=2000, help="Maximum number of timesteps per episode")
+    parser.add_argument('-b', '--baseline', action='store_true', default=False, help="Compare with the single-process runner")
+    args = parser.parse_args()
+
+    environment_fn = partial(create_environment, args.gym_id)
+
+    agent = create_agent(args=args, environment=environment_fn())
+    runner = ApeXRunner(agent=agent, environment_fn=environment_fn, num_actors=args.actors, memory_capacity=args.memory_capacity)
+    start = time.time()
+    runner.run(updates=args.updates, max_timesteps=args.max_timesteps)
+    duration = time.time() - start
+    print('Ape-X ({} actors): {:.0f} timesteps/s, {:.0f} updates/s, {} episodes, mean reward of last 100 episodes {:.2f}'.format(
+        args.actors, runner.total_timesteps / duration, runner.updates / duration, runner.episode, np.mean(runner.episode_rewards[-100:])))
+
+    if args.baseline:
+        # Single-process runner for the same wall-clock time
+        environment = environment_fn()
+        agent = create_agent(args=args, environment=environment)
+        baseline = Runner(agent=agent, environment=environment)
+        start = time.time()
+        baseline.run(episodes=(10 ** 9), max_timesteps=args.max_timesteps, episode_finished=(lambda r: time.time() - start < duration))
+        baseline_duration = time.time() - start
+        print('Runner: {:.0f} timesteps/s, {:.0f} updates/s, {} episodes, mean reward of last 100 episodes {:.2f}'.format(
+            baseline.total_timesteps / baseline_duration, agent.model.updates / baseline_duration, baseline.episode, np.mean(baseline.episode_rewards[-100:])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Benchmarks discounting and GAE reward estimation against the per-step Python loop.
+
+Usage:
+
+    python examples/benchmark_reward_estimation.py --steps 100000 --episode-length 200
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import timeit
+
+import numpy as np
+
+from tensorforce import util
+
+
+def loop_cumulative_discount(values, terminals, discount):
+    discounted_values = np.zeros(len(values))
+    cumulative = 0.0
+    for n, (value, terminal) in reversed(list(enumerate(zip(values, terminals)))):
+        if terminal:
+            cumulative = 0.0
+        cumulative = value + cumulative * discount
+        discounted_values[n] = cumulative
+    return discounted_values
+
+
+def loop_gae(rewards, terminals, state_values, discount, gae_lambda):
+    td_residuals = rewards + np.array(
+        [discount * state_values[n + 1] - state_values[n] if (n < len(state_values) - 1 and not terminal) else 0.0 for n, terminal in enumerate(terminals)])
+    return loop_cumulative_discount(values=td_residuals, terminals=terminals, discount=(discount * gae_lambda))
+
+
+def vectorized_gae(rewards, terminals, state_values, discount, gae_lambda):
+    td_residuals = util.gae_td_residuals(rewards=rewards, terminals=terminals, state_values=state_values, discount=discount)
+    return util.cumulative_discount(values=td_residuals, terminals=terminals, discount=(discount * gae_lambda))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--steps', type=int, default=100000, help="Number of steps per batch")
+    parser.add_argument('-l', '--episode-length', type=int, default=200, help="Mean episode length")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="Number of timed repetitions")
+    args = parser.parse_args()
+
+    random = np.random.RandomState(0)
+    rewards = random.randn(args.steps)
+    terminals = random.uniform(size=args.steps) < (1.0 / args.episode_length)
+    state_values = random.randn(args.steps)
+
+    benchmarks = [
+        ('cumulative_discount', lambda: loop_cumulative_discount(rewards, terminals, 0.99), lambda: util.cumulative_discount(rewards, terminals, 0.99)),
+        ('gae', lambda: loop_gae(rewards, terminals, state_values, 0.99, 0.97), lambda: vectorized_gae(rewards, terminals, state_values, 0.99, 0.97))
+    ]
+    for name, loop, vectorized in benchmarks:
+        assert np.allclose(loop(), vectorized())
+        loop_time = min(timeit.repeat(loop, number=1, repeat=args.repeat))
+        vectorized_time = min(timeit.repeat(vectorized, number=1, repeat=args.repeat))
+        print('{}: loop {:.4f}s, vectorized {:.4f}s, speedup {:.1f}x'.format(name, loop_time, vectorized_time, loop_time / vectorized_time))
+
+
+if __name__ == '__main__':
+    main()
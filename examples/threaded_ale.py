@@ -31,7 +31,7 @@ import numpy as np
 from tensorforce import Configuration
 from tensorforce.agents import agents as AgentsDictionary
 from tensorforce.core.networks import from_json
-from tensorforce.execution import ThreadedRunner
+from tensorforce.execution import ThreadedRunner, InferenceServer
 from tensorforce.contrib.ale import ALE
 
 
@@ -64,6 +64,7 @@ def main():
     parser.add_argument('-s', '--save', help="Save agent to this dir")
     parser.add_argument('-se', '--save-episodes', type=int, default=100, help="Save agent every x episodes")
     parser.add_argument('-l', '--load', help="Load agent from this dir")
+    parser.add_argument('-bi', '--batch-inference', action='store_true', default=False, help="Batch action requests of all workers")
     parser.add_argument('-D', '--debug', action='store_true', default=False, help="Show debug outputs")
 
     args = parser.parse_args()
@@ -143,14 +144,22 @@ def main():
             logger.info("Average of last 100 rewards: {}".format(sum(reward_list[-100:]) / 100))
         logger.info('=' * 40)
 
+    if args.batch_inference:
+        inference_server = InferenceServer(model=agent.model, max_batch_size=args.workers)
+    else:
+        inference_server = None
+
     # create runners
     threaded_runner = ThreadedRunner(agents, environments, repeat_actions=1,
-                                     save_path=args.save, save_episodes=args.save_episodes)
+                                     save_path=args.save, save_episodes=args.save_episodes,
+                                     inference_server=inference_server)
 
     logger.info("Starting {agent} for Environment '{env}'".format(agent=agent, env=environments[0]))
     threaded_runner.run(summary_interval=100, episode_finished=episode_finished, summary_report=summary_report)
     logger.info("Learning finished. Total episodes: {ep}".format(ep=threaded_runner.global_episode))
 
+    if inference_server is not None:
+        inference_server.close()
     [environments[t].close() for t in range(args.workers)]
 
 
@@ -25,6 +25,7 @@ install_requires=[
     'numpy',
     'six',
     'scipy',
+    'futures; python_version < "3"',
     'pillow',
     'pytest'
 ]
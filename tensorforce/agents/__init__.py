@@ -25,6 +25,7 @@ from tensorforce.agents.dqfd_agent import DQFDAgent
 from tensorforce.agents.ppo_agent import PPOAgent
 from tensorforce.agents.categorical_dqn_agent import CategoricalDQNAgent
 from tensorforce.agents.dqn_nstep_agent import DQNNstepAgent
+from tensorforce.agents.vtrace_agent import VTraceAgent
 
 
 agents = dict(
@@ -37,9 +38,10 @@ agents = dict(
     PPOAgent=PPOAgent,
     CategoricalDQNAgent=CategoricalDQNAgent,
     DQNNstepAgent=DQNNstepAgent,
+    VTraceAgent=VTraceAgent,
 )
 
 
 __all__ = ['Agent', 'BatchAgent', 'MemoryAgent', 'RandomAgent', 'VPGAgent',
            'TRPOAgent', 'DQNAgent', 'NAFAgent', 'DQFDAgent', 'CategoricalDQNAgent',
-           'DQNNstepAgent', 'agents']
+           'DQNNstepAgent', 'VTraceAgent', 'agents']
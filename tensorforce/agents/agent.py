@@ -204,6 +204,51 @@ class Agent(object):
         Returns:
             Scalar value of the action or dict of multiple actions the agent wants to execute.
 
+        """
+        self.preprocess_state(state=state)
+
+        # Podel action
+        self.current_action, self.next_internal = self.model.get_action(state=self.current_state, internal=self.current_internal, deterministic=deterministic)
+
+        return self.explore_action(deterministic=deterministic)
+
+    @staticmethod
+    def act_many(agents, states, deterministic=False):
+        """Return actions for multiple agents which share a model, one state per agent. All
+        states are passed to the model in a single batched call, while preprocessing, internal
+        states and exploration are handled per agent.
+
+        Args:
+            agents: List of agents sharing one model.
+            states: List of states, one per agent.
+            deterministic: If true, no exploration and sampling is applied.
+
+        Returns:
+            List of actions, one per agent.
+
+        """
+        for agent, state in zip(agents, states):
+            agent.preprocess_state(state=state)
+
+        actions, internals = agents[0].model.get_actions(
+            states=[agent.current_state for agent in agents],
+            internals=[agent.current_internal for agent in agents],
+            deterministic=deterministic
+        )
+
+        result = list()
+        for agent, action, internal in zip(agents, actions, internals):
+            agent.current_action = action
+            agent.next_internal = internal
+            result.append(agent.explore_action(deterministic=deterministic))
+        return result
+
+    def preprocess_state(self, state):
+        """Advances the timestep and sets the preprocessed current state and internal state.
+
+        Args:
+            state: One state (usually a value tuple) or dict of states if multiple states are expected.
+
         """
         self.timestep += 1
         self.current_internal = self.next_internal
@@ -217,10 +262,16 @@ class Agent(object):
         for name, preprocessing in self.preprocessing.items():
             self.current_state[name] = preprocessing.process(state=self.current_state[name])
 
-        # Podel action
-        self.current_action, self.next_internal = self.model.get_action(state=self.current_state, internal=self.current_internal, deterministic=deterministic)
+    def explore_action(self, deterministic=False):
+        """Applies exploration to the current model action.
+
+        Args:
+            deterministic: If true, no exploration is applied.
 
-        # Exploration
+        Returns:
+            Scalar value of the action or dict of multiple actions the agent wants to execute.
+
+        """
         if not deterministic:
             for name, exploration in self.exploration.items():
                 if self.actions_config[name].continuous:
@@ -270,8 +321,74 @@ class Agent(object):
             internal=self.current_internal
         )
 
+    def get_state(self):
+        """
+        Returns the complete training state, i.e. counters, exploration and preprocessing state
+        and the model state. Resuming from this state continues training as if uninterrupted,
+        while `save_model`/`load_model` only concern the model variables.
+
+        Returns: Dict of the agent state, for `set_state`.
+
+        """
+        return dict(
+            episode=self.episode,
+            timestep=self.timestep,
+            next_internal=self.next_internal,
+            exploration={name: exploration.get_state() for name, exploration in self.exploration.items()},
+            preprocessing={name: preprocessing.get_state() for name, preprocessing in self.preprocessing.items()},
+            reward_preprocessing=(None if self.reward_preprocessing is None else self.reward_preprocessing.get_state()),
+            model=self.model.get_state()
+        )
+
+    def set_state(self, state):
+        """
+        Restores an agent state returned by `get_state`. The agent has to be created with the
+        same configuration.
+
+        Args:
+            state: Agent state dict
+
+        """
+        self.episode = state['episode']
+        self.timestep = state['timestep']
+        self.current_internal = self.next_internal = state['next_internal']
+        for name, exploration in self.exploration.items():
+            exploration.set_state(state=state['exploration'][name])
+        for name, preprocessing in self.preprocessing.items():
+            preprocessing.set_state(state=state['preprocessing'][name])
+        if self.reward_preprocessing is not None:
+            self.reward_preprocessing.set_state(state=state['reward_preprocessing'])
+        self.model.set_state(state=state['model'])
+
     def load_model(self, path):
         self.model.load_model(path)
 
     def save_model(self, path):
         self.model.save_model(path)
+
+    def export_inference(self, path):
+        """
+        Export the model for TensorFlow-free deterministic inference, see
+        `tensorforce.inference.InferencePolicy`. Note that state preprocessing is not part of the
+        export and has to be applied before passing states to the inference policy.
+
+        Args:
+            path: Export file path
+
+        Returns:
+
+        """
+        if self.preprocessing:
+            self.logger.warning('State preprocessing is not exported and has to be applied separately.')
+        self.model.export_inference(path, spec=dict(unique_state=self.unique_state, unique_action=self.unique_action))
+
+    def inference_snapshot(self):
+        """
+        Snapshot of the current model for TensorFlow-free deterministic inference, see
+        `tensorforce.inference.InferencePolicy`. As for `export_inference`, state preprocessing is
+        not part of the snapshot.
+
+        Returns: Specification dict and dict of weight names to arrays.
+
+        """
+        return self.model.inference_snapshot(spec=dict(unique_state=self.unique_state, unique_action=self.unique_action))
@@ -89,6 +89,17 @@ class BatchAgent(Agent):
             self.model.update(self.batch)
             self.reset_batch()
 
+    def get_state(self):
+        state = super(BatchAgent, self).get_state()
+        state['batch'] = self.batch
+        state['batch_count'] = (self.batch_count if self.batch is not None else 0)
+        return state
+
+    def set_state(self, state):
+        super(BatchAgent, self).set_state(state=state)
+        self.batch = state['batch']
+        self.batch_count = state['batch_count']
+
     def reset_batch(self):
         if self.batch is None or not self.keep_last:
             self.batch = dict(
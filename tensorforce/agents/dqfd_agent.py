@@ -24,6 +24,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 from six.moves import xrange
+import numpy as np
 
 from tensorforce.agents import MemoryAgent
 from tensorforce.core.memories import Replay
@@ -75,6 +76,8 @@ class DQFDAgent(MemoryAgent):
     * `supervised_weight`: float, weight of large margin classifier loss.
     * `expert_margin`: float of difference in Q-values between expert action and other actions enforced by the large margin function.
     * `clip_loss`: float if not 0, uses the huber loss with clip_loss as the linear bound
+    * `demo_mixed_batch`: boolean indicating whether demo and online samples are combined into one batch
+        with a demo mask, so that each update is a single optimization step.
 
 
     """
@@ -86,12 +89,14 @@ class DQFDAgent(MemoryAgent):
         target_update_frequency=10000,
         demo_memory_capacity=1000000,
         demo_sampling_ratio=0.01,
+        demo_mixed_batch=False
     )
 
     def __init__(self, config, model=None):
         config.default(DQFDAgent.default_config)
         super(DQFDAgent, self).__init__(config, model)
         self.target_update_frequency = config.target_update_frequency
+        self.demo_mixed_batch = config.demo_mixed_batch
 
         # This is the demonstration memory that we will fill with observations before starting
         # the main training loop
@@ -102,25 +107,78 @@ class DQFDAgent(MemoryAgent):
         self.demo_batch_size = int(config.demo_sampling_ratio * config.batch_size / (1.0 - config.demo_sampling_ratio))
         assert self.demo_batch_size > 0, 'Check DQFD sampling parameters to make sure demo_batch_size is positive. (Calculated {} based on current parameters)'.format(self.demo_batch_size)
 
-    def observe(self, reward, terminal):
-        """Adds observations, updates via sampling from memories according to update rate.
+    def get_state(self):
+        state = super(DQFDAgent, self).get_state()
+        state['demo_memory'] = self.demo_memory.get_state()
+        return state
+
+    def set_state(self, state):
+        super(DQFDAgent, self).set_state(state=state)
+        self.demo_memory.set_state(state=state['demo_memory'])
+
+    def update(self):
+        """Updates via sampling from memories according to update rate.
         DQFD samples from the online replay memory and the demo memory with
         the fractions controlled by a hyper parameter p called 'expert sampling ratio.
 
-        Args:
-            reward:
-            terminal:
-
         Returns:
 
         """
-        super(DQFDAgent, self).observe(reward=reward, terminal=terminal)
+        if self.demo_mixed_batch:
+            for _ in xrange(self.repeat_update):
+                batch = self.memory.get_batch(batch_size=self.batch_size, next_states=True)
+                demo_batch = self.demo_memory.get_batch(batch_size=self.demo_batch_size, next_states=True)
+                mixed_batch = self.mix_batches(batch=batch, demo_batch=demo_batch)
+
+                _, loss_per_instance = self.model.update(batch=mixed_batch)
+                # Priorities and cached target values only concern the online samples
+                size = len(batch['rewards'])
+                self.memory.update_batch(loss_per_instance=loss_per_instance[:size])
+                if 'target_versions' in batch:
+                    batch['target_values'] = {name: value[:size] for name, value in mixed_batch['target_values'].items()}
+                    batch['target_versions'] = mixed_batch['target_versions'][:size]
+                    self.update_target_values(batch=batch)
+
+        else:
+            super(DQFDAgent, self).update()
 
-        if self.timestep >= self.first_update and self.timestep % self.update_frequency == 0:
             for _ in xrange(self.repeat_update):
                 batch = self.demo_memory.get_batch(self.demo_batch_size)
                 self.model.demonstration_update(batch=batch)
 
+    @staticmethod
+    def mix_batches(batch, demo_batch):
+        """
+        Concatenates an online and a demo batch, marking the demo samples via `demo_mask`. Cached
+        target values of the online batch are carried over, the demo samples have none.
+
+        Args:
+            batch: Online batch with next states
+            demo_batch: Demo batch with next states
+
+        Returns: Mixed batch
+
+        """
+        mixed_batch = dict()
+        for key in ('states', 'actions', 'next_states'):
+            mixed_batch[key] = {name: np.concatenate((value, demo_batch[key][name])) for name, value in batch[key].items()}
+        for key in ('rewards', 'terminals'):
+            mixed_batch[key] = np.concatenate((batch[key], demo_batch[key]))
+        for key in ('internals', 'next_internals'):
+            mixed_batch[key] = [np.concatenate((value, demo_value)) for value, demo_value in zip(batch[key], demo_batch[key])]
+        mixed_batch['demo_mask'] = np.concatenate((np.zeros_like(batch['rewards']), np.ones_like(demo_batch['rewards'])))
+        if 'target_versions' in batch:
+            demo_size = len(demo_batch['rewards'])
+            mixed_batch['indices'] = batch['indices']
+            mixed_batch['target_versions'] = np.concatenate((batch['target_versions'], np.full((demo_size,), -1, dtype=batch['target_versions'].dtype)))
+            if batch['target_values'] is None:
+                mixed_batch['target_values'] = None
+            else:
+                mixed_batch['target_values'] = {
+                    name: np.concatenate((value, np.zeros((demo_size,) + value.shape[1:], dtype=value.dtype))) for name, value in batch['target_values'].items()
+                }
+        return mixed_batch
+
     def import_demonstrations(self, demonstrations):
         """Imports demonstrations, i.e. expert observations. Note that for large numbers of observations,
         set_demonstrations is more appropriate, which directly sets memory contents to an array an expects
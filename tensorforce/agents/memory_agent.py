@@ -19,8 +19,9 @@ from __future__ import division
 
 from six.moves import xrange
 
+from tensorforce import TensorForceError
 from tensorforce.agents import Agent
-from tensorforce.core.memories import Memory
+from tensorforce.core.memories import Memory, PrioritizedReplay
 
 
 class MemoryAgent(Agent):
@@ -42,6 +43,8 @@ class MemoryAgent(Agent):
     * `update_frequency`: integer indicating the number of steps between model updates.
     * `first_update`: integer indicating the number of steps to pass before the first update.
     * `repeat_update`: integer indicating how often to repeat the model update.
+    * `fused_updates`: boolean indicating whether repeated updates are sampled upfront and performed
+        via `update_many` (not supported for prioritized replay).
 
     """
 
@@ -54,7 +57,8 @@ class MemoryAgent(Agent):
         ),
         update_frequency=4,
         first_update=10000,
-        repeat_update=1
+        repeat_update=1,
+        fused_updates=False
     )
 
     def __init__(self, config, model=None):
@@ -73,6 +77,10 @@ class MemoryAgent(Agent):
         self.update_frequency = config.update_frequency
         self.first_update = config.first_update
         self.repeat_update = config.repeat_update
+        self.fused_updates = config.fused_updates
+
+        if self.fused_updates and isinstance(self.memory, PrioritizedReplay):
+            raise TensorForceError("Fused updates require priorities to be updated after each batch.")
 
     def observe(self, reward, terminal):
         reward, terminal = super(MemoryAgent, self).observe(reward, terminal)
@@ -88,11 +96,48 @@ class MemoryAgent(Agent):
         )
 
         if self.timestep >= self.first_update and self.timestep % self.update_frequency == 0:
+            self.update()
+
+    def get_state(self):
+        state = super(MemoryAgent, self).get_state()
+        state['memory'] = self.memory.get_state()
+        return state
+
+    def set_state(self, state):
+        super(MemoryAgent, self).set_state(state=state)
+        self.memory.set_state(state=state['memory'])
+
+    def update(self):
+        """
+        Performs `repeat_update` model updates on batches sampled from the memory.
+        """
+        if self.fused_updates:
+            batches = [self.memory.get_batch(batch_size=self.batch_size, next_states=True) for _ in xrange(self.repeat_update)]
+            self.model.update_many(batches=batches)
+            for batch in batches:
+                self.update_target_values(batch=batch)
+        else:
             for _ in xrange(self.repeat_update):
                 batch = self.memory.get_batch(batch_size=self.batch_size, next_states=True)
                 _, loss_per_instance = self.model.update(batch=batch)
+                self.update_target_values(batch=batch)
                 self.memory.update_batch(loss_per_instance=loss_per_instance)
 
+    def update_target_values(self, batch):
+        """
+        Writes target values computed by the model back to the memory cache, if enabled.
+
+        Args:
+            batch: Batch after the model update
+
+        """
+        if 'target_versions' in batch:
+            self.memory.update_target_values(
+                indices=batch['indices'],
+                target_values=batch['target_values'],
+                target_versions=batch['target_versions']
+            )
+
     def import_observations(self, observations):
         """Load an iterable of observation dicts into the replay memory.
 
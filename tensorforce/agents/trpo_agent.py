@@ -59,6 +59,8 @@ class TRPOAgent(BatchAgent):
     * `line_search_steps`: int of how many steps to take during line search.
     * `max_kl_divergence`: float indicating the maximum kl divergence to allow for updates.
     * `cg_iterations`: int of count of conjugate gradient iterations.
+    * `fisher_subsample`: float fraction of the batch used for Fisher-vector products.
+    * `ls_batched`: bool evaluating all line search steps in one call, without assigning parameters.
 
 
     """
@@ -0,0 +1,69 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Actor-critic agent with V-trace off-policy correction.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from tensorforce import TensorForceError
+from tensorforce.agents import BatchAgent
+from tensorforce.models import VTraceModel
+
+
+class VTraceAgent(BatchAgent):
+    """
+    Actor-critic agent with V-trace off-policy correction as used by IMPALA ([Espeholt et al., 2018]
+    (https://arxiv.org/abs/1802.01561)). Intended as learner of the `ImpalaRunner`, where actor
+    processes generate trajectories with slightly stale weights. As a synchronous agent, it updates
+    on-policy once per batch, and by default keeps the last timestep of a batch, which only
+    provides the bootstrap state, as first timestep of the next batch.
+
+    Configuration:
+
+    Each agent requires the following ``Configuration`` parameters:
+
+    * `states`: dict containing one or more state definitions.
+    * `actions`: dict containing one or more action definitions.
+    * `preprocessing`: dict or list containing state preprocessing configuration.
+    * `exploration`: dict containing action exploration configuration.
+
+    The `BatchAgent` class additionally requires the following parameters:
+
+    * `batch_size`: integer of the batch size, a multiple of `trajectory_length + 1`.
+    * `keep_last`: bool optionally keep the last observation for use in the next batch
+
+    The V-trace agent expects the following additional configuration parameters:
+
+    * `trajectory_length`: number of timesteps per trajectory.
+    * `rho_clip`: truncation of importance ratios in the temporal differences.
+    * `c_clip`: truncation of importance ratios in the trace.
+    * `value_loss_weight`: weight of the value loss.
+    * `entropy_penalty`: weight of the entropy regularization.
+
+    """
+
+    name = 'VTraceAgent'
+    model = VTraceModel
+
+    def __init__(self, config, model=None):
+        config.default(VTraceModel.default_config)
+        config.default(dict(batch_size=(config.trajectory_length + 1), keep_last=True))
+        if config.batch_size % (config.trajectory_length + 1) != 0:
+            raise TensorForceError("Batch size has to be a multiple of the trajectory length + 1.")
+        super(VTraceAgent, self).__init__(config, model)
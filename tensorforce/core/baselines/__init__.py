@@ -17,13 +17,16 @@ from tensorforce.core.baselines.baseline import Baseline
 from tensorforce.core.baselines.cnn import CNNBaseline
 from tensorforce.core.baselines.linear import LinearBaseline
 from tensorforce.core.baselines.mlp import MLPBaseline
+from tensorforce.core.baselines.network import NetworkBaseline
+from tensorforce.core.baselines.combined import CombinedBaseline
 
 
 baselines = dict(
     linear=LinearBaseline,
     mlp=MLPBaseline,
     cnn=CNNBaseline,
+    network=NetworkBaseline,
 )
 
 
-__all__ = ['Baseline', 'LinearBaseline', 'MLPBaseline','CNNBaseline', 'baselines']
+__all__ = ['Baseline', 'LinearBaseline', 'MLPBaseline','CNNBaseline', 'NetworkBaseline', 'CombinedBaseline', 'baselines']
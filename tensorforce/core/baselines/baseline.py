@@ -21,7 +21,10 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import tensorflow as tf
+
 from tensorforce import util
+from tensorforce.core.networks import NeuralNetwork
 import tensorforce.core.baselines
 
 
@@ -30,6 +33,56 @@ class Baseline(object):
     def create_tf_operations(self, state, scope=''):
         raise NotImplementedError
 
+    def create_fused_update(self, network_builder, optimizer, variables, scope):
+        """
+        Creates an in-graph loop performing `num_updates` optimization steps on minibatches sampled
+        from the `state` and `returns` inputs, so that fitting the baseline requires a single
+        session call. The network is rebuilt within the loop, reading the current variable values
+        in each iteration.
+
+        Args:
+            network_builder: Network builder of the baseline network
+            optimizer: Optimizer whose slots have already been created
+            variables: Baseline variables
+            scope: Baseline variable scope
+
+        Returns: Per-step losses tensor
+
+        """
+        self.num_updates = tf.placeholder(dtype=tf.int32, shape=(), name='num-updates')
+        batch_size = tf.shape(input=self.state)[0]
+
+        def step(n, losses):
+            reads = dict()
+
+            def read_variable(getter, *args, **kwargs):
+                variable = getter(*args, **kwargs)
+                reads[variable] = variable.read_value()
+                return reads[variable]
+
+            # Reads must not happen before the previous optimization step is applied
+            with tf.control_dependencies(control_inputs=(n,)):
+                indices = tf.random_uniform(shape=(self.update_batch_size,), maxval=batch_size, dtype=tf.int32)
+                with tf.variable_scope(scope, reuse=True, custom_getter=read_variable):
+                    network = NeuralNetwork(network_builder=network_builder, inputs=dict(state=tf.gather(params=self.state, indices=indices)))
+                prediction = tf.squeeze(input=network.output, axis=1)
+                loss = tf.nn.l2_loss(prediction - tf.gather(params=self.returns, indices=indices))
+
+            # Note that optimizer accumulators such as Adam's beta powers are read once per loop
+            gradients = tf.gradients(ys=loss, xs=[reads[variable] for variable in variables])
+            optimize = optimizer.apply_gradients(grads_and_vars=list(zip(gradients, variables)))
+            with tf.control_dependencies(control_inputs=(optimize,)):
+                return n + 1, losses.write(index=n, value=loss)
+
+        _, losses = tf.while_loop(
+            cond=(lambda n, _: n < self.num_updates),
+            body=step,
+            loop_vars=(tf.constant(value=0, dtype=tf.int32), tf.TensorArray(dtype=tf.float32, size=self.num_updates)),
+            parallel_iterations=1,
+            back_prop=False
+        )
+        return losses.stack()
+
     def predict(self, states):
         """Predicts the state-value function V(s)
 
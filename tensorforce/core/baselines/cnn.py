@@ -32,12 +32,13 @@ from tensorforce.core.baselines import Baseline
 
 class CNNBaseline(Baseline):
 
-    def __init__(self, cnn_sizes, dense_sizes, epochs=1, update_batch_size=64, learning_rate=0.001):
+    def __init__(self, cnn_sizes, dense_sizes, epochs=1, update_batch_size=64, learning_rate=0.001, fused_updates=False):
         """CNN baseline value function.
 
         Args:
             sizes: Number of neurons per hidden layer
             repeat_update: Epochs over the training data to fit the baseline
+            fused_updates: Whether all update steps are performed within a single session call
         """
 
         self.cnn_sizes = cnn_sizes
@@ -45,6 +46,7 @@ class CNNBaseline(Baseline):
         self.epochs = epochs
         self.update_batch_size = update_batch_size
         self.learning_rate = learning_rate
+        self.fused_updates = fused_updates
         self.session = None
 
     def create_tf_operations(self, state, scope='cnn_baseline'):
@@ -63,8 +65,8 @@ class CNNBaseline(Baseline):
                 layers.append({'type': 'dense', 'size': size})
             layers.append({'type': 'linear', 'size': 1})
 
-            network = NeuralNetwork(network_builder=layered_network_builder(layers),
-                                    inputs=dict(state=self.state))
+            network_builder = layered_network_builder(layers)
+            network = NeuralNetwork(network_builder=network_builder, inputs=dict(state=self.state))
 
             self.prediction = tf.squeeze(input=network.output, axis=1)
             loss = tf.nn.l2_loss(self.prediction - self.returns)
@@ -74,6 +76,14 @@ class CNNBaseline(Baseline):
             variables = tf.contrib.framework.get_variables(scope=scope)
             self.optimize = optimizer.minimize(loss, var_list=variables)
 
+            if self.fused_updates:
+                self.fused_losses = self.create_fused_update(
+                    network_builder=network_builder,
+                    optimizer=optimizer,
+                    variables=variables,
+                    scope=scope
+                )
+
     def predict(self, states):
         return self.session.run(self.prediction, {self.state: states})
 
@@ -83,6 +93,10 @@ class CNNBaseline(Baseline):
         batch_size = states.shape[0]
         updates = int(batch_size / self.update_batch_size) * self.epochs
 
+        if self.fused_updates:
+            self.session.run(self.fused_losses, {self.state: states, self.returns: returns, self.num_updates: updates})
+            return
+
         for _ in xrange(updates):
             indices = np.random.randint(low=0, high=batch_size, size=self.update_batch_size)
             batch_states = states.take(indices, axis=0)
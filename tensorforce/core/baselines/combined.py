@@ -0,0 +1,117 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Combined baseline value function over multiple state inputs.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from six.moves import xrange
+import tensorflow as tf
+import numpy as np
+
+from tensorforce import TensorForceError
+from tensorforce.core.baselines import Baseline
+
+
+class CombinedBaseline(Baseline):
+
+    def __init__(self, baselines):
+        """
+        Combines one TensorFlow baseline head per state input. All heads are predicted in one
+        session call and trained with a single optimization op per minibatch, the prediction is
+        the mean of the head predictions.
+
+        Args:
+            baselines: Dict of state names to baselines created from the same configuration
+        """
+        self.baselines = baselines
+        for baseline in baselines.values():
+            if not hasattr(baseline, 'update_batch_size'):
+                raise TensorForceError("Combined baseline requires TensorFlow baselines, not {}.".format(type(baseline).__name__))
+
+        baseline = next(iter(baselines.values()))
+        self.epochs = baseline.epochs
+        self.update_batch_size = baseline.update_batch_size
+        self.fused_updates = baseline.fused_updates
+        self._session = None
+
+    @property
+    def session(self):
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+        for baseline in self.baselines.values():
+            baseline.session = session
+
+    def create_tf_operations(self, states, scope='baseline'):
+        with tf.variable_scope(scope):
+            for name, state in states:
+                self.baselines[name].create_tf_operations(state, scope=(scope + '_' + name))
+
+        self.predictions = [baseline.prediction for baseline in self.baselines.values()]
+        self.optimize = tf.group(*(baseline.optimize for baseline in self.baselines.values()))
+        if self.fused_updates:
+            self.fused_losses = [baseline.fused_losses for baseline in self.baselines.values()]
+
+    def predict(self, states):
+        """
+        Predicts the state-value function V(s) as mean over all state inputs.
+
+        Args:
+            states: Dict of state batches
+
+        Returns: V(s)
+
+        """
+        feed_dict = {baseline.state: states[name] for name, baseline in self.baselines.items()}
+        return np.mean(self.session.run(self.predictions, feed_dict), axis=0)
+
+    def update(self, states, returns):
+        """
+        Fits all baseline heads to returns.
+
+        Args:
+            states: Dict of state batches
+            returns: Returns for states
+
+        """
+        states = {name: np.asarray(states[name]) for name in self.baselines}
+        returns = np.asarray(returns)
+        batch_size = returns.shape[0]
+        updates = int(batch_size / self.update_batch_size) * self.epochs
+
+        if self.fused_updates:
+            feed_dict = dict()
+            for name, baseline in self.baselines.items():
+                feed_dict[baseline.state] = states[name]
+                feed_dict[baseline.returns] = returns
+                feed_dict[baseline.num_updates] = updates
+            self.session.run(self.fused_losses, feed_dict)
+            return
+
+        for _ in xrange(updates):
+            indices = np.random.randint(low=0, high=batch_size, size=self.update_batch_size)
+            batch_returns = returns.take(indices, axis=0)
+            feed_dict = dict()
+            for name, baseline in self.baselines.items():
+                feed_dict[baseline.state] = states[name].take(indices, axis=0)
+                feed_dict[baseline.returns] = batch_returns
+            self.session.run(self.optimize, feed_dict)
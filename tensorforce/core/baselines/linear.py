@@ -26,6 +26,7 @@ from __future__ import print_function
 from __future__ import division
 
 import numpy as np
+from scipy.linalg import cho_factor, cho_solve
 
 from tensorforce.core.baselines import Baseline
 
@@ -35,9 +36,31 @@ class LinearBaseline(Baseline):
     def create_tf_operations(self, state, batch_size, scope=''):
         pass
 
-    def __init__(self):
+    def __init__(self, incremental=False, forgetting=1.0, regularization=2.0, time_scale=100.0):
+        """
+        Linear baseline value function on state, squared state and time features.
+
+        Args:
+            incremental: Whether to keep the least-squares statistics across updates, so that the
+                update cost only depends on the new batch
+            forgetting: Factor by which previous statistics are discounted per incremental update
+            regularization: L2 regularization of the coefficients
+            time_scale: Scale of the time features
+        """
+        self.incremental = incremental
+        self.forgetting = forgetting
+        self.regularization = regularization
+        self.time_scale = time_scale
         self.coefficients = None
 
+        # Sufficient statistics X^T X and X^T y for incremental updates
+        self.gram_matrix = None
+        self.moment_vector = None
+
+        # Features of the last predicted states, reused if the same states are updated on
+        self.predicted_states = None
+        self.predicted_features = None
+
     def predict(self, states):
         """
         Predict episode value based on linear coefficients.
@@ -48,17 +71,41 @@ class LinearBaseline(Baseline):
         if self.coefficients is None:
             return np.zeros(shape=(len(states), 1))
         else:
-            return self.features(states).dot(self.coefficients)
+            self.predicted_states = states
+            self.predicted_features = self.features(states)
+            return self.predicted_features.dot(self.coefficients)
 
     def update(self, states, returns):
-        features = self.features(states)
+        if states is self.predicted_states:
+            features = self.predicted_features
+        else:
+            features = self.features(states)
+        self.predicted_states = None
+        self.predicted_features = None
+
         columns = features.shape[1]
-        self.coefficients = np.linalg.lstsq(
-            features.T.dot(features) + 2 * np.identity(columns), features.T.dot(returns))[0]
+        if not self.incremental:
+            self.coefficients = np.linalg.lstsq(
+                features.T.dot(features) + self.regularization * np.identity(columns), features.T.dot(returns))[0]
+            return
+
+        if self.gram_matrix is None:
+            self.gram_matrix = features.T.dot(features)
+            self.moment_vector = features.T.dot(returns)
+        else:
+            self.gram_matrix *= self.forgetting
+            self.gram_matrix += features.T.dot(features)
+            self.moment_vector *= self.forgetting
+            self.moment_vector += features.T.dot(returns)
+
+        # Regularized statistics are positive definite, the factorization is cubic in the
+        # (small) number of features only
+        factor = cho_factor(self.gram_matrix + self.regularization * np.identity(columns))
+        self.coefficients = cho_solve(factor, self.moment_vector)
 
     def features(self, states):
         states = np.array(states)
         states = states.reshape(states.shape[0], -1)
-        al = np.arange(states.shape[0]).reshape(-1, 1) / 100.0
+        al = np.arange(states.shape[0]).reshape(-1, 1) / self.time_scale
 
         return np.concatenate([states, states ** 2, al, al ** 2, np.ones((states.shape[0], 1))], axis=1)
@@ -0,0 +1,104 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Value head baseline sharing the policy network.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import tensorflow as tf
+
+from tensorforce.core.networks import layers
+from tensorforce.core.baselines import Baseline
+
+
+class NetworkBaseline(Baseline):
+
+    def __init__(self, loss_weight=1.0, stop_gradient=False, learning_rate=0.001):
+        """
+        Linear value head on the output of the policy network, so the baseline does not require a
+        separate forward pass over the states. The value loss is added to the model loss, unless
+        the model does not optimize a loss itself (e.g. TRPO), in which case the baseline has its
+        own optimizer.
+
+        Args:
+            loss_weight: Weight of the value loss
+            stop_gradient: Whether the value loss only trains the value head, not the policy network
+            learning_rate: Learning rate of the separate value optimizer
+        """
+        self.loss_weight = loss_weight
+        self.stop_gradient = stop_gradient
+        self.learning_rate = learning_rate
+        self.session = None
+
+    def create_tf_operations(self, x, returns, network_variables, joint_loss, scope='network_baseline'):
+        """
+        Creates the value head.
+
+        Args:
+            x: Policy network output
+            returns: Returns input
+            network_variables: Policy network variables
+            joint_loss: Whether the value loss is added to the model loss
+            scope: Value head scope
+        """
+        with tf.variable_scope(scope) as scope:
+            self.returns = returns
+            if self.stop_gradient:
+                x = tf.stop_gradient(input=x)
+
+            self.prediction = tf.squeeze(input=layers['linear'](x=x, size=1), axis=1)
+            self.loss = self.loss_weight * 0.5 * tf.reduce_mean(input_tensor=tf.square(x=(self.prediction - self.returns)), axis=0)
+
+            if joint_loss:
+                tf.losses.add_loss(self.loss)
+                self.optimize = None
+            else:
+                variables = tf.contrib.framework.get_variables(scope=scope)
+                if not self.stop_gradient:
+                    variables += network_variables
+                optimizer = tf.train.AdamOptimizer(learning_rate=self.learning_rate)
+                self.optimize = optimizer.minimize(self.loss, var_list=variables)
+
+    def predict(self, states):
+        """
+        Predicts the state-value function V(s).
+
+        Args:
+            states: Dict of policy network inputs to values
+
+        Returns: V(s)
+
+        """
+        return self.session.run(self.prediction, states)
+
+    def update(self, states, returns):
+        """
+        Fits the value head to returns, unless the value loss is part of the model loss.
+
+        Args:
+            states: Dict of policy network inputs to values
+            returns: Returns for states
+
+        """
+        if self.optimize is None:
+            return
+
+        feed_dict = dict(states)
+        feed_dict[self.returns] = returns
+        self.session.run(self.optimize, feed_dict)
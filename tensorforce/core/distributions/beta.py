@@ -59,6 +59,8 @@ class Beta(Distribution):
         return (self.min_value, self.max_value, self.alpha, self.beta)
 
     def create_tf_operations(self, x, deterministic):
+        self.scope = tf.get_variable_scope().name
+        self.bounds = (self.min_value, self.max_value)
         self.min_value = tf.constant(value=self.min_value, dtype=tf.float32)
         self.max_value = tf.constant(value=self.max_value, dtype=tf.float32)
 
@@ -109,3 +111,17 @@ class Beta(Distribution):
         sample = beta_sample / tf.maximum(x=(alpha_sample + beta_sample), y=util.epsilon)
 
         return self.min_value + tf.where(condition=self.deterministic, x=deterministic, y=sample) * (self.max_value - self.min_value)
+
+    def inference_spec(self):
+        alpha, variables = self.linear_inference_spec(scope='alpha')
+        beta, beta_variables = self.linear_inference_spec(scope='beta')
+        variables.update(beta_variables)
+        spec = dict(
+            type='beta',
+            shape=self.shape,
+            min_value=self.bounds[0],
+            max_value=self.bounds[1],
+            alpha=alpha,
+            beta=beta
+        )
+        return spec, variables
@@ -52,6 +52,7 @@ class Categorical(Distribution):
         return (self.logits,)
 
     def create_tf_operations(self, x, deterministic):
+        self.scope = tf.get_variable_scope().name
         self.deterministic = deterministic
 
         # Flat logits
@@ -93,3 +94,8 @@ class Categorical(Distribution):
         log_prob_ratio = self.logits - other.logits
 
         return tf.reduce_sum(input_tensor=(self.probabilities * log_prob_ratio), axis=-1)
+
+    def inference_spec(self):
+        logits, variables = self.linear_inference_spec(scope='logits')
+        spec = dict(type='categorical', shape=self.shape, num_actions=self.num_actions, logits=logits)
+        return spec, variables
@@ -49,6 +49,31 @@ class Distribution(object):
     def kl_divergence(self, other):
         raise NotImplementedError
 
+    def inference_spec(self):
+        """
+        Creates the specification used by `tensorforce.inference` to compute the deterministic
+        action of this distribution without TensorFlow.
+
+        Returns: Action head specification dict and dict of weight names to variables.
+
+        """
+        raise NotImplementedError
+
+    def linear_inference_spec(self, scope):
+        """
+        Specification of a linear layer created within the distribution scope.
+
+        Args:
+            scope: Scope of the linear layer relative to the distribution scope.
+
+        Returns: Linear layer specification dict and dict of weight names to variables.
+
+        """
+        names, variables = util.layer_variables(scope=(self.scope + '/' + scope))
+        spec = dict(type='linear')
+        spec.update(names)
+        return spec, variables
+
     @staticmethod
     def from_config(config, kwargs=None):
         return util.get_object(
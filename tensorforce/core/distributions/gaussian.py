@@ -48,6 +48,7 @@ class Gaussian(Distribution):
         return (self.mean, self.log_stddev)
 
     def create_tf_operations(self, x, deterministic):
+        self.scope = tf.get_variable_scope().name
         self.deterministic = deterministic
 
         # Flat mean and log standard deviation
@@ -92,3 +93,10 @@ class Gaussian(Distribution):
         sq_stddev2 = tf.square(x=other.stddev)
 
         return log_stddev_ratio + 0.5 * (sq_stddev1 + sq_mean_distance) / sq_stddev2 - 0.5
+
+    def inference_spec(self):
+        mean, variables = self.linear_inference_spec(scope='mean')
+        log_stddev, log_stddev_variables = self.linear_inference_spec(scope='log_stddev')
+        variables.update(log_stddev_variables)
+        spec = dict(type='gaussian', shape=self.shape, mean=mean, log_stddev=log_stddev)
+        return spec, variables
@@ -22,6 +22,15 @@ class Exploration(object):
     def __call__(self, episode=0, timestep=0):
         raise NotImplementedError
 
+    def get_state(self):
+        """
+        Returns: Dict of the exploration parameters and state, e.g. the current epsilon
+        """
+        return dict(self.__dict__)
+
+    def set_state(self, state):
+        self.__dict__.update(state)
+
     @staticmethod
     def from_config(config):
         return util.get_object(
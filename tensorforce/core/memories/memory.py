@@ -28,6 +28,12 @@ class Memory(object):
         self.states_config = states_config
         self.actions_config = actions_config
 
+    def __len__(self):
+        """
+        Returns: Number of stored observations
+        """
+        raise NotImplementedError
+
     def add_observation(self, state, action, reward, terminal, internal):
         raise NotImplementedError
 
@@ -47,6 +53,15 @@ class Memory(object):
     def update_batch(self, loss_per_instance):
         raise NotImplementedError
 
+    def get_state(self):
+        """
+        Returns: Dict of the memory contents, for `set_state`
+        """
+        raise NotImplementedError
+
+    def set_state(self, state):
+        raise NotImplementedError
+
     def set_memory(self, states, actions, rewards, terminals, internals):
         """
         Deletes memory content and sets content to provided observations.
@@ -40,6 +40,24 @@ class PrioritizedReplay(Memory):
         self.batch_indices = None
         self.last_observation = None  # stores last observation until next_state value is known
 
+    def __len__(self):
+        return len(self.observations)
+
+    def get_state(self):
+        return dict(
+            observations=self.observations,
+            none_priority_index=self.none_priority_index,
+            last_observation=self.last_observation,
+            internals_config=self.internals_config
+        )
+
+    def set_state(self, state):
+        self.observations = list(state['observations'])
+        self.none_priority_index = state['none_priority_index']
+        self.last_observation = state['last_observation']
+        self.internals_config = state['internals_config']
+        self.batch_indices = None
+
     def add_observation(self, state, action, reward, terminal, internal):
         if self.internals_config is None and internal is not None:
             self.internals_config = [(i.shape, i.dtype) for i in internal]
@@ -30,7 +30,18 @@ from tensorforce.core.memories import Memory
 
 class Replay(Memory):
 
-    def __init__(self, capacity, states_config, actions_config, random_sampling=True):
+    def __init__(self, capacity, states_config, actions_config, random_sampling=True, cache_target_values=False):
+        """
+        Replay memory.
+
+        Args:
+            capacity: Memory capacity
+            states_config: States configuration
+            actions_config: Actions configuration
+            random_sampling: Whether to sample random indices instead of a random sequence
+            cache_target_values: Whether to cache target network values per observation, which
+                batches with next states then contain together with their target network version
+        """
         super(Replay, self).__init__(capacity, states_config, actions_config)
         self.states = {name: np.zeros((capacity,) + tuple(state.shape), dtype=util.np_dtype(state.type)) for name, state in states_config}
         self.actions = {name: np.zeros((capacity,) + tuple(action.shape), dtype=util.np_dtype('float' if action.continuous else 'int')) for name, action in actions_config}
@@ -40,6 +51,12 @@ class Replay(Memory):
         self.size = 0
         self.index = 0
         self.random_sampling = random_sampling
+        self.cache_target_values = cache_target_values
+        self.target_values = None
+        self.target_versions = np.full((capacity,), -1, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
 
     def add_observation(self, state, action, reward, terminal, internal):
         if self.internals is None and internal is not None:
@@ -54,6 +71,10 @@ class Replay(Memory):
         for n, internal in enumerate(internal):
             self.internals[n][self.index] = internal
 
+        # Target values of this observation and of the previous one, whose next state changed
+        self.target_versions[self.index] = -1
+        self.target_versions[self.index - 1] = -1
+
         if self.size < self.capacity:
             self.size += 1
         self.index = (self.index + 1) % self.capacity
@@ -82,14 +103,15 @@ class Replay(Memory):
             terminals = self.terminals.take(indices)
             internals = [internal.take(indices, axis=0) for internal in self.internals]
             if next_states:
-                indices = (indices + 1) % self.capacity
-                next_states = {name: state.take(indices, axis=0) for name, state in self.states.items()}
-                next_internals = [internal.take(indices, axis=0) for internal in self.internals]
+                next_indices = (indices + 1) % self.capacity
+                next_states = {name: state.take(next_indices, axis=0) for name, state in self.states.items()}
+                next_internals = [internal.take(next_indices, axis=0) for internal in self.internals]
 
         else:
             rand_start = 1 if next_states else 0
             end = (self.index - randrange(rand_start, self.size - batch_size + 1)) % self.capacity
             start = (end - batch_size) % self.capacity
+            indices = np.arange(start, start + batch_size) % self.capacity
 
             if start < end:
                 states = {name: state[start:end] for name, state in self.states.items()}
@@ -115,13 +137,68 @@ class Replay(Memory):
         if next_states:
             batch['next_states'] = next_states
             batch['next_internals'] = next_internals
+            if self.cache_target_values:
+                batch['indices'] = indices
+                batch['target_versions'] = self.target_versions.take(indices)
+                if self.target_values is None:
+                    batch['target_values'] = None
+                else:
+                    batch['target_values'] = {name: value.take(indices, axis=0) for name, value in self.target_values.items()}
         return batch
 
+    def update_target_values(self, indices, target_values, target_versions):
+        """
+        Stores target network values in the cache.
+
+        Args:
+            indices: Memory indices of the batch
+            target_values: Dict of target values per action
+            target_versions: Target network versions of the values
+
+        """
+        if self.target_values is None:
+            self.target_values = {name: np.zeros((self.capacity,) + value.shape[1:], dtype=value.dtype) for name, value in target_values.items()}
+        for name, value in target_values.items():
+            self.target_values[name][indices] = value
+        self.target_versions[indices] = target_versions
+
     def update_batch(self, loss_per_instance):
         pass
 
+    def get_state(self):
+        return dict(
+            states=self.states,
+            actions=self.actions,
+            rewards=self.rewards,
+            terminals=self.terminals,
+            internals=self.internals,
+            size=self.size,
+            index=self.index,
+            target_values=self.target_values,
+            target_versions=self.target_versions
+        )
+
+    def set_state(self, state):
+        # Copies, since restored arrays may be read-only memory maps
+        self.states = {name: np.array(value) for name, value in state['states'].items()}
+        self.actions = {name: np.array(value) for name, value in state['actions'].items()}
+        self.rewards = np.array(state['rewards'])
+        self.terminals = np.array(state['terminals'])
+        if state['internals'] is None:
+            self.internals = None
+        else:
+            self.internals = [np.array(internal) for internal in state['internals']]
+        self.size = state['size']
+        self.index = state['index']
+        if state['target_values'] is None:
+            self.target_values = None
+        else:
+            self.target_values = {name: np.array(value) for name, value in state['target_values'].items()}
+        self.target_versions = np.array(state['target_versions'])
+
     def set_memory(self, states, actions, rewards, terminals, internals):
         self.size = len(rewards)
+        self.target_versions[:] = -1
 
         if len(rewards) == self.capacity:
             # Assign directly if capacity matches size.
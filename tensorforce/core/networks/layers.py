@@ -414,6 +414,8 @@ def layered_network_builder(layers_config):
         else:
             return x
 
+    # Kept so that the network can be exported for TensorFlow-free inference
+    network_builder.layers_config = layers_config
     return network_builder
 
 
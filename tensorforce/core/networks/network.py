@@ -22,11 +22,26 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import Counter
+
 import tensorflow as tf
 
+from tensorforce import TensorForceError, util
+
 
 class NeuralNetwork(object):
 
+    # Layer arguments relevant for inference and their defaults as in `tensorforce.core.networks.layers`
+    inference_defaults = dict(
+        flatten=dict(),
+        nonlinearity=dict(name='relu'),
+        linear=dict(),
+        dense=dict(activation='relu'),
+        conv1d=dict(window=3, stride=1, padding='SAME', activation='relu'),
+        conv2d=dict(window=3, stride=1, padding='SAME', activation='relu'),
+        lstm=dict(forget_bias=1.0)
+    )
+
     def __init__(self, network_builder, inputs, summary_level=0):
         """
 
@@ -48,4 +63,39 @@ class NeuralNetwork(object):
             self.internal_outputs = network[2]
             self.internal_inits = network[3]
 
-        self.variables = tf.get_collection(tf.GraphKeys.TRAINABLE_VARIABLES, scope=tf.get_variable_scope().name)
+        self.scope = tf.get_variable_scope().name
+        self.layers_config = getattr(network_builder, 'layers_config', None)
+        self.variables = tf.get_collection(tf.GraphKeys.TRAINABLE_VARIABLES, scope=self.scope)
+
+    def inference_spec(self):
+        """
+        Creates the layer specification used by `tensorforce.inference` to execute this network
+        without TensorFlow. Only networks created by `layered_network_builder` with predefined layer
+        types can be exported.
+
+        Returns: List of layer specification dicts and dict of weight names to variables.
+
+        """
+        if self.layers_config is None:
+            raise TensorForceError('Only layered networks can be exported for inference.')
+
+        layers_spec = list()
+        variables = dict()
+        layer_counter = Counter()
+        for layer_config in self.layers_config:
+            layer_type = layer_config['type']
+            if layer_type not in NeuralNetwork.inference_defaults:
+                raise TensorForceError('Layer type {} not supported for inference export.'.format(layer_type))
+            scope = layer_type + str(layer_counter[layer_type])
+            layer_counter[layer_type] += 1
+
+            layer_spec = dict(type=layer_type)
+            for key, default in NeuralNetwork.inference_defaults[layer_type].items():
+                layer_spec[key] = layer_config[key] if key in layer_config else default
+
+            names, layer_variables = util.layer_variables(scope=(scope if not self.scope else self.scope + '/' + scope))
+            layer_spec.update(names)
+            variables.update(layer_variables)
+            layers_spec.append(layer_spec)
+
+        return layers_spec, variables
@@ -16,7 +16,7 @@
 from tensorforce.core.optimizers.optimizer import Optimizer
 from tensorforce.core.optimizers.tf_optimizer import TensorFlowOptimizer
 # from tensorforce.core.optimizers.evolutionary import Evolutionary
-# from tensorforce.core.optimizers.natural_gradient import NaturalGradient
+from tensorforce.core.optimizers.natural_gradient import NaturalGradient
 from tensorforce.core.optimizers.conjugate_gradient_optimizer import ConjugateGradientOptimizer
 
 
@@ -30,7 +30,7 @@ optimizers = dict(
     momentum=TensorFlowOptimizer.get_wrapper(optimizer='momentum'),
     rmsprop=TensorFlowOptimizer.get_wrapper(optimizer='rmsprop'),
     # evolutionary=Evolutionary,
-    # natural_gradient=NaturalGradient,
+    natural_gradient=NaturalGradient,
     conjugate_gradient=ConjugateGradientOptimizer
 )
 
@@ -0,0 +1,193 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Natural gradient optimizer. The natural gradient direction F^-1 g is approximated by conjugate
+gradients within the TensorFlow graph, where the Fisher information matrix F is given by the
+Hessian of the KL divergence between the fixed and the current policy, and only accessed via
+Fisher-vector products.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import tensorflow as tf
+
+from tensorforce import util, TensorForceError
+from tensorforce.core.optimizers import Optimizer
+
+
+class NaturalGradient(Optimizer):
+
+    def __init__(self, learning_rate=1.0, max_kl_divergence=None, cg_iterations=20, cg_damping=1e-3,
+                 stop_residual=1e-10, fisher_subsample=1.0, variables=None):
+        """
+        Creates a natural gradient optimizer.
+
+        Args:
+            learning_rate: Step size along the natural gradient, if no KL divergence bound is given
+            max_kl_divergence: Optional KL divergence bound which determines the step size instead
+            cg_iterations: Maximum number of conjugate gradient iterations
+            cg_damping: Damping added to the Fisher-vector products
+            stop_residual: Conjugate gradient stops once the squared residual is below this value
+            fisher_subsample: Fraction of the batch used to estimate Fisher-vector products
+            variables: Variables to optimize, defaults to all trainable variables
+        """
+        super(NaturalGradient, self).__init__(variables=variables)
+        self.learning_rate = learning_rate
+        self.max_kl_divergence = max_kl_divergence
+        self.cg_iterations = cg_iterations
+        self.cg_damping = cg_damping
+        self.stop_residual = stop_residual
+        self.fisher_subsample = fisher_subsample
+
+    def minimize(self, fn_loss, fn_kl_divergence=None):
+        """
+        Creates the natural gradient step operation.
+
+        Args:
+            fn_loss: Loss tensor, or function returning the loss tensor
+            fn_kl_divergence: Function returning the KL divergence per instance, see `solve`
+
+        Returns: Operation applying the natural gradient step
+
+        """
+        if fn_kl_divergence is None:
+            raise TensorForceError("Natural gradient optimizer requires a KL divergence.")
+        if isinstance(fn_loss, tf.Tensor):
+            _loss = fn_loss
+            fn_loss = (lambda: _loss)
+        loss = super(NaturalGradient, self).minimize(fn_loss=fn_loss)
+
+        gradients = tf.gradients(loss, self.variables)
+        self.variables = [variable for variable, gradient in zip(self.variables, gradients) if gradient is not None]
+        gradient = self.flatten(tensors=[gradient for gradient in gradients if gradient is not None])
+
+        search_direction, shs = self.solve(gradient=-gradient, kl_divergence=fn_kl_divergence, variables=self.variables)
+        if self.max_kl_divergence is None:
+            step = self.learning_rate * search_direction
+        else:
+            step = search_direction * tf.sqrt(x=(self.max_kl_divergence / tf.maximum(x=shs, y=util.epsilon)))
+
+        return self.apply_diffs(diffs=self.unflatten(vector=step, variables=self.variables))
+
+    def solve(self, gradient, kl_divergence, variables):
+        """
+        Approximately solves (F + damping * I) x = gradient by conjugate gradients in a
+        `tf.while_loop`.
+
+        Args:
+            gradient: Flat gradient vector
+            kl_divergence: Function which takes the Fisher subsample fraction and returns the KL
+                divergence per instance between the fixed and the current policy, evaluated on
+                a subsample of the states of that size. Alternatively the KL divergence per
+                instance for the full batch, which is then subsampled after the forward pass.
+            variables: Variables of the policy
+
+        Returns: Flat search direction x and 0.5 * x^T F x
+
+        """
+        if callable(kl_divergence):
+            kl_divergence = kl_divergence(self.fisher_subsample)
+        elif self.fisher_subsample < 1.0:
+            # Fisher-vector products on a random subsample, fixed for all iterations
+            indices = self.subsample_indices(
+                batch_size=tf.shape(input=kl_divergence)[0],
+                fisher_subsample=self.fisher_subsample
+            )
+            kl_divergence = tf.gather(params=kl_divergence, indices=indices)
+        kl_divergence = tf.reduce_mean(input_tensor=kl_divergence, axis=0)
+
+        kl_gradients = tf.gradients(kl_divergence, variables)
+        kl_gradient = self.flatten(tensors=[
+            tf.zeros_like(tensor=variable) if kl_grad is None else kl_grad for variable, kl_grad in zip(variables, kl_gradients)
+        ])
+
+        def fisher_vector_product(vector):
+            gradient_vector_product = tf.reduce_sum(input_tensor=(kl_gradient * tf.stop_gradient(vector)))
+            products = tf.gradients(gradient_vector_product, variables)
+            product = self.flatten(tensors=[
+                tf.zeros_like(tensor=variable) if product is None else product for variable, product in zip(variables, products)
+            ])
+            return product + self.cg_damping * vector
+
+        def cg_step(n, x, residual, direction, residual_dot_residual):
+            z = fisher_vector_product(vector=direction)
+            direction_dot_z = tf.reduce_sum(input_tensor=(direction * z))
+            direction_dot_z = tf.where(
+                condition=(tf.abs(x=direction_dot_z) < util.epsilon),
+                x=tf.constant(value=util.epsilon, dtype=tf.float32),
+                y=direction_dot_z
+            )
+            v = residual_dot_residual / direction_dot_z
+            x += v * direction
+            residual -= v * z
+            new_residual_dot_residual = tf.reduce_sum(input_tensor=(residual * residual))
+            alpha = new_residual_dot_residual / (residual_dot_residual + util.epsilon)
+
+            # Construct new search direction as linear combination of residual and previous
+            # search vector.
+            direction = residual + alpha * direction
+            return n + 1, x, residual, direction, new_residual_dot_residual
+
+        def cg_continue(n, x, residual, direction, residual_dot_residual):
+            return tf.logical_and(x=(n < self.cg_iterations), y=(residual_dot_residual >= self.stop_residual))
+
+        _, search_direction, _, _, _ = tf.while_loop(
+            cond=cg_continue,
+            body=cg_step,
+            loop_vars=(
+                tf.constant(value=0, dtype=tf.int32),
+                tf.zeros_like(tensor=gradient),
+                gradient,
+                gradient,
+                tf.reduce_sum(input_tensor=(gradient * gradient))
+            ),
+            back_prop=False
+        )
+
+        shs = 0.5 * tf.reduce_sum(input_tensor=(search_direction * fisher_vector_product(vector=search_direction)))
+        return search_direction, shs
+
+    @staticmethod
+    def subsample_indices(batch_size, fisher_subsample):
+        """
+        Random indices of a subsample of the batch, at least one instance.
+
+        Args:
+            batch_size: Batch size tensor
+            fisher_subsample: Fraction of the batch
+
+        Returns: Index tensor
+
+        """
+        subsample_size = tf.maximum(x=tf.cast(x=(tf.cast(x=batch_size, dtype=tf.float32) * fisher_subsample), dtype=tf.int32), y=1)
+        return tf.random_shuffle(value=tf.range(start=batch_size))[:subsample_size]
+
+    @staticmethod
+    def flatten(tensors):
+        return tf.concat(values=[tf.reshape(tensor=tensor, shape=(-1,)) for tensor in tensors], axis=0)
+
+    @staticmethod
+    def unflatten(vector, variables):
+        tensors = list()
+        offset = 0
+        for variable in variables:
+            shape = util.shape(variable)
+            size = util.prod(shape)
+            tensors.append(tf.reshape(tensor=vector[offset:offset + size], shape=shape))
+            offset += size
+        return tensors
@@ -64,6 +64,13 @@ class Preprocessing(object):
         for processor in self.preprocessors:
             processor.reset()
 
+    def get_state(self):
+        return [processor.get_state() for processor in self.preprocessors]
+
+    def set_state(self, state):
+        for processor, processor_state in zip(self.preprocessors, state):
+            processor.set_state(state=processor_state)
+
     @staticmethod
     def from_config(config):
         if not isinstance(config, list):
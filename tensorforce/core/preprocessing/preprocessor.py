@@ -50,3 +50,12 @@ class Preprocessor(object):
 
     def reset(self):
         pass
+
+    def get_state(self):
+        """
+        Returns: Dict of the preprocessor parameters and state, e.g. buffered states
+        """
+        return dict(self.__dict__)
+
+    def set_state(self, state):
+        self.__dict__.update(state)
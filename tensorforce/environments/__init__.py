@@ -14,6 +14,13 @@
 # ==============================================================================
 
 
+import sys
+
 from tensorforce.environments.environment import Environment
+from tensorforce.environments.environment_pool import EnvironmentPool
+
+__all__ = ['Environment', 'EnvironmentPool']
 
-__all__ = ['Environment']
+if sys.version_info >= (3, 5):
+    from tensorforce.environments.async_environment import AsyncEnvironment, AsyncEnvironmentAdapter
+    __all__.extend(['AsyncEnvironment', 'AsyncEnvironmentAdapter'])
@@ -0,0 +1,98 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Asynchronous environment protocol for environments whose steps mostly wait on I/O, e.g. remote
+or simulator-backed environments. Requires Python 3.5+.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from tensorforce.environments.environment import Environment
+
+
+class AsyncEnvironment(Environment):
+    """
+    Base class for asynchronous environments, where `reset` and `execute` are coroutines.
+    """
+
+    async def reset(self):
+        """
+        Reset environment and setup for new episode.
+
+        Returns: initial state of resetted environment.
+        """
+        raise NotImplementedError
+
+    async def execute(self, action):
+        """
+        Executes action, observes next state and reward.
+
+        Args:
+            action: Action to execute.
+
+        Returns: tuple of state (tuple), reward (float), and terminal_state (bool).
+        """
+        raise NotImplementedError
+
+
+class AsyncEnvironmentAdapter(AsyncEnvironment):
+
+    def __init__(self, environment, executor=None):
+        """
+        Wraps a synchronous environment, running its blocking calls in an executor so that
+        steps of many environments can be in flight at the same time.
+
+        Args:
+            environment: Synchronous `Environment` object
+            executor: Optional executor, defaults to a single thread owned by the adapter, so
+                that all calls of the environment happen on the same thread
+        """
+        self.environment = environment
+        if executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            self.owns_executor = True
+        else:
+            self.executor = executor
+            self.owns_executor = False
+
+    def __str__(self):
+        return 'AsyncEnvironmentAdapter({})'.format(self.environment)
+
+    def close(self):
+        self.environment.close()
+        if self.owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def reset(self):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self.environment.reset)
+
+    async def execute(self, action):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self.environment.execute, action)
+
+    @property
+    def states(self):
+        return self.environment.states
+
+    @property
+    def actions(self):
+        return self.environment.actions
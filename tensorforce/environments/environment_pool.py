@@ -0,0 +1,352 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Pool of environments running in worker processes. States are transferred via preallocated shared
+memory arrays instead of being pickled, only actions, rewards and terminals pass through pipes.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import logging
+import multiprocessing
+import traceback
+
+import numpy as np
+
+from tensorforce import util, TensorForceError
+from tensorforce.environments import Environment
+
+
+def _run_worker(environment_fn, pipe, buffers, shapes, dtypes):
+    """
+    Worker process loop, executing pool commands on its environment.
+    """
+    try:
+        environment = environment_fn()
+        views = {name: np.frombuffer(buffer, dtype=dtypes[name]).reshape(shapes[name]) for name, buffer in buffers.items()}
+
+        def write_state(state):
+            if not isinstance(state, dict):
+                state = dict(state=state)
+            for name, view in views.items():
+                view[...] = state[name]
+
+        while True:
+            command, data = pipe.recv()
+            if command == 'reset':
+                write_state(state=environment.reset())
+                pipe.send(('ok', None))
+            elif command == 'execute':
+                action, repeat_actions = data
+                reward = 0
+                for _ in range(repeat_actions):
+                    state, step_reward, terminal = environment.execute(action=action)
+                    reward += step_reward
+                    if terminal:
+                        break
+                write_state(state=state)
+                pipe.send(('ok', (reward, terminal)))
+            elif command == 'close':
+                environment.close()
+                pipe.send(('ok', None))
+                return
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        pipe.send(('error', traceback.format_exc()))
+
+
+class EnvironmentPool(object):
+
+    def __init__(self, environment_fn, num_environments, states=None, actions=None, max_restarts=3):
+        """
+        Creates a pool of environments, each running in its own worker process.
+
+        Steps can be synchronous, via `execute` for all environments or via the `Environment`
+        proxies in `environments` which plug into `Runner`, or asynchronous via `send` and
+        `receive`. A worker which crashes or raises is restarted with a fresh environment, and the
+        interrupted step is reported as terminal.
+
+        Args:
+            environment_fn: Function creating an environment, called in the worker processes (must be
+                picklable unless workers are forked)
+            num_environments: Number of environments
+            states: State specification, if None obtained from a temporary environment
+            actions: Action specification, if None obtained from a temporary environment
+            max_restarts: Maximum number of restarts per worker before an error is raised
+        """
+        self.environment_fn = environment_fn
+        self.max_restarts = max_restarts
+        self.logger = logging.getLogger(__name__)
+
+        if states is None or actions is None:
+            environment = environment_fn()
+            states = environment.states
+            actions = environment.actions
+            environment.close()
+        self.states = states
+        self.actions = actions
+
+        self.unique_state = ('shape' in states)
+        if self.unique_state:
+            states = dict(state=states)
+        self.shapes = dict()
+        self.dtypes = dict()
+        for name, state in states.items():
+            shape = state['shape']
+            self.shapes[name] = (shape,) if isinstance(shape, int) else tuple(shape)
+            self.dtypes[name] = util.np_dtype(state.get('type', 'float'))
+
+        self.buffers = list()
+        self.views = list()
+        self.pipes = list()
+        self.processes = list()
+        self.restarts = list()
+        self.pending = list()
+        for index in range(num_environments):
+            # Shared memory is allocated once and kept across worker restarts
+            buffers = dict()
+            views = dict()
+            for name, shape in self.shapes.items():
+                dtype = np.dtype(self.dtypes[name])
+                buffers[name] = multiprocessing.RawArray('b', max(util.prod(shape), 1) * dtype.itemsize)
+                views[name] = np.frombuffer(buffers[name], dtype=dtype).reshape(shape)
+            self.buffers.append(buffers)
+            self.views.append(views)
+            self.pipes.append(None)
+            self.processes.append(None)
+            self.restarts.append(0)
+            self.pending.append(None)
+            self.start_worker(index=index)
+
+        self.environments = [PoolEnvironment(pool=self, index=index) for index in range(num_environments)]
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __str__(self):
+        return 'EnvironmentPool({})'.format(len(self))
+
+    def start_worker(self, index):
+        pipe, worker_pipe = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_run_worker,
+            args=(self.environment_fn, worker_pipe, self.buffers[index], self.shapes, self.dtypes)
+        )
+        process.daemon = True
+        process.start()
+        worker_pipe.close()
+        self.pipes[index] = pipe
+        self.processes[index] = process
+
+    def restart_worker(self, index, error):
+        self.restarts[index] += 1
+        if self.restarts[index] > self.max_restarts:
+            raise TensorForceError("Environment worker {} failed {} times: {}".format(index, self.restarts[index], error))
+        self.logger.warning("Restarting environment worker {}: {}".format(index, error))
+
+        self.pipes[index].close()
+        if self.processes[index].is_alive():
+            self.processes[index].terminate()
+        self.processes[index].join()
+        self.start_worker(index=index)
+
+        self.pipes[index].send(('reset', None))
+        status, data = self.pipes[index].recv()
+        if status != 'ok':
+            self.restart_worker(index=index, error=data)
+
+    def send(self, index, action, repeat_actions=1):
+        """
+        Starts executing an action without waiting for the result.
+
+        Args:
+            index: Environment index
+            action: Action to execute
+            repeat_actions: Number of times the action is repeated, rewards are summed
+        """
+        if self.pending[index] is not None:
+            raise TensorForceError("Environment {} has a pending step.".format(index))
+        self.pending[index] = 'execute'
+        try:
+            self.pipes[index].send(('execute', (action, repeat_actions)))
+        except (IOError, OSError) as error:
+            # Broken pipe, the worker is restarted in receive
+            self.pending[index] = error
+
+    def send_reset(self, index):
+        """
+        Starts resetting an environment without waiting for the result.
+
+        Args:
+            index: Environment index
+        """
+        if self.pending[index] is not None:
+            raise TensorForceError("Environment {} has a pending step.".format(index))
+        self.pending[index] = 'reset'
+        try:
+            self.pipes[index].send(('reset', None))
+        except (IOError, OSError) as error:
+            self.pending[index] = error
+
+    def receive(self, index):
+        """
+        Waits for the result of a pending step or reset.
+
+        Args:
+            index: Environment index
+
+        Returns: Tuple of state, reward and terminal for a step, state for a reset
+
+        """
+        pending = self.pending[index]
+        if pending is None:
+            raise TensorForceError("Environment {} has no pending step.".format(index))
+        self.pending[index] = None
+
+        if pending in ('execute', 'reset'):
+            try:
+                status, data = self.pipes[index].recv()
+            except (EOFError, IOError, OSError) as error:
+                status, data = 'error', error
+        else:
+            status, data = 'error', pending
+
+        if status != 'ok':
+            # The interrupted episode ends, the restarted environment has been reset
+            self.restart_worker(index=index, error=data)
+            if pending == 'reset':
+                return self.read_state(index=index)
+            return self.read_state(index=index), 0.0, True
+
+        if pending == 'reset':
+            return self.read_state(index=index)
+        reward, terminal = data
+        return self.read_state(index=index), reward, terminal
+
+    def ready(self, timeout=None):
+        """
+        Returns the indices of environments whose pending steps have finished.
+
+        Args:
+            timeout: Seconds to wait for at least one environment, None to block
+
+        Returns: List of environment indices
+
+        """
+        pipes = {self.pipes[index]: index for index, pending in enumerate(self.pending) if pending is not None}
+        if not pipes:
+            return list()
+        return sorted(pipes[pipe] for pipe in util.wait_connections(connections=list(pipes), timeout=timeout))
+
+    def reset(self, index=None):
+        """
+        Resets one or all environments, the latter in parallel.
+
+        Args:
+            index: Environment index, None for all environments
+
+        Returns: State, or list of states if all environments are reset
+
+        """
+        if index is not None:
+            self.send_reset(index=index)
+            return self.receive(index=index)
+
+        for index in range(len(self)):
+            self.send_reset(index=index)
+        return [self.receive(index=index) for index in range(len(self))]
+
+    def execute(self, actions, repeat_actions=1):
+        """
+        Executes one action per environment in parallel and waits for all results.
+
+        Args:
+            actions: List of actions, one per environment
+            repeat_actions: Number of times the actions are repeated, rewards are summed
+
+        Returns: List of state, reward and terminal tuples
+
+        """
+        for index, action in enumerate(actions):
+            self.send(index=index, action=action, repeat_actions=repeat_actions)
+        return [self.receive(index=index) for index in range(len(actions))]
+
+    def read_state(self, index):
+        # States are copied since the shared memory is overwritten by the next step
+        if self.unique_state:
+            return np.array(self.views[index]['state'])
+        return {name: np.array(view) for name, view in self.views[index].items()}
+
+    def close(self):
+        """
+        Closes all environments and stops the worker processes.
+        """
+        for index, (pipe, process) in enumerate(zip(self.pipes, self.processes)):
+            if process is None:
+                continue
+            try:
+                if self.pending[index] in ('execute', 'reset'):
+                    pipe.recv()
+                pipe.send(('close', None))
+                pipe.recv()
+            except (EOFError, IOError, OSError):
+                pass
+            pipe.close()
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            self.processes[index] = None
+            self.pending[index] = None
+
+
+class PoolEnvironment(Environment):
+
+    def __init__(self, pool, index):
+        """
+        Synchronous `Environment` interface to one environment of a pool.
+
+        Args:
+            pool: Environment pool
+            index: Environment index
+        """
+        self.pool = pool
+        self.index = index
+
+    def __str__(self):
+        return 'PoolEnvironment({})'.format(self.index)
+
+    def close(self):
+        # Workers are closed together via the pool
+        pass
+
+    def reset(self):
+        return self.pool.reset(index=self.index)
+
+    def execute(self, action):
+        self.pool.send(index=self.index, action=action)
+        return self.pool.receive(index=self.index)
+
+    @property
+    def states(self):
+        return self.pool.states
+
+    @property
+    def actions(self):
+        return self.pool.actions
@@ -13,7 +13,22 @@
 # limitations under the License.
 # ==============================================================================
 
+import sys
+
+from tensorforce.execution.apex_runner import ApeXRunner
+from tensorforce.execution.checkpoint_manager import CheckpointManager
+from tensorforce.execution.distributed_launcher import DistributedLauncher
+from tensorforce.execution.evaluation_runner import EvaluationRunner
+from tensorforce.execution.impala_runner import ImpalaRunner
+from tensorforce.execution.inference_server import InferenceServer
+from tensorforce.execution.metrics import MetricsRegistry, PrometheusExporter, JsonLinesExporter, TensorBoardExporter
 from tensorforce.execution.runner import Runner
 from tensorforce.execution.threaded_runner import ThreadedRunner
+from tensorforce.execution.vectorized_runner import VectorizedRunner
+
+__all__ = ['ApeXRunner', 'CheckpointManager', 'DistributedLauncher', 'EvaluationRunner', 'ImpalaRunner', 'InferenceServer', 'MetricsRegistry', 'PrometheusExporter', 'JsonLinesExporter',
+           'TensorBoardExporter', 'Runner', 'ThreadedRunner', 'VectorizedRunner']
 
-__all__ = ['Runner', 'ThreadedRunner']
+if sys.version_info >= (3, 5):
+    from tensorforce.execution.async_runner import AsyncRunner
+    __all__.append('AsyncRunner')
@@ -0,0 +1,436 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Ape-X style distributed prioritized experience replay on a single host (Horgan et al., 2018).
+Actor processes explore with per-actor epsilon and compute initial priorities locally, a central
+replay process stores transitions in a sum tree, and the learner samples, updates and sends
+priority updates back. Actors run a TensorFlow-free `InferencePolicy` whose weights the learner
+periodically publishes in shared memory.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import copy
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from tensorforce import util, TensorForceError
+from tensorforce.inference import InferencePolicy
+
+
+class SumTree(object):
+
+    def __init__(self, capacity):
+        """
+        Binary sum tree over the priorities of a ring buffer, with vectorized updates and
+        stratified sampling in time logarithmic in the capacity.
+
+        Args:
+            capacity: Number of priorities, rounded up to a power of two internally
+        """
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(capacity))), 1)
+        self.leaves = 2 ** self.depth
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices) + self.leaves
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def sample(self, batch_size):
+        # One sample per equally sized priority segment
+        values = (np.arange(batch_size) + np.random.uniform(size=batch_size)) * (self.total / batch_size)
+        nodes = np.ones(batch_size, dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            right = values > left
+            values -= left * right
+            nodes = 2 * nodes + right
+        return nodes - self.leaves
+
+
+def _run_replay(connections, learner_connection, states_spec, actions_spec, capacity):
+    """
+    Central replay process. Receives prioritized transitions from actors and serves batches and
+    priority updates for the learner.
+    """
+    states = {name: np.zeros((capacity,) + tuple(shape), dtype=dtype) for name, (shape, dtype) in states_spec.items()}
+    next_states = {name: np.zeros((capacity,) + tuple(shape), dtype=dtype) for name, (shape, dtype) in states_spec.items()}
+    actions = {name: np.zeros((capacity,) + tuple(shape), dtype=dtype) for name, (shape, dtype) in actions_spec.items()}
+    rewards = np.zeros((capacity,), dtype=util.np_dtype('float'))
+    terminals = np.zeros((capacity,), dtype=util.np_dtype('bool'))
+    tree = SumTree(capacity=capacity)
+    size = 0
+    index = 0
+    timesteps = 0
+    episodes = list()
+
+    connections = list(connections) + [learner_connection]
+    while True:
+        for connection in util.wait_connections(connections=connections):
+            try:
+                message = connection.recv()
+            except EOFError:
+                connections.remove(connection)
+                continue
+
+            if connection is not learner_connection:
+                batch, priorities, actor_episodes = message
+                indices = (index + np.arange(len(priorities))) % capacity
+                for name in states:
+                    states[name][indices] = batch['states'][name]
+                    next_states[name][indices] = batch['next_states'][name]
+                for name in actions:
+                    actions[name][indices] = batch['actions'][name]
+                rewards[indices] = batch['rewards']
+                terminals[indices] = batch['terminals']
+                tree.update(indices=indices, priorities=priorities)
+                index = (index + len(priorities)) % capacity
+                size = min(size + len(priorities), capacity)
+                timesteps += len(priorities)
+                episodes.extend(actor_episodes)
+
+            elif message[0] == 'sample':
+                batch_size, min_size = message[1:]
+                if size < max(batch_size, min_size):
+                    connection.send(dict(batch=None, timesteps=timesteps, episodes=episodes))
+                else:
+                    indices = np.minimum(tree.sample(batch_size=batch_size), size - 1)
+                    connection.send(dict(
+                        batch=dict(
+                            states={name: state.take(indices, axis=0) for name, state in states.items()},
+                            actions={name: action.take(indices, axis=0) for name, action in actions.items()},
+                            rewards=rewards.take(indices),
+                            terminals=terminals.take(indices),
+                            internals=[],
+                            next_states={name: state.take(indices, axis=0) for name, state in next_states.items()},
+                            next_internals=[]
+                        ),
+                        indices=indices,
+                        timesteps=timesteps,
+                        episodes=episodes
+                    ))
+                episodes = list()
+
+            elif message[0] == 'priorities':
+                tree.update(indices=message[1], priorities=message[2])
+
+            elif message[0] == 'close':
+                return
+
+
+def _run_actor(actor_id, environment_fn, connection, spec, weights_layout, shared_weights, weights_version,
+               stop, epsilon, discount, prioritization_weight, preprocessing, reward_preprocessing,
+               actions_spec, send_size, max_timesteps, seed):
+    """
+    Actor process. Explores with a constant epsilon and sends batches of transitions with
+    initial priorities to the replay process.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    environment = environment_fn()
+    policy = None
+    version = -1
+
+    def preprocess(state):
+        if policy.unique_state:
+            state = dict(state=state)
+        else:
+            state = dict(state)
+        for name, stack in preprocessing.items():
+            state[name] = stack.process(state=state[name])
+        return state
+
+    buffer = list()
+    episodes = list()
+    try:
+        while not stop.value:
+            if weights_version.value != version:
+                with shared_weights.get_lock():
+                    version = weights_version.value
+                    flat_weights = np.frombuffer(shared_weights.get_obj(), dtype=np.float32).copy()
+                weights = dict()
+                for name, offset, shape in weights_layout:
+                    weights[name] = flat_weights[offset:offset + util.prod(shape)].reshape(shape)
+                policy = InferencePolicy(spec=spec, weights=weights)
+
+            for stack in preprocessing.values():
+                stack.reset()
+            state = preprocess(state=environment.reset())
+            episode_reward = 0
+            timestep = 0
+
+            while not stop.value:
+                if random.random() < epsilon:
+                    action = {name: np.random.randint(num_actions, size=shape) for name, (shape, num_actions) in actions_spec.items()}
+                else:
+                    values = policy.action_values(states={name: np.expand_dims(value, axis=0) for name, value in state.items()})
+                    action = {name: np.argmax(value[0], axis=-1) for name, value in values.items()}
+
+                next_state, reward, terminal = environment.execute(action=(action['action'] if policy.unique_action else action))
+                next_state = preprocess(state=next_state)
+                if reward_preprocessing is not None:
+                    reward = reward_preprocessing.process(reward)
+                buffer.append((state, action, reward, terminal, next_state))
+                episode_reward += reward
+                timestep += 1
+                state = next_state
+
+                if len(buffer) >= send_size:
+                    batch = dict(
+                        states={name: np.stack([transition[0][name] for transition in buffer]) for name in state},
+                        actions={name: np.stack([transition[1][name] for transition in buffer]) for name in actions_spec},
+                        rewards=np.array([transition[2] for transition in buffer], dtype=util.np_dtype('float')),
+                        terminals=np.array([transition[3] for transition in buffer], dtype=util.np_dtype('bool')),
+                        next_states={name: np.stack([transition[4][name] for transition in buffer]) for name in state}
+                    )
+                    connection.send((batch, _priorities(policy, batch, discount, prioritization_weight), episodes))
+                    buffer = list()
+                    episodes = list()
+
+                if terminal or timestep == max_timesteps:
+                    break
+
+            episodes.append((actor_id, episode_reward, timestep))
+
+    except (IOError, EOFError):
+        # Replay process is gone
+        pass
+    finally:
+        environment.close()
+
+
+def _priorities(policy, batch, discount, prioritization_weight):
+    """
+    Initial priorities as the squared one-step TD errors under the actor's policy, analogous
+    to the learner's loss per instance.
+    """
+    values = policy.action_values(states=batch['states'])
+    next_values = policy.action_values(states=batch['next_states'])
+    deltas = list()
+    for name, value in values.items():
+        action = batch['actions'][name]
+        q_value = np.take_along_axis(value, np.expand_dims(action, axis=-1), axis=-1)[..., 0]
+        reward = np.reshape(batch['rewards'], (-1,) + (1,) * (action.ndim - 1))
+        terminal = np.reshape(batch['terminals'], (-1,) + (1,) * (action.ndim - 1))
+        q_target = reward + (1.0 - terminal) * discount * next_values[name].max(axis=-1)
+        deltas.append(np.reshape(q_target - q_value, (len(batch['rewards']), -1)))
+    delta = np.mean(np.concatenate(deltas, axis=1), axis=1)
+    return np.maximum(np.square(delta), util.epsilon) ** prioritization_weight
+
+
+class ApeXRunner(object):
+
+    def __init__(self, agent, environment_fn, num_actors=4, memory_capacity=100000, batch_size=None,
+                 first_update=None, epsilon=0.4, epsilon_alpha=7.0, prioritization_weight=0.6,
+                 send_size=50, weights_interval=50, seed=0):
+        """
+        Initialize an Ape-X runner. The agent acts as learner, its model has to be a DQN-type model
+        supporting `export_inference` without internal states, e.g. `DQNAgent` with a layered
+        network. Actor `i` of `N` explores with `epsilon ** (1 + epsilon_alpha * i / (N - 1))`.
+
+        Args:
+            agent: Learner agent
+            environment_fn: Function returning a new `Environment` object, called once per actor
+            num_actors: Number of actor processes
+            memory_capacity: Capacity of the central replay memory
+            batch_size: Learner batch size, defaults to the agent batch size
+            first_update: Minimum number of transitions before the first update, defaults to the
+                agent's `first_update`
+            epsilon: Base exploration epsilon
+            epsilon_alpha: Exponent scale of the per-actor epsilons
+            prioritization_weight: Priority exponent alpha
+            send_size: Number of transitions an actor collects before sending them to the replay
+            weights_interval: Number of learner updates between weight publications
+            seed: Base random seed of the actors
+        """
+        if agent.model.internal_inputs:
+            raise TensorForceError("Ape-X runner does not support models with internal states.")
+        if any(action.continuous for _, action in agent.actions_config):
+            raise TensorForceError("Ape-X runner requires discrete actions.")
+        self.agent = agent
+        self.environment_fn = environment_fn
+        self.num_actors = num_actors
+        self.memory_capacity = memory_capacity
+        self.batch_size = agent.batch_size if batch_size is None else batch_size
+        self.first_update = getattr(agent, 'first_update', self.batch_size) if first_update is None else first_update
+        if num_actors > 1:
+            self.epsilons = [epsilon ** (1.0 + epsilon_alpha * n / (num_actors - 1)) for n in range(num_actors)]
+        else:
+            self.epsilons = [epsilon]
+        self.prioritization_weight = prioritization_weight
+        self.send_size = send_size
+        self.weights_interval = weights_interval
+        self.seed = seed
+
+        self.spec, weights = agent.inference_snapshot()
+        self.weights_layout = list()
+        offset = 0
+        for name in sorted(weights):
+            self.weights_layout.append((name, offset, weights[name].shape))
+            offset += weights[name].size
+        self.shared_weights = multiprocessing.Array('f', offset)
+        self.weights_version = multiprocessing.Value('i', 0)
+        self.publish_weights(weights=weights)
+
+    def publish_weights(self, weights=None):
+        """
+        Writes the current learner weights to shared memory, from where actors load them before
+        their next episode.
+
+        Args:
+            weights: Optional weights snapshot, fetched from the model if None
+        """
+        if weights is None:
+            _, weights = self.agent.inference_snapshot()
+        flat_weights = np.concatenate([np.reshape(weights[name], (-1,)) for name, _, _ in self.weights_layout])
+        with self.shared_weights.get_lock():
+            np.frombuffer(self.shared_weights.get_obj(), dtype=np.float32)[:] = flat_weights
+            self.weights_version.value += 1
+
+    def run(self, updates=-1, episodes=-1, max_timesteps=-1, episode_finished=None):
+        """
+        Starts the replay and actor processes and runs the learner until the given number of
+        updates or actor episodes is completed. Episodes are recorded in the order in which the
+        replay process receives them.
+
+        Args:
+            updates: Number of learner updates
+            episodes: Number of actor episodes
+            max_timesteps: Max timesteps in a given episode
+            episode_finished: Optional termination condition, e.g. a particular mean reward threshold
+
+        Returns:
+
+        """
+        # save episode reward and length for statistics
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.episode_actors = []
+
+        self.total_timesteps = 0
+        self.episode = 0
+        self.updates = 0
+        self.start_time = time.time()
+
+        states_spec = {name: (tuple(state.shape), util.np_dtype(state.type)) for name, state in self.agent.states_config}
+        actions_spec = {name: (tuple(action.shape), util.np_dtype('int')) for name, action in self.agent.actions_config}
+
+        stop = multiprocessing.Value('b', False)
+        learner_connection, replay_learner_connection = multiprocessing.Pipe()
+        actor_connections = list()
+        replay_actor_connections = list()
+        for _ in range(self.num_actors):
+            replay_actor_connection, actor_connection = multiprocessing.Pipe(duplex=False)
+            replay_actor_connections.append(replay_actor_connection)
+            actor_connections.append(actor_connection)
+
+        replay = multiprocessing.Process(
+            target=_run_replay,
+            args=(replay_actor_connections, replay_learner_connection, states_spec, actions_spec, self.memory_capacity)
+        )
+        replay.daemon = True
+        replay.start()
+
+        actors = list()
+        for n in range(self.num_actors):
+            actor = multiprocessing.Process(target=_run_actor, kwargs=dict(
+                actor_id=n,
+                environment_fn=self.environment_fn,
+                connection=actor_connections[n],
+                spec=self.spec,
+                weights_layout=self.weights_layout,
+                shared_weights=self.shared_weights,
+                weights_version=self.weights_version,
+                stop=stop,
+                epsilon=self.epsilons[n],
+                discount=self.agent.model.discount,
+                prioritization_weight=self.prioritization_weight,
+                preprocessing=copy.deepcopy(self.agent.preprocessing),
+                reward_preprocessing=copy.deepcopy(self.agent.reward_preprocessing),
+                actions_spec={name: (tuple(action.shape), action.num_actions) for name, action in self.agent.actions_config},
+                send_size=self.send_size,
+                max_timesteps=max_timesteps,
+                seed=(self.seed + n)
+            ))
+            actor.daemon = True
+            actor.start()
+            actors.append(actor)
+
+        requested = False
+        try:
+            # Batches are requested ahead, so sampling overlaps with the update
+            learner_connection.send(('sample', self.batch_size, self.first_update))
+            requested = True
+            should_stop = False
+            while not should_stop:
+                response = learner_connection.recv()
+                learner_connection.send(('sample', self.batch_size, self.first_update))
+                self.total_timesteps = response['timesteps']
+
+                for actor_id, episode_reward, timestep in response['episodes']:
+                    self.episode_rewards.append(episode_reward)
+                    self.episode_lengths.append(timestep)
+                    self.episode_actors.append(actor_id)
+                    self.episode += 1
+                    if (episode_finished and not episode_finished(self)) or self.episode == episodes:
+                        should_stop = True
+                        break
+
+                if should_stop or response['batch'] is None:
+                    if response['batch'] is None:
+                        if not any(actor.is_alive() for actor in actors):
+                            raise TensorForceError("All Ape-X actors have stopped before the replay memory was filled.")
+                        time.sleep(0.01)
+                    continue
+
+                # Target network updates refer to the number of actor timesteps
+                self.agent.model.timestep = self.total_timesteps
+                _, loss_per_instance = self.agent.model.update(batch=response['batch'])
+                priorities = np.maximum(loss_per_instance, util.epsilon) ** self.prioritization_weight
+                learner_connection.send(('priorities', response['indices'], priorities))
+                self.updates += 1
+
+                if self.updates % self.weights_interval == 0:
+                    self.publish_weights()
+                if self.updates == updates:
+                    should_stop = True
+
+        finally:
+            stop.value = True
+            for actor in actors:
+                actor.join(timeout=5.0)
+                if actor.is_alive():
+                    actor.terminate()
+            # Read the outstanding batch, so the replay process does not block on sending it
+            if requested and learner_connection.poll(5.0):
+                learner_connection.recv()
+            learner_connection.send(('close',))
+            replay.join(timeout=5.0)
+            if replay.is_alive():
+                replay.terminate()
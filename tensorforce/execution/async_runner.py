@@ -0,0 +1,210 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Asyncio-based runner overlapping the steps of many I/O-latency-bound environments, with batched
+action selection for all environments whose steps completed. Requires Python 3.5+.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import asyncio
+import time
+
+from tensorforce import TensorForceError
+from tensorforce.agents import Agent
+from tensorforce.environments.async_environment import AsyncEnvironment, AsyncEnvironmentAdapter
+
+
+class AsyncRunner(object):
+
+    def __init__(self, agents, environments, repeat_actions=1, batch_wait=0.0, save_path=None, save_episodes=None):
+        """
+        Initialize an async runner. Each environment has its own agent, while all agents share
+        one model, e.g. `agents = [VPGAgent(config=config, model=model) for _ in environments]`.
+        Environment steps are in flight concurrently, and whenever steps complete, the actions
+        for all completed environments are computed in a single batched model call.
+
+        Args:
+            agents: List of `Agent` objects sharing one model
+            environments: List of `AsyncEnvironment` objects, one per agent. Synchronous
+                environments are wrapped in an `AsyncEnvironmentAdapter`
+            repeat_actions:
+            batch_wait: Seconds to wait for further environment steps to complete after the first
+                one, before computing actions
+            save_path:
+            save_episodes:
+        """
+        if len(agents) != len(environments):
+            raise TensorForceError("Each agent must have its own environment. Got {a} agents and {e} environments.".
+                                   format(a=len(agents), e=len(environments)))
+        if any(agent.model is not agents[0].model for agent in agents):
+            raise TensorForceError("Agents of an async runner must share one model.")
+        self.agents = agents
+        self.environments = [
+            environment if isinstance(environment, AsyncEnvironment) else AsyncEnvironmentAdapter(environment=environment)
+            for environment in environments
+        ]
+        self.repeat_actions = repeat_actions
+        self.batch_wait = batch_wait
+        self.save_path = save_path
+        self.save_episodes = save_episodes
+
+    def run(self, episodes=-1, max_timesteps=-1, episode_finished=None):
+        """
+        Runs the environments on a new event loop until the specified number of episodes is
+        completed over all environments. Within a running event loop, use `run_async` instead.
+
+        Args:
+            episodes: Number of episodes to execute
+            max_timesteps: Max timesteps in a given episode
+            episode_finished: Optional termination condition, e.g. a particular mean reward threshold
+
+        Returns:
+
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.run_async(episodes=episodes, max_timesteps=max_timesteps, episode_finished=episode_finished))
+        finally:
+            loop.close()
+
+    async def run_async(self, episodes=-1, max_timesteps=-1, episode_finished=None):
+        """
+        Coroutine equivalent of `run`. Episodes are recorded in the order in which they finish.
+
+        Args:
+            episodes: Number of episodes to execute
+            max_timesteps: Max timesteps in a given episode
+            episode_finished: Optional termination condition, e.g. a particular mean reward threshold
+
+        Returns:
+
+        """
+        # save episode reward and length for statistics
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.episode_times = []
+
+        self.total_timesteps = 0
+        self.timestep = 0
+        self.episode = 0
+        self.start_time = time.time()
+
+        episode_rewards = [0] * len(self.environments)
+        timesteps = [0] * len(self.environments)
+        episode_start_times = [time.time()] * len(self.environments)
+
+        # Pending environment calls, mapped to the index of their environment and whether the call
+        # is a reset
+        pending = dict()
+        for n in range(len(self.environments)):
+            pending[asyncio.ensure_future(self.reset(n))] = (n, True)
+
+        should_stop = False
+        try:
+            while not should_stop:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if self.batch_wait > 0.0 and len(done) < len(pending):
+                    done, _ = await asyncio.wait(pending, timeout=self.batch_wait)
+
+                indices = list()
+                states = list()
+                for future in done:
+                    n, is_reset = pending.pop(future)
+                    if is_reset:
+                        indices.append(n)
+                        states.append(future.result())
+                        continue
+
+                    state, reward, terminal = future.result()
+                    self.agents[n].observe(reward=reward, terminal=terminal)
+
+                    timesteps[n] += 1
+                    self.total_timesteps += 1
+                    episode_rewards[n] += reward
+
+                    if terminal or timesteps[n] == max_timesteps:
+                        self.agents[n].observe_episode_reward(episode_rewards[n])
+                        self.episode_rewards.append(episode_rewards[n])
+                        self.episode_lengths.append(timesteps[n])
+                        self.episode_times.append(time.time() - episode_start_times[n])
+                        self.timestep = timesteps[n]
+                        self.episode += 1
+
+                        if self.save_path and self.save_episodes is not None and self.episode % self.save_episodes == 0:
+                            print("Saving agent after episode {}".format(self.episode))
+                            self.agents[n].save_model(self.save_path)
+
+                        if (episode_finished and not episode_finished(self)) or self.episode == episodes:
+                            should_stop = True
+                            break
+
+                        episode_rewards[n] = 0
+                        timesteps[n] = 0
+                        episode_start_times[n] = time.time()
+                        pending[asyncio.ensure_future(self.reset(n))] = (n, True)
+                    else:
+                        indices.append(n)
+                        states.append(state)
+
+                if should_stop or not indices:
+                    continue
+
+                agents = [self.agents[n] for n in indices]
+                actions = Agent.act_many(agents=agents, states=states)
+                for n, action in zip(indices, actions):
+                    pending[asyncio.ensure_future(self.execute(n, action))] = (n, False)
+        finally:
+            # Remaining environment calls are discarded
+            for future in pending:
+                future.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def reset(self, n):
+        """
+        Resets an environment and its agent.
+
+        Args:
+            n: Index of the environment
+
+        Returns: Initial state
+
+        """
+        state = await self.environments[n].reset()
+        self.agents[n].reset()
+        return state
+
+    async def execute(self, n, action):
+        """
+        Executes an action in an environment, repeated according to `repeat_actions`.
+
+        Args:
+            n: Index of the environment
+            action: Action to execute
+
+        Returns: Tuple of state, reward and terminal
+
+        """
+        reward = 0
+        for _ in range(self.repeat_actions):
+            state, step_reward, terminal = await self.environments[n].execute(action=action)
+            reward += step_reward
+            if terminal:
+                break
+        return state, reward, terminal
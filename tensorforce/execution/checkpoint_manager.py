@@ -0,0 +1,171 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Non-blocking model checkpointing. Variable values are snapshotted to host memory in a single
+session call and written to disk by a background thread. The `.npz` checkpoints can be restored
+via `CheckpointManager.restore` or `Agent.load_model`.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import re
+import threading
+
+import numpy as np
+from six.moves import queue
+import tensorflow as tf
+
+from tensorforce import TensorForceError
+
+
+class CheckpointManager(object):
+
+    def __init__(self, model, directory, prefix='checkpoint', keep_last=5):
+        """
+        Checkpoint manager which writes snapshots of the model variables asynchronously. Checkpoints
+        are first written to a temporary file and atomically renamed, so a checkpoint file is
+        always complete, and only the last `keep_last` checkpoints are retained.
+
+        Args:
+            model: Model to checkpoint
+            directory: Checkpoint directory
+            prefix: Checkpoint file name prefix
+            keep_last: Number of checkpoints to retain, None to keep all
+        """
+        self.model = model
+        self.directory = directory
+        self.prefix = prefix
+        self.keep_last = keep_last
+
+        with model.session.graph.as_default():
+            self.variables = tf.global_variables()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # Existing checkpoints are subject to retention as well
+        pattern = re.compile(r'^{}-(\d+)\.npz$'.format(re.escape(prefix)))
+        steps = sorted(int(match.group(1)) for match in (pattern.match(filename) for filename in os.listdir(directory)) if match)
+        # Written checkpoints, shared between the caller and the writer thread
+        self.checkpoints = [self.checkpoint_path(step=step) for step in steps]
+        self.lock = threading.Lock()
+
+        self.error = None
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._write_checkpoints)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def checkpoint_path(self, step):
+        return os.path.join(self.directory, '{}-{}.npz'.format(self.prefix, step))
+
+    def save(self, step=None):
+        """
+        Snapshots the model variables and schedules writing them to disk. Returns immediately.
+
+        Args:
+            step: Checkpoint step, defaults to the model timestep
+
+        Returns: Path of the checkpoint once written
+
+        """
+        self._check_error()
+        if step is None:
+            step = self.model.timestep
+
+        values = self.model.session.run(fetches=self.variables)
+        self.queue.put((step, {variable.name: value for variable, value in zip(self.variables, values)}))
+        return self.checkpoint_path(step=step)
+
+    def latest(self):
+        """
+        Returns: Path of the latest written checkpoint, or None
+
+        """
+        with self.lock:
+            if self.checkpoints:
+                return self.checkpoints[-1]
+            else:
+                return None
+
+    def restore(self, path=None):
+        """
+        Restores the model variables from a checkpoint.
+
+        Args:
+            path: Checkpoint path, defaults to the latest checkpoint
+
+        Returns: Path of the restored checkpoint
+
+        """
+        self.wait()
+        if path is None:
+            path = self.latest()
+            if path is None:
+                raise TensorForceError("No checkpoint in directory {}.".format(self.directory))
+
+        self.model.load_model(path)
+        return path
+
+    def wait(self):
+        """
+        Blocks until all scheduled checkpoints are written.
+        """
+        self.queue.join()
+        self._check_error()
+
+    def close(self):
+        """
+        Writes all scheduled checkpoints and stops the background thread.
+        """
+        self.queue.put(None)
+        self.thread.join()
+        self._check_error()
+
+    def _check_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise TensorForceError("Writing checkpoint failed: {}".format(error))
+
+    def _write_checkpoints(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                step, values = item
+                path = self.checkpoint_path(step=step)
+                temp_path = path + '.tmp'
+                with open(temp_path, 'wb') as filehandle:
+                    np.savez(filehandle, **values)
+                os.rename(temp_path, path)
+
+                with self.lock:
+                    if path in self.checkpoints:
+                        self.checkpoints.remove(path)
+                    self.checkpoints.append(path)
+                    while self.keep_last is not None and len(self.checkpoints) > self.keep_last:
+                        os.remove(self.checkpoints.pop(0))
+
+            except Exception as error:
+                self.error = error
+
+            finally:
+                self.queue.task_done()
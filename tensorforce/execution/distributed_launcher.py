@@ -0,0 +1,283 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Launcher for distributed training on a single host. Spawns the parameter server and worker tasks
+of `Runner`'s cluster mode as subprocesses on free local ports, monitors their health, restarts
+failed workers and shuts all tasks down cleanly.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from contextlib import closing
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+import tensorflow as tf
+
+from tensorforce import TensorForceError
+
+
+def _run_task(task_fn, cluster, task_index, log_path):
+    """
+    Task process. Optionally redirects output to a log file, then calls the task function with
+    the cluster specification.
+    """
+    if log_path is not None:
+        log_file = open(log_path, 'a')
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(log_file.fileno(), 1)
+        os.dup2(log_file.fileno(), 2)
+    task_fn(cluster_spec=tf.train.ClusterSpec(cluster), task_index=task_index)
+
+
+class DistributedLauncher(object):
+
+    def __init__(self, task_fn, num_workers, host='127.0.0.1', max_restarts=3, health_interval=1.0,
+                 startup_timeout=60.0, exit_timeout=10.0, logdir=None):
+        """
+        Initialize a distributed launcher. The task function is called in each task process with
+        the keyword arguments `cluster_spec` and `task_index`, where task index -1 denotes the
+        parameter server, and is expected to create an agent with `distributed_config` and run a
+        `Runner` with the same cluster spec and task index. Task processes are spawned, not
+        forked, where supported, so the task function has to be defined at module level.
+
+        Example:
+
+            ```python
+            def run_task(cluster_spec, task_index):
+                environment = OpenAIGym('CartPole-v0')
+                config = Configuration(...)
+                config.default(DistributedLauncher.distributed_config(cluster_spec, task_index))
+                agent = VPGAgent(config=config)
+                runner = Runner(agent=agent, environment=environment, cluster_spec=cluster_spec, task_index=task_index)
+                runner.run(episodes=1000)
+
+            if __name__ == '__main__':
+                DistributedLauncher(task_fn=run_task, num_workers=4).run()
+            ```
+
+        Args:
+            task_fn: Function run by each task process
+            num_workers: Number of worker tasks
+            host: Host address of the cluster
+            max_restarts: Maximum number of restarts per worker
+            health_interval: Seconds between health checks
+            startup_timeout: Seconds after which a task has to accept connections on its port
+            exit_timeout: Seconds a task which stopped accepting connections has to exit
+            logdir: Optional directory for the output of each task, e.g. `worker-0.log`
+        """
+        self.task_fn = task_fn
+        self.num_workers = num_workers
+        self.host = host
+        self.max_restarts = max_restarts
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+        self.exit_timeout = exit_timeout
+        self.logdir = logdir
+        self.logger = logging.getLogger(__name__)
+
+        if hasattr(multiprocessing, 'get_context'):
+            # A forked TensorFlow runtime is not safe to use, hence tasks start from scratch
+            self.context = multiprocessing.get_context('spawn')
+        else:
+            self.context = multiprocessing
+
+        self.cluster = None
+        self.tasks = list()
+        self.restarts = dict()
+
+    @staticmethod
+    def distributed_config(cluster_spec, task_index):
+        """
+        Agent configuration entries for a task of the cluster.
+
+        Args:
+            cluster_spec: Cluster specification
+            task_index: Task index, -1 for the parameter server
+
+        Returns: Configuration dict
+
+        """
+        return dict(
+            distributed=True,
+            cluster_spec=cluster_spec,
+            global_model=(task_index == -1),
+            device=('/job:ps' if task_index == -1 else '/job:worker/task:{}/cpu:0'.format(task_index))
+        )
+
+    def free_ports(self, num_ports):
+        """
+        Finds free ports by binding to port 0. All sockets are held until every port is chosen,
+        so the ports are distinct.
+
+        Args:
+            num_ports: Number of ports
+
+        Returns: List of ports
+
+        """
+        sockets = list()
+        try:
+            for _ in range(num_ports):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(sock)
+                sock.bind((self.host, 0))
+            return [sock.getsockname()[1] for sock in sockets]
+        finally:
+            for sock in sockets:
+                sock.close()
+
+    def start(self):
+        """
+        Chooses ports and starts the parameter server and all worker tasks.
+
+        Returns: Cluster dict of job names to lists of addresses
+
+        """
+        if self.tasks:
+            raise TensorForceError("Distributed launcher has already been started.")
+        if self.logdir is not None and not os.path.isdir(self.logdir):
+            os.makedirs(self.logdir)
+
+        ports = self.free_ports(num_ports=(self.num_workers + 1))
+        self.cluster = dict(
+            ps=['{}:{}'.format(self.host, ports[0])],
+            worker=['{}:{}'.format(self.host, port) for port in ports[1:]]
+        )
+        self.tasks = [dict(name='ps', task_index=-1, port=ports[0])]
+        for n, port in enumerate(ports[1:]):
+            self.tasks.append(dict(name='worker-{}'.format(n), task_index=n, port=port))
+        self.restarts = {task['name']: 0 for task in self.tasks}
+
+        for task in self.tasks:
+            self.start_task(task=task)
+        return self.cluster
+
+    def start_task(self, task):
+        if self.logdir is None:
+            log_path = None
+        else:
+            log_path = os.path.join(self.logdir, task['name'] + '.log')
+        task['process'] = self.context.Process(
+            target=_run_task,
+            args=(self.task_fn, self.cluster, task['task_index'], log_path)
+        )
+        task['process'].daemon = True
+        task['process'].start()
+        task['start_time'] = time.time()
+        task['ready'] = False
+        self.logger.info("Started {} on port {} (pid {}).".format(task['name'], task['port'], task['process'].pid))
+
+    def port_open(self, port):
+        with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
+            sock.settimeout(1.0)
+            return sock.connect_ex((self.host, port)) == 0
+
+    def poll(self):
+        """
+        Checks the health of all tasks and restarts failed workers. A task fails if it exits with
+        a non-zero exit code, does not accept connections on its port within the startup timeout,
+        or stops accepting connections afterwards without exiting within the exit timeout.
+
+        Returns: True once all workers have finished successfully
+
+        """
+        for task in self.tasks:
+            process = task['process']
+            if process.exitcode == 0 and task['task_index'] >= 0:
+                continue
+
+            if process.exitcode is None:
+                if self.port_open(port=task['port']):
+                    task['ready'] = True
+                    continue
+                elif not task['ready'] and time.time() - task['start_time'] < self.startup_timeout:
+                    continue
+
+                # A finished worker closes its server before it exits
+                process.join(timeout=self.exit_timeout)
+                if process.exitcode == 0 and task['task_index'] >= 0:
+                    continue
+
+            if process.exitcode is None:
+                self.logger.warning("{} does not accept connections on port {}.".format(task['name'], task['port']))
+                self.stop_process(process=process)
+            else:
+                self.logger.warning("{} exited with code {}.".format(task['name'], process.exitcode))
+
+            # Parameter state is lost with the parameter server
+            if task['task_index'] == -1:
+                raise TensorForceError("Parameter server failed.")
+            if self.restarts[task['name']] >= self.max_restarts:
+                raise TensorForceError("{} failed after {} restarts.".format(task['name'], self.max_restarts))
+            self.restarts[task['name']] += 1
+            self.start_task(task=task)
+
+        return all(task['process'].exitcode == 0 for task in self.tasks if task['task_index'] >= 0)
+
+    def run(self, timeout=None):
+        """
+        Starts the cluster, monitors it until all workers have finished and shuts it down.
+
+        Args:
+            timeout: Optional number of seconds after which the cluster is shut down
+
+        Returns:
+
+        """
+        self.start()
+        try:
+            start_time = time.time()
+            while not self.poll():
+                if timeout is not None and time.time() - start_time >= timeout:
+                    self.logger.warning("Shutting down cluster after timeout.")
+                    break
+                time.sleep(self.health_interval)
+        finally:
+            self.close()
+
+    def stop_process(self, process, timeout=5.0):
+        if process.exitcode is not None:
+            return
+        process.terminate()
+        process.join(timeout=timeout)
+        if process.exitcode is None:
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+    def close(self):
+        """
+        Terminates all remaining tasks, workers before the parameter server.
+        """
+        for task in reversed(self.tasks):
+            if 'process' in task:
+                self.stop_process(process=task['process'])
+        self.tasks = list()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,187 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Runner evaluating snapshots of a policy in a process pool, asynchronously to training.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import copy
+import multiprocessing
+import threading
+
+from concurrent.futures import Future
+import numpy as np
+
+from tensorforce import TensorForceError
+from tensorforce.inference import InferencePolicy
+
+
+# Environment of an evaluation worker process, created once by the pool initializer
+_environment = None
+
+
+def _init_worker(environment_fn):
+    global _environment
+    _environment = environment_fn()
+
+
+def _evaluate_episodes(spec, weights, preprocessing, episodes, max_timesteps):
+    """
+    Runs deterministic evaluation episodes in a worker process.
+
+    Returns: Lists of episode rewards and episode lengths
+
+    """
+    policy = InferencePolicy(spec=spec, weights=weights)
+    episode_rewards = list()
+    episode_lengths = list()
+
+    for _ in range(episodes):
+        state = _environment.reset()
+        policy.reset()
+        for stack in preprocessing.values():
+            stack.reset()
+        episode_reward = 0
+        timestep = 0
+
+        while True:
+            if policy.unique_state:
+                if 'state' in preprocessing:
+                    state = preprocessing['state'].process(state=state)
+            else:
+                state = dict(state)
+                for name, stack in preprocessing.items():
+                    state[name] = stack.process(state=state[name])
+
+            action = policy.act(state=state)
+            state, reward, terminal = _environment.execute(action=action)
+            episode_reward += reward
+            timestep += 1
+            if terminal or timestep == max_timesteps:
+                break
+
+        episode_rewards.append(episode_reward)
+        episode_lengths.append(timestep)
+
+    return episode_rewards, episode_lengths
+
+
+class EvaluationRunner(object):
+
+    def __init__(self, agent, environment_fn, num_workers=4):
+        """
+        Initialize an evaluation runner. Each worker process creates its own environment and
+        runs episodes with a TensorFlow-free `InferencePolicy`, so evaluation neither rebuilds
+        the model graph nor stalls training, which only pays for a single session call to
+        snapshot the weights. The agent's model has to support `export_inference`.
+
+        Example:
+
+            ```python
+            evaluation = EvaluationRunner(agent=agent, environment_fn=partial(MinimalTest, definition=False))
+
+            def episode_finished(r):
+                if r.episode % 100 == 0:
+                    evaluation.evaluate(episodes=50).add_done_callback(
+                        lambda future: print(future.result()['mean_reward']))
+                return True
+            ```
+
+        Args:
+            agent: `Agent` object to evaluate
+            environment_fn: Picklable function returning a new `Environment` object, called once
+                in each worker
+            num_workers: Number of worker processes
+        """
+        if num_workers < 1:
+            raise TensorForceError("Invalid number of evaluation workers {}.".format(num_workers))
+        self.agent = agent
+        self.num_workers = num_workers
+        self.pool = multiprocessing.Pool(processes=num_workers, initializer=_init_worker, initargs=(environment_fn,))
+
+    def evaluate(self, episodes, max_timesteps=-1):
+        """
+        Snapshots the current policy and evaluates it deterministically for the given number of
+        episodes, distributed over all workers.
+
+        Args:
+            episodes: Number of evaluation episodes
+            max_timesteps: Max timesteps in a given episode
+
+        Returns: Future resolving to a dict of evaluation statistics, containing the
+            `episode_rewards` and `episode_lengths` and their summary statistics, as well as the
+            model `timestep` of the snapshot.
+
+        """
+        if self.pool is None:
+            raise TensorForceError("Evaluation runner is closed.")
+
+        spec, weights = self.agent.inference_snapshot()
+        timestep = self.agent.model.timestep
+        # Preprocessing state is reset per episode, only the configuration matters
+        preprocessing = copy.deepcopy(self.agent.preprocessing)
+
+        tasks = list()
+        for n in range(self.num_workers):
+            worker_episodes = episodes // self.num_workers + int(n < episodes % self.num_workers)
+            if worker_episodes > 0:
+                tasks.append(self.pool.apply_async(
+                    func=_evaluate_episodes,
+                    args=(spec, weights, preprocessing, worker_episodes, max_timesteps)
+                ))
+
+        future = Future()
+        thread = threading.Thread(target=self._collect, args=(tasks, timestep, future))
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def close(self):
+        """
+        Stops all workers, pending evaluations are discarded.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    @staticmethod
+    def _collect(tasks, timestep, future):
+        episode_rewards = list()
+        episode_lengths = list()
+        try:
+            for task in tasks:
+                rewards, lengths = task.get()
+                episode_rewards.extend(rewards)
+                episode_lengths.extend(lengths)
+        except Exception as error:
+            future.set_exception(error)
+            return
+
+        future.set_result(dict(
+            timestep=timestep,
+            episodes=len(episode_rewards),
+            episode_rewards=episode_rewards,
+            episode_lengths=episode_lengths,
+            mean_reward=float(np.mean(episode_rewards)),
+            std_reward=float(np.std(episode_rewards)),
+            min_reward=float(np.min(episode_rewards)),
+            max_reward=float(np.max(episode_rewards)),
+            mean_length=float(np.mean(episode_lengths))
+        ))
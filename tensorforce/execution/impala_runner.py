@@ -0,0 +1,302 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+IMPALA style actor-learner training on a single host (Espeholt et al., 2018). Actor processes
+sample actions from a TensorFlow-free `InferencePolicy` with slightly stale weights and send
+fixed-length trajectories with behaviour log probabilities, while the learner updates a V-trace
+agent on batches of trajectories and periodically publishes its weights in shared memory. This
+decouples environment throughput from learner throughput.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import copy
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from tensorforce import util, TensorForceError
+from tensorforce.inference import InferencePolicy
+from tensorforce.models import VTraceModel
+
+
+def _run_actor(actor_id, environment_fn, connection, spec, weights_layout, shared_weights, weights_version,
+               stop, preprocessing, reward_preprocessing, actions_spec, trajectory_length, max_timesteps, seed):
+    """
+    Actor process. Loads the latest published weights before each trajectory and sends
+    trajectories of `trajectory_length + 1` timesteps, the last of which is the bootstrap state
+    and the first state of the next trajectory.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    environment = environment_fn()
+    policy = None
+    version = -1
+
+    def preprocess(state):
+        if policy.unique_state:
+            state = dict(state=state)
+        else:
+            state = dict(state)
+        for name, stack in preprocessing.items():
+            state[name] = stack.process(state=state[name])
+        return state
+
+    def reset():
+        for stack in preprocessing.values():
+            stack.reset()
+        return preprocess(state=environment.reset())
+
+    padding_action = {name: np.zeros(shape, dtype=dtype) for name, (shape, dtype) in actions_spec.items()}
+    state = None
+    episode_reward = 0
+    timestep = 0
+    episodes = list()
+    try:
+        while not stop.value:
+            if weights_version.value != version:
+                with shared_weights.get_lock():
+                    version = weights_version.value
+                    flat_weights = np.frombuffer(shared_weights.get_obj(), dtype=np.float32).copy()
+                weights = dict()
+                for name, offset, shape in weights_layout:
+                    weights[name] = flat_weights[offset:offset + util.prod(shape)].reshape(shape)
+                policy = InferencePolicy(spec=spec, weights=weights)
+
+            trajectory = list()
+            while len(trajectory) < trajectory_length:
+                if state is None:
+                    state = reset()
+                    episode_reward = 0
+                    timestep = 0
+
+                actions, log_probability, _ = policy.sample(states={name: np.expand_dims(value, axis=0) for name, value in state.items()})
+                action = {name: value[0] for name, value in actions.items()}
+                next_state, reward, terminal = environment.execute(action=(action['action'] if policy.unique_action else action))
+                if reward_preprocessing is not None:
+                    reward = reward_preprocessing.process(reward)
+                episode_reward += reward
+                timestep += 1
+
+                # Episodes cut off at max timesteps are not bootstrapped
+                terminal = terminal or timestep == max_timesteps
+                trajectory.append((state, action, reward, terminal, log_probability[0]))
+                if terminal:
+                    episodes.append((actor_id, episode_reward, timestep))
+                    state = None
+                else:
+                    state = preprocess(state=next_state)
+
+            if state is None:
+                state = reset()
+                episode_reward = 0
+                timestep = 0
+            trajectory.append((state, padding_action, 0.0, False, 0.0))
+
+            batch = dict(
+                states={name: np.stack([step[0][name] for step in trajectory]) for name in state},
+                actions={name: np.stack([step[1][name] for step in trajectory]) for name in actions_spec},
+                rewards=np.array([step[2] for step in trajectory], dtype=util.np_dtype('float')),
+                terminals=np.array([step[3] for step in trajectory], dtype=util.np_dtype('bool')),
+                behaviour_log_probs=np.array([step[4] for step in trajectory], dtype=util.np_dtype('float'))
+            )
+            connection.send((batch, episodes))
+            episodes = list()
+
+    except (IOError, EOFError):
+        # Learner is gone
+        pass
+    finally:
+        environment.close()
+
+
+class ImpalaRunner(object):
+
+    def __init__(self, agent, environment_fn, num_actors=4, batch_size=None, weights_interval=1, seed=0):
+        """
+        Initialize an IMPALA runner. The agent acts as learner, it has to be a `VTraceAgent` with
+        a network supporting `export_inference` without internal states, and categorical or
+        Gaussian actions.
+
+        Args:
+            agent: Learner agent
+            environment_fn: Function returning a new `Environment` object, called once per actor
+            num_actors: Number of actor processes
+            batch_size: Number of trajectories per learner update, defaults to the number of
+                trajectories in an agent batch
+            weights_interval: Number of learner updates between weight publications
+            seed: Base random seed of the actors
+        """
+        if not isinstance(agent.model, VTraceModel):
+            raise TensorForceError("IMPALA runner requires a V-trace agent.")
+        if agent.model.internal_inputs:
+            raise TensorForceError("IMPALA runner does not support models with internal states.")
+        self.agent = agent
+        self.environment_fn = environment_fn
+        self.num_actors = num_actors
+        self.trajectory_length = agent.model.trajectory_length
+        if batch_size is None:
+            self.batch_size = agent.batch_size // (self.trajectory_length + 1)
+        else:
+            self.batch_size = batch_size
+        self.weights_interval = weights_interval
+        self.seed = seed
+
+        self.spec, weights = agent.inference_snapshot()
+        for name, action in self.spec['actions'].items():
+            if action['type'] not in ('categorical', 'gaussian'):
+                raise TensorForceError("IMPALA runner does not support {} actions.".format(action['type']))
+        self.weights_layout = list()
+        offset = 0
+        for name in sorted(weights):
+            self.weights_layout.append((name, offset, weights[name].shape))
+            offset += weights[name].size
+        self.shared_weights = multiprocessing.Array('f', offset)
+        self.weights_version = multiprocessing.Value('i', 0)
+        self.publish_weights(weights=weights)
+
+    def publish_weights(self, weights=None):
+        """
+        Writes the current learner weights to shared memory, from where actors load them before
+        their next trajectory.
+
+        Args:
+            weights: Optional weights snapshot, fetched from the model if None
+        """
+        if weights is None:
+            _, weights = self.agent.inference_snapshot()
+        flat_weights = np.concatenate([np.reshape(weights[name], (-1,)) for name, _, _ in self.weights_layout])
+        with self.shared_weights.get_lock():
+            np.frombuffer(self.shared_weights.get_obj(), dtype=np.float32)[:] = flat_weights
+            self.weights_version.value += 1
+
+    def run(self, updates=-1, episodes=-1, max_timesteps=-1, episode_finished=None):
+        """
+        Starts the actor processes and runs the learner until the given number of updates or
+        actor episodes is completed. Episodes are recorded in the order in which the learner
+        receives them.
+
+        Args:
+            updates: Number of learner updates
+            episodes: Number of actor episodes
+            max_timesteps: Max timesteps in a given episode
+            episode_finished: Optional termination condition, e.g. a particular mean reward threshold
+
+        Returns:
+
+        """
+        # save episode reward and length for statistics
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.episode_actors = []
+
+        self.total_timesteps = 0
+        self.episode = 0
+        self.updates = 0
+        self.start_time = time.time()
+
+        stop = multiprocessing.Value('b', False)
+        connections = list()
+        actors = list()
+        for n in range(self.num_actors):
+            connection, actor_connection = multiprocessing.Pipe(duplex=False)
+            actor = multiprocessing.Process(target=_run_actor, kwargs=dict(
+                actor_id=n,
+                environment_fn=self.environment_fn,
+                connection=actor_connection,
+                spec=self.spec,
+                weights_layout=self.weights_layout,
+                shared_weights=self.shared_weights,
+                weights_version=self.weights_version,
+                stop=stop,
+                preprocessing=copy.deepcopy(self.agent.preprocessing),
+                reward_preprocessing=copy.deepcopy(self.agent.reward_preprocessing),
+                actions_spec={
+                    name: (tuple(action.shape), util.np_dtype('float' if action.continuous else 'int'))
+                    for name, action in self.agent.actions_config
+                },
+                trajectory_length=self.trajectory_length,
+                max_timesteps=max_timesteps,
+                seed=(self.seed + n)
+            ))
+            actor.daemon = True
+            actor.start()
+            # Only the actor holds the sending end, so its exit is noticed as end of file
+            actor_connection.close()
+            connections.append(connection)
+            actors.append(actor)
+
+        trajectories = list()
+        try:
+            should_stop = False
+            while not should_stop and connections:
+                for connection in util.wait_connections(connections=connections):
+                    try:
+                        trajectory, actor_episodes = connection.recv()
+                    except EOFError:
+                        connections.remove(connection)
+                        continue
+                    trajectories.append(trajectory)
+                    self.total_timesteps += self.trajectory_length
+
+                    for actor_id, episode_reward, timestep in actor_episodes:
+                        self.episode_rewards.append(episode_reward)
+                        self.episode_lengths.append(timestep)
+                        self.episode_actors.append(actor_id)
+                        self.episode += 1
+                        if (episode_finished and not episode_finished(self)) or self.episode == episodes:
+                            should_stop = True
+                            break
+
+                while not should_stop and len(trajectories) >= self.batch_size:
+                    batch = trajectories[:self.batch_size]
+                    trajectories = trajectories[self.batch_size:]
+                    batch = dict(
+                        states={name: np.concatenate([t['states'][name] for t in batch]) for name in batch[0]['states']},
+                        actions={name: np.concatenate([t['actions'][name] for t in batch]) for name in batch[0]['actions']},
+                        rewards=np.concatenate([t['rewards'] for t in batch]),
+                        terminals=np.concatenate([t['terminals'] for t in batch]),
+                        behaviour_log_probs=np.concatenate([t['behaviour_log_probs'] for t in batch]),
+                        internals=[]
+                    )
+
+                    self.agent.model.timestep = self.total_timesteps
+                    self.agent.model.update(batch=batch)
+                    self.updates += 1
+
+                    if self.updates % self.weights_interval == 0:
+                        self.publish_weights()
+                    if self.updates == updates:
+                        should_stop = True
+
+        finally:
+            stop.value = True
+            # Receive outstanding trajectories, so actors do not block on sending them
+            deadline = time.time() + 5.0
+            while connections and time.time() < deadline:
+                for connection in util.wait_connections(connections=connections, timeout=0.1):
+                    try:
+                        connection.recv()
+                    except EOFError:
+                        connections.remove(connection)
+            for actor in actors:
+                actor.join(timeout=1.0)
+                if actor.is_alive():
+                    actor.terminate()
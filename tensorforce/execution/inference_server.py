@@ -0,0 +1,170 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Batched inference for agents sharing a model across threads. Workers submit states to a queue
+and receive actions via futures, while a dispatcher thread coalesces pending requests into a
+single batched session call.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import threading
+import time
+
+from concurrent.futures import Future
+from six.moves import queue
+
+from tensorforce import TensorForceError
+
+
+class InferenceServer(object):
+
+    def __init__(self, model, max_batch_size=32, max_wait=0.001):
+        """
+        Creates an inference server with its own dispatcher thread.
+
+        Args:
+            model: Model shared by all agents submitting requests
+            max_batch_size: Maximum number of requests per batched session call
+            max_wait: Maximum seconds the dispatcher waits for further requests after the first
+                pending one, before running a batch
+        """
+        if max_batch_size < 1:
+            raise TensorForceError("Invalid max_batch_size {}.".format(max_batch_size))
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.batches = 0
+        self.requests = 0
+        self.closed = False
+
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._dispatch)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, state, internal, deterministic=False):
+        """
+        Schedules computing an action for a preprocessed state.
+
+        Args:
+            state: Preprocessed state dict
+            internal: Internal state list
+            deterministic: Whether to select a deterministic action
+
+        Returns: Future resolving to the action dict and the next internal state list
+
+        """
+        if self.closed:
+            raise TensorForceError("Inference server is closed.")
+        future = Future()
+        self.queue.put((state, internal, deterministic, future))
+        return future
+
+    def get_action(self, state, internal, deterministic=False):
+        """
+        Blocking equivalent of `Model.get_action`, batched with concurrent requests.
+
+        Args:
+            state: Preprocessed state dict
+            internal: Internal state list
+            deterministic: Whether to select a deterministic action
+
+        Returns: Action dict and next internal state list
+
+        """
+        return self.submit(state=state, internal=internal, deterministic=deterministic).result()
+
+    def act(self, agent, state, deterministic=False):
+        """
+        Equivalent of `agent.act(state)` with the model call going through the server.
+        Preprocessing, internal states and exploration remain with the agent.
+
+        Args:
+            agent: Agent using the server's model
+            state: One state (usually a value tuple) or dict of states if multiple states are expected.
+            deterministic: If true, no exploration and sampling is applied.
+
+        Returns:
+            Scalar value of the action or dict of multiple actions the agent wants to execute.
+
+        """
+        agent.preprocess_state(state=state)
+        agent.current_action, agent.next_internal = self.get_action(
+            state=agent.current_state,
+            internal=agent.current_internal,
+            deterministic=deterministic
+        )
+        return agent.explore_action(deterministic=deterministic)
+
+    def close(self):
+        """
+        Serves all pending requests and stops the dispatcher thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def _dispatch(self):
+        while True:
+            request = self.queue.get()
+            if request is None:
+                return
+
+            requests = [request]
+            stop = False
+            deadline = time.time() + self.max_wait
+            while len(requests) < self.max_batch_size:
+                try:
+                    request = self.queue.get(timeout=max(deadline - time.time(), 0.0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+
+            self._run_batch(requests=requests)
+            if stop:
+                return
+
+    def _run_batch(self, requests):
+        # Deterministic and stochastic requests need separate session calls
+        for deterministic in (False, True):
+            batch = [request for request in requests if request[2] == deterministic]
+            if not batch:
+                continue
+
+            try:
+                actions, internals = self.model.get_actions(
+                    states=[request[0] for request in batch],
+                    internals=[request[1] for request in batch],
+                    deterministic=deterministic
+                )
+            except Exception as error:
+                for request in batch:
+                    request[3].set_exception(error)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for request, action, internal in zip(batch, actions, internals):
+                request[3].set_result((action, internal))
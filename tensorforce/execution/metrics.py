@@ -0,0 +1,419 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Metrics registry for runner telemetry. Counters, gauges and fixed-bucket histograms are updated in
+constant time, and a background thread periodically exports snapshots of all metrics, e.g. as a
+Prometheus text file, JSON lines or TensorBoard scalars.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import logging
+import os
+import threading
+import time
+
+from tensorforce import TensorForceError
+from tensorforce.models.summary_writer import SummaryWriter
+
+
+class Counter(object):
+
+    type = 'counter'
+
+    def __init__(self, name, description=''):
+        """
+        Creates a monotonically increasing counter.
+
+        Args:
+            name: Metric name
+            description: Metric description
+        """
+        self.name = name
+        self.description = description
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, value=1):
+        with self.lock:
+            self.value += value
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge(object):
+
+    type = 'gauge'
+
+    def __init__(self, name, description=''):
+        """
+        Creates a gauge, a value which can arbitrarily go up and down.
+
+        Args:
+            name: Metric name
+            description: Metric description
+        """
+        self.name = name
+        self.description = description
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, value=1):
+        with self.lock:
+            self.value += value
+
+    def dec(self, value=1):
+        with self.lock:
+            self.value -= value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram(object):
+
+    type = 'histogram'
+
+    # Upper bounds in seconds, suitable for step and update timings
+    default_buckets = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self, name, buckets=None, description=''):
+        """
+        Creates a histogram with fixed buckets.
+
+        Args:
+            name: Metric name
+            buckets: Increasing bucket upper bounds, an additional bucket collects larger values
+            description: Metric description
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(Histogram.default_buckets if buckets is None else buckets)
+        if any(lower >= upper for lower, upper in zip(self.buckets, self.buckets[1:])):
+            raise TensorForceError("Histogram buckets must be increasing.")
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        # Bucket search is logarithmic in the fixed number of buckets
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        """
+        Context manager observing the seconds spent in its block.
+        """
+        start = time.time()
+        yield
+        self.observe(time.time() - start)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(buckets=self.buckets, counts=list(self.counts), sum=self.sum, count=self.count)
+
+
+class MetricsRegistry(object):
+
+    def __init__(self, exporters=None, interval=10.0):
+        """
+        Creates a metrics registry. If exporters are given, a background thread exports all
+        metrics every `interval` seconds.
+
+        Args:
+            exporters: Optional list of `MetricsExporter` objects
+            interval: Seconds between exports
+        """
+        self.metrics = OrderedDict()
+        self.exporters = list() if exporters is None else list(exporters)
+        self.interval = interval
+
+        self.logger = logging.getLogger(__name__)
+
+        self.lock = threading.Lock()
+        self.export_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        if self.exporters:
+            self.thread = threading.Thread(target=self._export_periodically)
+            self.thread.daemon = True
+            self.thread.start()
+        else:
+            self.thread = None
+
+    def counter(self, name, description=''):
+        return self._get_or_create(cls=Counter, name=name, description=description)
+
+    def gauge(self, name, description=''):
+        return self._get_or_create(cls=Gauge, name=name, description=description)
+
+    def histogram(self, name, buckets=None, description=''):
+        return self._get_or_create(cls=Histogram, name=name, buckets=buckets, description=description)
+
+    def snapshot(self):
+        """
+        Returns: Ordered dict mapping metric names to dicts of type, description and value
+
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return OrderedDict(
+            (metric.name, dict(type=metric.type, description=metric.description, value=metric.snapshot()))
+            for metric in metrics
+        )
+
+    def export(self):
+        """
+        Exports a snapshot of all metrics to all exporters.
+        """
+        with self.export_lock:
+            snapshot = self.snapshot()
+            timestamp = time.time()
+            for exporter in self.exporters:
+                try:
+                    exporter.export(snapshot=snapshot, timestamp=timestamp)
+                except Exception as error:
+                    self.logger.warning('Metrics export failed: {}'.format(error))
+
+    def close(self):
+        """
+        Stops the export thread, exports a final snapshot and closes all exporters.
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.export()
+        for exporter in self.exporters:
+            exporter.close()
+
+    def _get_or_create(self, cls, name, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name=name, **kwargs)
+            elif not isinstance(metric, cls):
+                raise TensorForceError("Metric {} is already registered as a {}.".format(name, metric.type))
+            return metric
+
+    def _export_periodically(self):
+        while not self.stop_event.wait(self.interval):
+            self.export()
+
+
+class MetricsExporter(object):
+    """
+    Base class for metrics exporters.
+    """
+
+    def export(self, snapshot, timestamp):
+        """
+        Exports a snapshot of all metrics.
+
+        Args:
+            snapshot: Snapshot as returned by `MetricsRegistry.snapshot`
+            timestamp: Time of the snapshot in seconds since the epoch
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PrometheusExporter(MetricsExporter):
+
+    def __init__(self, path):
+        """
+        Writes metrics in the Prometheus text format, e.g. for the node exporter textfile
+        collector. The file is replaced atomically on each export.
+
+        Args:
+            path: Output file path
+        """
+        self.path = path
+
+    def export(self, snapshot, timestamp):
+        lines = list()
+        for name, metric in snapshot.items():
+            if metric['description']:
+                lines.append('# HELP {} {}'.format(name, metric['description']))
+            lines.append('# TYPE {} {}'.format(name, metric['type']))
+            if metric['type'] == 'histogram':
+                value = metric['value']
+                cumulative = 0
+                for bound, count in zip(value['buckets'], value['counts']):
+                    cumulative += count
+                    lines.append('{}_bucket{{le="{}"}} {}'.format(name, repr(float(bound)), cumulative))
+                lines.append('{}_bucket{{le="+Inf"}} {}'.format(name, value['count']))
+                lines.append('{}_sum {}'.format(name, repr(float(value['sum']))))
+                lines.append('{}_count {}'.format(name, value['count']))
+            else:
+                lines.append('{} {}'.format(name, repr(float(metric['value']))))
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as output:
+            output.write('\n'.join(lines) + '\n')
+        # os.replace is atomic on all platforms, but requires Python 3
+        getattr(os, 'replace', os.rename)(tmp_path, self.path)
+
+
+class JsonLinesExporter(MetricsExporter):
+
+    def __init__(self, path):
+        """
+        Appends one JSON object per export, mapping metric names to values. Histograms are
+        given as dicts of buckets, counts, sum and count.
+
+        Args:
+            path: Output file path
+        """
+        self.output = open(path, 'a')
+
+    def export(self, snapshot, timestamp):
+        record = dict(timestamp=timestamp, metrics={name: metric['value'] for name, metric in snapshot.items()})
+        self.output.write(json.dumps(record) + '\n')
+        self.output.flush()
+
+    def close(self):
+        self.output.close()
+
+
+class TensorBoardExporter(MetricsExporter):
+
+    def __init__(self, logdir=None, summary_writer=None, step_metric='runner_timesteps_total'):
+        """
+        Writes metrics as TensorBoard scalars, histograms as their count and mean.
+
+        Args:
+            logdir: Summary directory, if no summary writer is given
+            summary_writer: Optional existing `SummaryWriter`, e.g. of a model
+            step_metric: Metric used as summary step, the number of exports if not registered
+        """
+        if summary_writer is None:
+            if logdir is None:
+                raise TensorForceError("TensorBoard exporter requires a logdir or a summary writer.")
+            self.summary_writer = SummaryWriter(logdir=logdir)
+            self.owns_writer = True
+        else:
+            self.summary_writer = summary_writer
+            self.owns_writer = False
+        self.step_metric = step_metric
+        self.exports = 0
+
+    def export(self, snapshot, timestamp):
+        self.exports += 1
+        if self.step_metric in snapshot:
+            step = snapshot[self.step_metric]['value']
+        else:
+            step = self.exports
+
+        for name, metric in snapshot.items():
+            value = metric['value']
+            if metric['type'] == 'histogram':
+                self.summary_writer.add_scalar(tag=(name + '/count'), value=value['count'], step=step)
+                if value['count'] > 0:
+                    self.summary_writer.add_scalar(tag=(name + '/mean'), value=(value['sum'] / value['count']), step=step)
+            else:
+                self.summary_writer.add_scalar(tag=name, value=value, step=step)
+
+    def close(self):
+        if self.owns_writer:
+            self.summary_writer.close()
+
+
+class RunnerMetrics(object):
+
+    def __init__(self, registry, rate_interval=1.0):
+        """
+        Standard runner metrics: timesteps, episodes and model updates with their rates, time
+        spent in the agent versus the environment, replay memory fill and inference queue depth.
+
+        Args:
+            registry: `MetricsRegistry` to publish to
+            rate_interval: Minimum seconds between updates of the rate gauges
+        """
+        self.timesteps = registry.counter('runner_timesteps_total', 'Environment timesteps')
+        self.episodes = registry.counter('runner_episodes_total', 'Finished episodes')
+        self.updates = registry.counter('model_updates_total', 'Model optimization steps')
+        self.timesteps_per_second = registry.gauge('runner_timesteps_per_second', 'Environment timesteps per second')
+        self.updates_per_second = registry.gauge('model_updates_per_second', 'Model optimization steps per second')
+        self.act_seconds = registry.histogram('agent_act_seconds', description='Seconds per action selection')
+        self.environment_seconds = registry.histogram('environment_step_seconds', description='Seconds per environment step')
+        self.observe_seconds = registry.histogram('agent_observe_seconds', description='Seconds per observation, including updates')
+        self.replay_fill = registry.gauge('replay_memory_fill', 'Fraction of the replay memory capacity in use')
+        self.queue_depth = registry.gauge('inference_queue_depth', 'Pending inference server requests')
+
+        self.rate_interval = rate_interval
+        self.lock = threading.Lock()
+        self.model_updates = dict()
+        self.last_rate_time = time.time()
+        self.last_timesteps = 0
+        self.last_updates = 0
+
+    def observe_step(self, agent, act_time, environment_time, observe_time, timesteps=1, queue_depth=None):
+        """
+        Publishes the metrics of one or more environment steps.
+
+        Args:
+            agent: Agent which acted and observed
+            act_time: Seconds spent selecting the action
+            environment_time: Seconds spent executing the action
+            observe_time: Seconds spent observing, including model updates
+            timesteps: Number of environment steps
+            queue_depth: Optional number of pending inference requests
+        """
+        self.timesteps.inc(timesteps)
+        self.act_seconds.observe(act_time)
+        self.environment_seconds.observe(environment_time)
+        self.observe_seconds.observe(observe_time)
+
+        model = agent.model
+        memory = getattr(agent, 'memory', None)
+        if memory is not None:
+            self.replay_fill.set(len(memory) / memory.capacity)
+        if queue_depth is not None:
+            self.queue_depth.set(queue_depth)
+
+        with self.lock:
+            # Agents may share a model, so updates are counted per model
+            updates = model.updates - self.model_updates.get(id(model), 0)
+            self.model_updates[id(model)] = model.updates
+            self.updates.inc(updates)
+
+            now = time.time()
+            if now - self.last_rate_time >= self.rate_interval:
+                self.timesteps_per_second.set((self.timesteps.value - self.last_timesteps) / (now - self.last_rate_time))
+                self.updates_per_second.set((self.updates.value - self.last_updates) / (now - self.last_rate_time))
+                self.last_rate_time = now
+                self.last_timesteps = self.timesteps.value
+                self.last_updates = self.updates.value
+
+    def observe_episode(self):
+        self.episodes.inc()
@@ -22,12 +22,18 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import os
+import random
 import time
 
+import numpy as np
 from six.moves import xrange
 import tensorflow as tf
 
 from tensorforce import TensorForceError
+from tensorforce.execution.checkpoint_manager import CheckpointManager
+from tensorforce.execution.metrics import RunnerMetrics
+from tensorforce.execution.training_state import save_training_state, load_training_state
 
 
 class Runner(object):
@@ -35,7 +41,8 @@ class Runner(object):
     # These agents can be used in an A3C fashion
     async_supported = ('VPGAgent', 'PPOAgent')  # And potentially TRPOAgent, needs to be checked...
 
-    def __init__(self, agent, environment, repeat_actions=1, cluster_spec=None, task_index=None, save_path=None, save_episodes=None):
+    def __init__(self, agent, environment, repeat_actions=1, cluster_spec=None, task_index=None, save_path=None, save_episodes=None,
+                 save_async=False, keep_last=5, metrics=None):
         """
         Initialize a Runner object.
 
@@ -47,6 +54,9 @@ class Runner(object):
             task_index:
             save_path:
             save_episodes:
+            save_async: Whether to write checkpoints in the background via a `CheckpointManager`
+            keep_last: Number of checkpoints retained by the checkpoint manager
+            metrics: Optional `MetricsRegistry` to publish runner telemetry to
         """
         if cluster_spec is not None and str(agent) not in Runner.async_supported:
             raise TensorForceError('Agent type not supported for distributed runner.')
@@ -57,6 +67,11 @@ class Runner(object):
         self.task_index = task_index
         self.save_path = save_path
         self.save_episodes = save_episodes
+        self.save_async = save_async
+        self.keep_last = keep_last
+        self.checkpoint_manager = None
+        self.metrics = None if metrics is None else RunnerMetrics(registry=metrics)
+        self.resumed = False
 
     def run(self, episodes=-1, max_timesteps=-1, episode_finished=None):
         """
@@ -118,61 +133,145 @@ class Runner(object):
             self.agent.model.set_session(session)
             # session.run(self.agent.model.update_local)
 
-        # save episode reward and length for statistics
-        self.episode_rewards = []
-        self.episode_lengths = []
-        self.episode_times = []
+        if self.save_path and self.save_async:
+            directory, prefix = os.path.split(self.save_path)
+            self.checkpoint_manager = CheckpointManager(
+                model=self.agent.model,
+                directory=(directory or '.'),
+                prefix=prefix,
+                keep_last=self.keep_last
+            )
 
-        self.total_timesteps = 0
-        self.episode = 1
-        self.start_time = time.time()
-        while True:
-            state = self.environment.reset()
-            self.agent.reset()
-            episode_reward = 0
+        if self.resumed:
+            # Continue after the last episode of the resumed checkpoint
+            self.resumed = False
+            self.episode += 1
+        else:
+            # save episode reward and length for statistics
+            self.episode_rewards = []
+            self.episode_lengths = []
+            self.episode_times = []
 
-            self.timestep = 0
-            episode_start_time = time.time()
+            self.total_timesteps = 0
+            self.episode = 1
+        self.start_time = time.time()
+        try:
             while True:
-                action = self.agent.act(state=state)
-                if self.repeat_actions > 1:
-                    reward = 0
-                    for repeat in xrange(self.repeat_actions):
-                        state, step_reward, terminal = self.environment.execute(action=action)
-                        reward += step_reward
-                        if terminal:
-                            break
-                else:
-                    state, reward, terminal = self.environment.execute(action=action)
-
-                self.agent.observe(reward=reward, terminal=terminal)
-
-                self.timestep += 1
-                self.total_timesteps += 1
-                episode_reward += reward
-
-                if terminal or self.timestep == max_timesteps:
-                    break
+                state = self.environment.reset()
+                self.agent.reset()
+                episode_reward = 0
 
-            self.agent.observe_episode_reward(episode_reward)
-            time_passed = time.time() - episode_start_time
-            self.episode_rewards.append(episode_reward)
-            self.episode_lengths.append(self.timestep)
-            self.episode_times.append(time_passed)
+                self.timestep = 0
+                episode_start_time = time.time()
+                while True:
+                    act_start = time.time()
+                    action = self.agent.act(state=state)
+                    environment_start = time.time()
+                    if self.repeat_actions > 1:
+                        reward = 0
+                        for repeat in xrange(self.repeat_actions):
+                            state, step_reward, terminal = self.environment.execute(action=action)
+                            reward += step_reward
+                            if terminal:
+                                break
+                    else:
+                        state, reward, terminal = self.environment.execute(action=action)
 
-            if self.save_path and self.save_episodes is not None and self.episode % self.save_episodes == 0:
-                print("Saving agent after episode {}".format(self.episode))
-                self.agent.save_model(self.save_path)
+                    observe_start = time.time()
+                    self.agent.observe(reward=reward, terminal=terminal)
+                    if self.metrics is not None:
+                        self.metrics.observe_step(
+                            agent=self.agent,
+                            act_time=(environment_start - act_start),
+                            environment_time=(observe_start - environment_start),
+                            observe_time=(time.time() - observe_start)
+                        )
 
-            if episode_finished and not episode_finished(self):
-                return
-            if self.cluster_spec is None:
-                if self.episode >= episodes:
-                    return
-            elif session.run(self.agent.model.global_episode) >= episodes:
-                return
-            self.episode += 1
+                    self.timestep += 1
+                    self.total_timesteps += 1
+                    episode_reward += reward
 
+                    if terminal or self.timestep == max_timesteps:
+                        break
+
+                self.agent.observe_episode_reward(episode_reward)
+                time_passed = time.time() - episode_start_time
+                self.episode_rewards.append(episode_reward)
+                self.episode_lengths.append(self.timestep)
+                self.episode_times.append(time_passed)
+                if self.metrics is not None:
+                    self.metrics.observe_episode()
+
+                if self.save_path and self.save_episodes is not None and self.episode % self.save_episodes == 0:
+                    print("Saving agent after episode {}".format(self.episode))
+                    if self.checkpoint_manager is None:
+                        self.agent.save_model(self.save_path)
+                    else:
+                        self.checkpoint_manager.save()
+
+                if episode_finished and not episode_finished(self):
+                    break
+                if self.cluster_spec is None:
+                    if self.episode >= episodes:
+                        break
+                elif session.run(self.agent.model.global_episode) >= episodes:
+                    break
+                self.episode += 1
+
+        finally:
+            if self.checkpoint_manager is not None:
+                self.checkpoint_manager.close()
+                self.checkpoint_manager = None
+
+        # Every regular exit of the episode loop ends here, so distributed workers also close
+        # their managed session and stop the supervisor
         if self.cluster_spec is not None:
             managed_session.__exit__(None, None, None)
             supervisor.stop()
+
+    def checkpoint(self, directory):
+        """
+        Saves the complete training state after the current episode, i.e. the runner statistics,
+        the agent state including exploration, preprocessing, replay memory and model variables,
+        and the random number generator states. Can be called from `episode_finished` or after
+        `run`. Large arrays are stored as separate binary files, small values in a manifest.
+
+        Args:
+            directory: Checkpoint directory, replaced atomically if it exists
+
+        Returns:
+
+        """
+        save_training_state(directory=directory, state=dict(
+            runner=dict(
+                episode=self.episode,
+                total_timesteps=self.total_timesteps,
+                episode_rewards=self.episode_rewards,
+                episode_lengths=self.episode_lengths,
+                episode_times=self.episode_times
+            ),
+            agent=self.agent.get_state(),
+            random=dict(python=random.getstate(), numpy=np.random.get_state())
+        ))
+
+    def resume(self, directory):
+        """
+        Restores a training state saved by `checkpoint`, the next call of `run` continues with the
+        following episode. The agent has to be created with the same configuration.
+
+        Args:
+            directory: Checkpoint directory
+
+        Returns:
+
+        """
+        state = load_training_state(directory=directory)
+        self.agent.set_state(state=state['agent'])
+        self.episode = state['runner']['episode']
+        self.total_timesteps = state['runner']['total_timesteps']
+        self.episode_rewards = list(state['runner']['episode_rewards'])
+        self.episode_lengths = list(state['runner']['episode_lengths'])
+        self.episode_times = list(state['runner']['episode_times'])
+        random.setstate(state['random']['python'])
+        np.random.set_state(state['random']['numpy'])
+        self.resumed = True
@@ -21,15 +21,19 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import os
 import time
 import threading
 from six.moves import xrange
 
 from tensorforce import TensorForceError
+from tensorforce.execution.checkpoint_manager import CheckpointManager
+from tensorforce.execution.metrics import RunnerMetrics
 
 
 class ThreadedRunner(object):
-    def __init__(self, agents, environments, repeat_actions=1, save_path=None, save_episodes=None):
+    def __init__(self, agents, environments, repeat_actions=1, save_path=None, save_episodes=None,
+                 save_async=False, keep_last=5, inference_server=None, metrics=None):
         """
         Initialize a Runner object.
 
@@ -39,6 +43,12 @@ class ThreadedRunner(object):
             repeat_actions:
             save_path:
             save_episodes:
+            save_async: Whether to write checkpoints in the background via a `CheckpointManager`,
+                which snapshots variables in a single session call instead of racing with updates
+            keep_last: Number of checkpoints retained by the checkpoint manager
+            inference_server: Optional `InferenceServer` on the shared model, which batches the
+                action requests of all threads into single session calls
+            metrics: Optional `MetricsRegistry` to publish runner telemetry to
         """
         if len(agents) != len(environments):
             raise TensorForceError("Each agent must have its own environment. Got {a} agents and {e} environments.".
@@ -48,6 +58,11 @@ class ThreadedRunner(object):
         self.repeat_actions = repeat_actions
         self.save_path = save_path
         self.save_episodes = save_episodes
+        self.inference_server = inference_server
+        self.metrics = None if metrics is None else RunnerMetrics(registry=metrics)
+        self.save_async = save_async
+        self.keep_last = keep_last
+        self.checkpoint_manager = None
 
     def _run_single(self, thread_id, agent, environment, repeat_actions=1, max_timesteps=-1, episode_finished=None):
         """
@@ -69,7 +84,12 @@ class ThreadedRunner(object):
 
             timestep = 0
             while True:
-                action = agent.act(state=state)
+                act_start = time.time()
+                if self.inference_server is None:
+                    action = agent.act(state=state)
+                else:
+                    action = self.inference_server.act(agent=agent, state=state)
+                environment_start = time.time()
                 if repeat_actions > 1:
                     reward = 0
                     for repeat in xrange(repeat_actions):
@@ -80,7 +100,16 @@ class ThreadedRunner(object):
                 else:
                     state, reward, terminal = environment.execute(action=action)
 
+                observe_start = time.time()
                 agent.observe(reward=reward, terminal=terminal)
+                if self.metrics is not None:
+                    self.metrics.observe_step(
+                        agent=agent,
+                        act_time=(environment_start - act_start),
+                        environment_time=(observe_start - environment_start),
+                        observe_time=(time.time() - observe_start),
+                        queue_depth=(None if self.inference_server is None else self.inference_server.queue.qsize())
+                    )
 
                 timestep += 1
                 self.global_step += 1
@@ -95,6 +124,8 @@ class ThreadedRunner(object):
             agent.observe_episode_reward(episode_reward)
             self.episode_rewards.append(episode_reward)
             self.episode_lengths.append(timestep)
+            if self.metrics is not None:
+                self.metrics.observe_episode()
 
             summary_data = {"thread_id": thread_id, "episode": episode, "timestep": timestep, "episode_reward": episode_reward}
             if episode_finished and not episode_finished(summary_data):
@@ -112,34 +143,52 @@ class ThreadedRunner(object):
         self.global_episode = 1
         self.global_should_stop = False
 
-        # create threads
-        threads = [threading.Thread(target=self._run_single, args=(t, self.agents[t], self.environments[t],),
-                                    kwargs={"repeat_actions": self.repeat_actions,
-                                            "max_timesteps": max_timesteps,
-                                            "episode_finished": episode_finished})
-                   for t in range(len(self.agents))]
-
-        # start threads
-        self.start_time = time.time()
-        [t.start() for t in threads]
+        if self.save_path and self.save_async:
+            directory, prefix = os.path.split(self.save_path)
+            self.checkpoint_manager = CheckpointManager(
+                model=self.agents[0].model,
+                directory=(directory or '.'),
+                prefix=prefix,
+                keep_last=self.keep_last
+            )
 
         try:
-            next_summary = 0
-            next_save = 0
-            while self.global_episode < episodes or episodes == -1:
-                if self.global_episode > next_summary:
-                    summary_report(self)
-                    next_summary += summary_interval
-                if self.save_path and self.save_episodes is not None and self.global_episode > next_save:
-                    print("Saving agent after episode {}".format(self.global_episode))
-                    self.agents[0].save_model(self.save_path)
-                    next_save += self.save_episodes
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print('Keyboard interrupt, sending stop command to threads')
-
-        self.global_should_stop = True
-
-        # join threads
-        [t.join() for t in threads]
-        print('All threads stopped')
+            # create threads
+            threads = [threading.Thread(target=self._run_single, args=(t, self.agents[t], self.environments[t],),
+                                        kwargs={"repeat_actions": self.repeat_actions,
+                                                "max_timesteps": max_timesteps,
+                                                "episode_finished": episode_finished})
+                       for t in range(len(self.agents))]
+
+            # start threads
+            self.start_time = time.time()
+            [t.start() for t in threads]
+
+            try:
+                next_summary = 0
+                next_save = 0
+                while self.global_episode < episodes or episodes == -1:
+                    if self.global_episode > next_summary:
+                        summary_report(self)
+                        next_summary += summary_interval
+                    if self.save_path and self.save_episodes is not None and self.global_episode > next_save:
+                        print("Saving agent after episode {}".format(self.global_episode))
+                        if self.checkpoint_manager is None:
+                            self.agents[0].save_model(self.save_path)
+                        else:
+                            self.checkpoint_manager.save(step=self.global_step)
+                        next_save += self.save_episodes
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                print('Keyboard interrupt, sending stop command to threads')
+
+            self.global_should_stop = True
+
+            # join threads
+            [t.join() for t in threads]
+            print('All threads stopped')
+
+        finally:
+            if self.checkpoint_manager is not None:
+                self.checkpoint_manager.close()
+                self.checkpoint_manager = None
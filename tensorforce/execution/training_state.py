@@ -0,0 +1,125 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+On-disk format for complete training states as returned by `Agent.get_state`. Large arrays are
+stored as individual `.npy` files and loaded memory-mapped, small values are stored in a JSON
+manifest, and remaining Python objects, e.g. random number generator states, are pickled.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import json
+import os
+import shutil
+
+import numpy as np
+from six.moves import cPickle as pickle
+
+from tensorforce import TensorForceError
+
+
+MANIFEST = 'manifest.json'
+OBJECTS = 'objects.pkl'
+
+
+def save_training_state(directory, state, array_threshold=1024):
+    """
+    Saves a training state. The state is first written to a temporary directory which then
+    replaces `directory`, so an existing checkpoint is never left incomplete.
+
+    Args:
+        directory: Checkpoint directory
+        state: Nested dicts and lists of scalars, strings, arrays and other picklable objects
+        array_threshold: Arrays of at least this many bytes are stored as separate files
+    """
+    directory = os.path.normpath(directory)
+    temp_directory = directory + '.tmp'
+    if os.path.isdir(temp_directory):
+        shutil.rmtree(temp_directory)
+    os.makedirs(temp_directory)
+
+    arrays = list()
+    objects = list()
+
+    def encode(value):
+        if isinstance(value, dict):
+            if all(isinstance(key, str) for key in value):
+                return {key: encode(value=element) for key, element in value.items()}
+        elif isinstance(value, list):
+            return [encode(value=element) for element in value]
+        elif isinstance(value, np.ndarray):
+            if value.nbytes >= array_threshold and value.dtype != object:
+                filename = 'array-{}.npy'.format(len(arrays))
+                np.save(os.path.join(temp_directory, filename), value)
+                arrays.append(filename)
+                return {'__array__': filename}
+        elif isinstance(value, np.generic):
+            return value.item()
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        objects.append(value)
+        return {'__object__': len(objects) - 1}
+
+    manifest = encode(value=state)
+    with open(os.path.join(temp_directory, MANIFEST), 'w') as filehandle:
+        json.dump(manifest, filehandle)
+    with open(os.path.join(temp_directory, OBJECTS), 'wb') as filehandle:
+        pickle.dump(objects, filehandle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if os.path.isdir(directory):
+        old_directory = directory + '.old'
+        if os.path.isdir(old_directory):
+            shutil.rmtree(old_directory)
+        os.rename(directory, old_directory)
+        os.rename(temp_directory, directory)
+        shutil.rmtree(old_directory)
+    else:
+        os.rename(temp_directory, directory)
+
+
+def load_training_state(directory, mmap=True):
+    """
+    Loads a training state saved by `save_training_state`.
+
+    Args:
+        directory: Checkpoint directory
+        mmap: Whether to memory-map large arrays instead of reading them
+
+    Returns: Training state
+
+    """
+    manifest_path = os.path.join(directory, MANIFEST)
+    if not os.path.isfile(manifest_path):
+        raise TensorForceError("No training state in directory {}.".format(directory))
+    with open(manifest_path, 'r') as filehandle:
+        manifest = json.load(filehandle)
+    with open(os.path.join(directory, OBJECTS), 'rb') as filehandle:
+        objects = pickle.load(filehandle)
+
+    def decode(value):
+        if isinstance(value, dict):
+            if '__array__' in value:
+                return np.load(os.path.join(directory, value['__array__']), mmap_mode=('r' if mmap else None))
+            elif '__object__' in value:
+                return objects[value['__object__']]
+            return {key: decode(value=element) for key, element in value.items()}
+        elif isinstance(value, list):
+            return [decode(value=element) for element in value]
+        return value
+
+    return decode(value=manifest)
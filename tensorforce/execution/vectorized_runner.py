@@ -0,0 +1,205 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Runner stepping multiple environments in lockstep with batched action selection.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import time
+
+from six.moves import xrange
+
+from tensorforce import TensorForceError
+from tensorforce.agents import Agent
+from tensorforce.environments import EnvironmentPool
+from tensorforce.execution.checkpoint_manager import CheckpointManager
+from tensorforce.execution.metrics import RunnerMetrics
+
+
+class VectorizedRunner(object):
+
+    def __init__(self, agents, environments, repeat_actions=1, save_path=None, save_episodes=None,
+                 save_async=False, keep_last=5, metrics=None):
+        """
+        Initialize a vectorized runner. All environments are stepped in lockstep and the actions
+        for all of them are computed in a single batched model call. Each environment has its own
+        agent, so trajectories, memories and exploration are kept per environment, while all agents
+        share one model, e.g. `agents = [VPGAgent(config=config, model=model) for _ in environments]`.
+
+        Args:
+            agents: List of `Agent` objects sharing one model
+            environments: List of `Environment` objects, one per agent, or an `EnvironmentPool`
+                whose environments are stepped in parallel
+            repeat_actions:
+            save_path:
+            save_episodes:
+            save_async: Whether to write checkpoints in the background via a `CheckpointManager`
+            keep_last: Number of checkpoints retained by the checkpoint manager
+            metrics: Optional `MetricsRegistry` to publish runner telemetry to
+        """
+        if len(agents) != len(environments):
+            raise TensorForceError("Each agent must have its own environment. Got {a} agents and {e} environments.".
+                                   format(a=len(agents), e=len(environments)))
+        if any(agent.model is not agents[0].model for agent in agents):
+            raise TensorForceError("Agents of a vectorized runner must share one model.")
+        self.agents = agents
+        if isinstance(environments, EnvironmentPool):
+            self.pool = environments
+            self.environments = environments.environments
+        else:
+            self.pool = None
+            self.environments = environments
+        self.repeat_actions = repeat_actions
+        self.save_path = save_path
+        self.save_episodes = save_episodes
+        self.save_async = save_async
+        self.keep_last = keep_last
+        self.checkpoint_manager = None
+        self.metrics = None if metrics is None else RunnerMetrics(registry=metrics)
+
+    def run(self, episodes=-1, max_timesteps=-1, episode_finished=None):
+        """
+        Runs the environments until the specified number of episodes is completed over all
+        environments. Episodes are recorded in the order in which they finish.
+
+        Args:
+            episodes: Number of episodes to execute
+            max_timesteps: Max timesteps in a given episode
+            episode_finished: Optional termination condition, e.g. a particular mean reward threshold
+
+        Returns:
+
+        """
+        if self.save_path and self.save_async:
+            directory, prefix = os.path.split(self.save_path)
+            self.checkpoint_manager = CheckpointManager(
+                model=self.agents[0].model,
+                directory=(directory or '.'),
+                prefix=prefix,
+                keep_last=self.keep_last
+            )
+
+        # save episode reward and length for statistics
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.episode_times = []
+
+        self.total_timesteps = 0
+        self.timestep = 0
+        self.episode = 0
+        self.start_time = time.time()
+
+        try:
+            if self.pool is None:
+                states = [environment.reset() for environment in self.environments]
+            else:
+                states = self.pool.reset()
+            for agent in self.agents:
+                agent.reset()
+            episode_rewards = [0] * len(self.environments)
+            timesteps = [0] * len(self.environments)
+            episode_start_times = [time.time()] * len(self.environments)
+
+            should_stop = False
+            while not should_stop:
+                act_start = time.time()
+                actions = Agent.act_many(agents=self.agents, states=states)
+                environment_start = time.time()
+                results = self.execute(actions=actions)
+                observe_start = time.time()
+
+                for n, (agent, environment, (state, reward, terminal)) in enumerate(zip(self.agents, self.environments, results)):
+                    agent.observe(reward=reward, terminal=terminal)
+
+                    timesteps[n] += 1
+                    self.total_timesteps += 1
+                    episode_rewards[n] += reward
+
+                    if terminal or timesteps[n] == max_timesteps:
+                        agent.observe_episode_reward(episode_rewards[n])
+                        self.episode_rewards.append(episode_rewards[n])
+                        self.episode_lengths.append(timesteps[n])
+                        self.episode_times.append(time.time() - episode_start_times[n])
+                        self.timestep = timesteps[n]
+                        self.episode += 1
+                        if self.metrics is not None:
+                            self.metrics.observe_episode()
+
+                        if self.save_path and self.save_episodes is not None and self.episode % self.save_episodes == 0:
+                            print("Saving agent after episode {}".format(self.episode))
+                            if self.checkpoint_manager is None:
+                                agent.save_model(self.save_path)
+                            else:
+                                self.checkpoint_manager.save()
+
+                        if (episode_finished and not episode_finished(self)) or self.episode == episodes:
+                            should_stop = True
+                            break
+
+                        # Auto-reset finished environment
+                        state = environment.reset()
+                        agent.reset()
+                        episode_rewards[n] = 0
+                        timesteps[n] = 0
+                        episode_start_times[n] = time.time()
+
+                    states[n] = state
+
+                if self.metrics is not None:
+                    # Timings are per batched step over all environments
+                    self.metrics.observe_step(
+                        agent=self.agents[0],
+                        act_time=(environment_start - act_start),
+                        environment_time=(observe_start - environment_start),
+                        observe_time=(time.time() - observe_start),
+                        timesteps=len(results)
+                    )
+
+        finally:
+            if self.checkpoint_manager is not None:
+                self.checkpoint_manager.close()
+                self.checkpoint_manager = None
+
+    def execute(self, actions):
+        """
+        Executes one action per environment, in parallel if the environments are a pool.
+
+        Args:
+            actions: List of actions
+
+        Returns: List of state, reward and terminal tuples
+
+        """
+        if self.pool is not None:
+            return self.pool.execute(actions=actions, repeat_actions=self.repeat_actions)
+
+        results = list()
+        for environment, action in zip(self.environments, actions):
+            if self.repeat_actions > 1:
+                reward = 0
+                for repeat in xrange(self.repeat_actions):
+                    state, step_reward, terminal = environment.execute(action=action)
+                    reward += step_reward
+                    if terminal:
+                        break
+            else:
+                state, reward, terminal = environment.execute(action=action)
+            results.append((state, reward, terminal))
+        return results
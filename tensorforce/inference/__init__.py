@@ -0,0 +1,20 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from tensorforce.inference.layers import layers
+from tensorforce.inference.policy import InferencePolicy
+from tensorforce.inference.quantization import quantize, agreement_rate, quantization_report
+
+__all__ = ['InferencePolicy', 'layers', 'quantize', 'agreement_rate', 'quantization_report']
@@ -0,0 +1,370 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+NumPy implementations of the layer types created by `layered_network_builder`, used to execute
+exported networks without TensorFlow. Functions mirror `tensorforce.core.networks.layers`.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from tensorforce import TensorForceError
+
+
+def flatten(x):
+    """Flatten layer.
+
+    Args:
+        x: Input batch
+
+    Returns: Input batch reshaped to 1d per instance
+
+    """
+    return np.reshape(x, (x.shape[0], -1))
+
+
+def nonlinearity(x, name='relu'):
+    """Applies a non-linearity to an input and returns the result.
+
+    Args:
+        x: Input batch
+        name: String identifier of non-linearity. Options: elu, relu, selu, sigmoid,
+        softmax, softplus, tanh
+
+    Returns:
+
+    """
+    if name == 'elu':
+        return np.where(x > 0.0, x, np.expm1(np.minimum(x, 0.0)))
+    elif name == 'relu':
+        return np.maximum(x, 0.0)
+    elif name == 'selu':
+        alpha = 1.6732632423543772848170429916717
+        scale = 1.0507009873554804934193349852946
+        return scale * np.where(x >= 0.0, x, alpha * np.expm1(np.minimum(x, 0.0)))
+    elif name == 'sigmoid':
+        return 1.0 / (1.0 + np.exp(-x))
+    elif name == 'softmax':
+        exp = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return exp / np.sum(exp, axis=-1, keepdims=True)
+    elif name == 'softplus':
+        return np.logaddexp(0.0, x)
+    elif name == 'tanh':
+        return np.tanh(x)
+    else:
+        raise TensorForceError('Invalid non-linearity: {}'.format(name))
+
+
+def linear(x, weights, bias=None):
+    """Linear layer.
+
+    Args:
+        x: Input batch, must be rank 2
+        weights: Weight matrix
+        bias: Optional bias vector
+
+    Returns:
+
+    """
+    x = np.dot(x, weights)
+    if bias is not None:
+        x += bias
+    return x
+
+
+def dense(x, weights, bias=None, activation='relu'):
+    """Fully connected layer.
+
+    Args:
+        x: Input batch, must be rank 2
+        weights: Weight matrix
+        bias: Optional bias vector
+        activation: Non-linearity type
+
+    Returns:
+
+    """
+    return nonlinearity(x=linear(x=x, weights=weights, bias=bias), name=activation)
+
+
+def padding_sizes(size, window, stride, padding):
+    """Computes the padding before and after a spatial dimension as done by TensorFlow.
+
+    Args:
+        size: Input size of the dimension
+        window: Filter window size
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+
+    Returns: Tuple of padding before and after
+
+    """
+    if padding == 'VALID':
+        return 0, 0
+    elif padding == 'SAME':
+        output_size = -(-size // stride)
+        total = max((output_size - 1) * stride + window - size, 0)
+        return total // 2, total - total // 2
+    else:
+        raise TensorForceError('Invalid padding: {}'.format(padding))
+
+
+def convolve1d(x, filters, stride, padding):
+    """1d convolution of a batch, computed as sum of per-offset matrix products instead of an
+    explicit im2col copy. Integer inputs are accumulated in their own (e.g. int32) type.
+
+    Args:
+        x: Input batch, must be rank 3
+        filters: Filters of shape (window, input channels, size)
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+
+    Returns:
+
+    """
+    window = filters.shape[0]
+    x = np.pad(x, ((0, 0), padding_sizes(x.shape[1], window, stride, padding), (0, 0)), mode='constant')
+    length = (x.shape[1] - window) // stride + 1
+
+    y = 0
+    for i in range(window):
+        y = y + np.dot(x[:, i:i + stride * (length - 1) + 1:stride, :], filters[i])
+    return y
+
+
+def convolve2d(x, filters, stride, padding):
+    """2d convolution of a batch, computed as sum of per-offset matrix products instead of an
+    explicit im2col copy. Integer inputs are accumulated in their own (e.g. int32) type.
+
+    Args:
+        x: Input batch, must be rank 4
+        filters: Filters of shape (window, window, input channels, size)
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+
+    Returns:
+
+    """
+    window_height, window_width = filters.shape[:2]
+    x = np.pad(x, (
+        (0, 0),
+        padding_sizes(x.shape[1], window_height, stride, padding),
+        padding_sizes(x.shape[2], window_width, stride, padding),
+        (0, 0)
+    ), mode='constant')
+    height = (x.shape[1] - window_height) // stride + 1
+    width = (x.shape[2] - window_width) // stride + 1
+
+    y = 0
+    for i in range(window_height):
+        for j in range(window_width):
+            patch = x[:, i:i + stride * (height - 1) + 1:stride, j:j + stride * (width - 1) + 1:stride, :]
+            y = y + np.dot(patch, filters[i, j])
+    return y
+
+
+def conv1d(x, weights, bias=None, stride=1, padding='SAME', activation='relu', window=None):
+    """1d convolutional layer.
+
+    Args:
+        x: Input batch, must be rank 3
+        weights: Filters of shape (window, input channels, size)
+        bias: Optional bias vector
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+        activation: Non-linearity type
+        window: Ignored, given by the filter shape
+
+    Returns:
+
+    """
+    x = convolve1d(x=x, filters=weights, stride=stride, padding=padding)
+    if bias is not None:
+        x += bias
+    return nonlinearity(x=x, name=activation)
+
+
+def conv2d(x, weights, bias=None, stride=1, padding='SAME', activation='relu', window=None):
+    """2d convolutional layer.
+
+    Args:
+        x: Input batch, must be rank 4
+        weights: Filters of shape (window, window, input channels, size)
+        bias: Optional bias vector
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+        activation: Non-linearity type
+        window: Ignored, given by the filter shape
+
+    Returns:
+
+    """
+    x = convolve2d(x=x, filters=weights, stride=stride, padding=padding)
+    if bias is not None:
+        x += bias
+    return nonlinearity(x=x, name=activation)
+
+
+def lstm(x, internal, weights, bias, forget_bias=1.0):
+    """LSTM layer, equivalent to `tf.contrib.rnn.LSTMCell` without peepholes and projection.
+
+    Args:
+        x: Input batch, must be rank 2
+        internal: Internal state batch of shape (batch, 2, size) containing c and h
+        weights: Kernel of shape (input size + size, 4 * size)
+        bias: Bias of shape (4 * size,)
+        forget_bias: Bias added to the forget gate
+
+    Returns: Output batch and next internal state batch
+
+    """
+    c = internal[:, 0, :]
+    h = internal[:, 1, :]
+    gates = linear(x=np.concatenate((x, h), axis=1), weights=weights, bias=bias)
+    i, j, f, o = np.split(gates, 4, axis=1)
+    c = nonlinearity(x=(f + forget_bias), name='sigmoid') * c + nonlinearity(x=i, name='sigmoid') * np.tanh(j)
+    h = nonlinearity(x=o, name='sigmoid') * np.tanh(c)
+    return h, np.stack((c, h), axis=1)
+
+
+def quantize(x, scale):
+    """Symmetric int8 quantization, returned as int32 for accumulation.
+
+    Args:
+        x: Float array
+        scale: Quantization scale, i.e. the float value of one integer step
+
+    Returns:
+
+    """
+    return np.clip(np.round(x / scale), -127, 127).astype(np.int32)
+
+
+def dequantize(x, weights_scale, input_scale, bias=None):
+    """Converts int32 accumulators back to float and adds the bias.
+
+    Args:
+        x: Integer accumulator array
+        weights_scale: Per output channel weights scale
+        input_scale: Input quantization scale
+        bias: Optional bias vector
+
+    Returns:
+
+    """
+    x = x.astype(np.float32) * (weights_scale * np.float32(input_scale))
+    if bias is not None:
+        x += bias
+    return x
+
+
+def quantized_linear(x, weights, weights_scale, input_scale, bias=None):
+    """Linear layer with int8 weights and inputs and int32 accumulation.
+
+    Args:
+        x: Input batch, must be rank 2
+        weights: Int8 weight matrix
+        weights_scale: Per output channel weights scale
+        input_scale: Input quantization scale from calibration
+        bias: Optional float bias vector
+
+    Returns:
+
+    """
+    x = np.dot(quantize(x=x, scale=input_scale), weights.astype(np.int32))
+    return dequantize(x=x, weights_scale=weights_scale, input_scale=input_scale, bias=bias)
+
+
+def quantized_dense(x, weights, weights_scale, input_scale, bias=None, activation='relu'):
+    """Fully connected layer with int8 weights and inputs and int32 accumulation.
+
+    Args:
+        x: Input batch, must be rank 2
+        weights: Int8 weight matrix
+        weights_scale: Per output channel weights scale
+        input_scale: Input quantization scale from calibration
+        bias: Optional float bias vector
+        activation: Non-linearity type
+
+    Returns:
+
+    """
+    x = quantized_linear(x=x, weights=weights, weights_scale=weights_scale, input_scale=input_scale, bias=bias)
+    return nonlinearity(x=x, name=activation)
+
+
+def quantized_conv1d(x, weights, weights_scale, input_scale, bias=None, stride=1, padding='SAME',
+                     activation='relu', window=None):
+    """1d convolutional layer with int8 filters and inputs and int32 accumulation.
+
+    Args:
+        x: Input batch, must be rank 3
+        weights: Int8 filters of shape (window, input channels, size)
+        weights_scale: Per output channel filters scale
+        input_scale: Input quantization scale from calibration
+        bias: Optional float bias vector
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+        activation: Non-linearity type
+        window: Ignored, given by the filter shape
+
+    Returns:
+
+    """
+    x = convolve1d(x=quantize(x=x, scale=input_scale), filters=weights.astype(np.int32), stride=stride, padding=padding)
+    x = dequantize(x=x, weights_scale=weights_scale, input_scale=input_scale, bias=bias)
+    return nonlinearity(x=x, name=activation)
+
+
+def quantized_conv2d(x, weights, weights_scale, input_scale, bias=None, stride=1, padding='SAME',
+                     activation='relu', window=None):
+    """2d convolutional layer with int8 filters and inputs and int32 accumulation.
+
+    Args:
+        x: Input batch, must be rank 4
+        weights: Int8 filters of shape (window, window, input channels, size)
+        weights_scale: Per output channel filters scale
+        input_scale: Input quantization scale from calibration
+        bias: Optional float bias vector
+        stride: Filter stride
+        padding: One of [VALID, SAME]
+        activation: Non-linearity type
+        window: Ignored, given by the filter shape
+
+    Returns:
+
+    """
+    x = convolve2d(x=quantize(x=x, scale=input_scale), filters=weights.astype(np.int32), stride=stride, padding=padding)
+    x = dequantize(x=x, weights_scale=weights_scale, input_scale=input_scale, bias=bias)
+    return nonlinearity(x=x, name=activation)
+
+
+layers = {
+    'flatten': flatten,
+    'nonlinearity': nonlinearity,
+    'linear': linear,
+    'dense': dense,
+    'conv1d': conv1d,
+    'conv2d': conv2d,
+    'lstm': lstm,
+    'quantized_linear': quantized_linear,
+    'quantized_dense': quantized_dense,
+    'quantized_conv1d': quantized_conv1d,
+    'quantized_conv2d': quantized_conv2d
+}
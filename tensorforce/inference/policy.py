@@ -0,0 +1,327 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+TensorFlow-free execution of policies exported via `Agent.export_inference`.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import json
+from math import log
+
+import numpy as np
+
+from tensorforce import TensorForceError
+from tensorforce.inference.layers import layers, linear, nonlinearity
+
+
+class InferencePolicy(object):
+    """
+    Deterministic policy executing an exported network and action heads in NumPy, for deployment
+    without TensorFlow, graph construction or session startup. Supports networks created by
+    `layered_network_builder` and DQN (argmax) as well as categorical, Gaussian and Beta action heads.
+    Categorical and Gaussian heads can also be sampled stochastically via `sample`.
+
+    Example:
+
+        ```python
+        agent.export_inference('policy.npz')
+
+        policy = InferencePolicy.load('policy.npz')
+        policy.reset()
+        action = policy.act(state)
+        ```
+    """
+
+    # Layer specification keys referring to weight arrays
+    weight_keys = ('weights', 'bias', 'weights_scale')
+
+    def __init__(self, spec, weights):
+        """
+        Initializes the inference policy.
+
+        Args:
+            spec: Specification dict created by `Model.export_inference`.
+            weights: Dict of weight names to arrays.
+        """
+        self.spec = spec
+        self.weights = {name: np.asarray(weight) for name, weight in weights.items()}
+        self.epsilon = spec['epsilon']
+        self.unique_state = spec.get('unique_state', False)
+        self.unique_action = spec.get('unique_action', False)
+
+        if len(spec['states']) != 1:
+            raise TensorForceError('Layered network must have only one input, {} given.'.format(len(spec['states'])))
+        self.state_name, = spec['states']
+
+        self.internal_inits = list()
+        for layer in spec['network']:
+            if layer['type'] == 'lstm':
+                size = self.weights[layer['bias']].shape[0] // 4
+                self.internal_inits.append(np.zeros(shape=(2, size)))
+
+        self.reset()
+
+    @staticmethod
+    def load(path):
+        """
+        Loads an exported policy.
+
+        Args:
+            path: Path of the exported `.npz` file
+
+        Returns: InferencePolicy
+
+        """
+        with np.load(path) as data:
+            spec = json.loads(str(data['__spec__']))
+            weights = {name: data[name] for name in data.files if name != '__spec__'}
+        return InferencePolicy(spec=spec, weights=weights)
+
+    def save(self, path):
+        """
+        Saves the policy in the format created by `Agent.export_inference`.
+
+        Args:
+            path: Export file path
+
+        Returns:
+
+        """
+        weights = dict(self.weights)
+        weights['__spec__'] = np.array(json.dumps(self.spec))
+        np.savez(path, **weights)
+
+    def reset(self):
+        """
+        Resets the internal state used by `act` to the initial state.
+
+        Returns: A list containing the initial internal states.
+
+        """
+        self.internal = list(self.internal_inits)
+        return list(self.internal_inits)
+
+    def act(self, state):
+        """
+        Returns the deterministic action(s) for a single state, analogous to
+        `Agent.act(state, deterministic=True)`.
+
+        Args:
+            state: One state or dict of states if multiple states are expected.
+
+        Returns: Scalar value of the action or dict of multiple actions.
+
+        """
+        if self.unique_state:
+            state = dict(state=state)
+        states = {name: np.expand_dims(state[name], axis=0) for name in state}
+        internals = [np.expand_dims(internal, axis=0) for internal in self.internal]
+
+        actions, internals = self.get_action(states=states, internals=internals)
+
+        self.internal = [internal[0] for internal in internals]
+        actions = {name: action[0] for name, action in actions.items()}
+        if self.unique_action:
+            return actions['action']
+        else:
+            return actions
+
+    def get_action(self, states, internals=None):
+        """
+        Computes deterministic actions for a batch of states.
+
+        Args:
+            states: Dict of state batches.
+            internals: List of internal state batches, initial internal states if None.
+
+        Returns: Dict of action batches and list of next internal state batches.
+
+        """
+        x, next_internals = self.network_output(states=states, internals=internals)
+        actions = dict()
+        for name, action in self.spec['actions'].items():
+            actions[name] = self.action(x=x, spec=action)
+        return actions, next_internals
+
+    def sample(self, states, internals=None):
+        """
+        Samples stochastic actions for a batch of states, analogous to `Agent.act(state)` without
+        exploration, together with their joint log probability under the policy.
+
+        Args:
+            states: Dict of state batches.
+            internals: List of internal state batches, initial internal states if None.
+
+        Returns: Dict of action batches, batch of log probabilities and list of next internal
+            state batches.
+
+        """
+        x, next_internals = self.network_output(states=states, internals=internals)
+        actions = dict()
+        log_probability = np.zeros(shape=(x.shape[0],))
+        for name, action in self.spec['actions'].items():
+            actions[name], log_prob = self.sample_action(x=x, spec=action)
+            log_probability += np.reshape(log_prob, (x.shape[0], -1)).sum(axis=1)
+        return actions, log_probability, next_internals
+
+    def action_values(self, states, internals=None):
+        """
+        Computes the action values of a batch of states, for policies with Q-value action heads.
+
+        Args:
+            states: Dict of state batches.
+            internals: List of internal state batches, initial internal states if None.
+
+        Returns: Dict of action value batches of shape (batch,) + action shape + (num_actions,).
+
+        """
+        x, _ = self.network_output(states=states, internals=internals)
+        values = dict()
+        for name, action in self.spec['actions'].items():
+            if action['type'] != 'q_values':
+                raise TensorForceError('Action values require a q_values action head, not {}.'.format(action['type']))
+            values[name] = np.reshape(
+                linear(x=x, **self.layer_kwargs(action['values'])),
+                (-1,) + tuple(action['shape']) + (action['num_actions'],)
+            )
+        return values
+
+    def network_output(self, states, internals=None):
+        """
+        Applies the network to a batch of states.
+
+        Args:
+            states: Dict of state batches.
+            internals: List of internal state batches, initial internal states if None.
+
+        Returns: Network output batch and list of next internal state batches.
+
+        """
+        x = np.asarray(states[self.state_name], dtype=np.float32)
+        if internals is None:
+            internals = [np.tile(internal, (x.shape[0], 1, 1)) for internal in self.internal_inits]
+
+        next_internals = list()
+        for layer in self.spec['network']:
+            if layer['type'] == 'lstm':
+                x, internal = self.apply_layer(x=x, spec=layer, internal=internals[len(next_internals)])
+                next_internals.append(internal)
+            else:
+                x = self.apply_layer(x=x, spec=layer)
+        return x, next_internals
+
+    def apply_layer(self, x, spec, internal=None):
+        """
+        Applies a network layer.
+
+        Args:
+            x: Input batch
+            spec: Layer specification
+            internal: Internal state batch for recurrent layers
+
+        Returns: Output batch, plus next internal state batch for recurrent layers
+
+        """
+        if internal is None:
+            return layers[spec['type']](x=x, **self.layer_kwargs(spec))
+        else:
+            return layers[spec['type']](x=x, internal=internal, **self.layer_kwargs(spec))
+
+    def layer_kwargs(self, spec):
+        kwargs = {key: value for key, value in spec.items() if key != 'type'}
+        for key in InferencePolicy.weight_keys:
+            if key in kwargs:
+                kwargs[key] = self.weights[kwargs[key]]
+        return kwargs
+
+    def action(self, x, spec):
+        """
+        Computes the deterministic action of an action head.
+
+        Args:
+            x: Network output batch
+            spec: Action head specification
+
+        Returns: Action batch
+
+        """
+        shape = (-1,) + tuple(spec['shape'])
+        log_eps = log(self.epsilon)
+
+        if spec['type'] == 'q_values':
+            values = linear(x=x, **self.layer_kwargs(spec['values']))
+            values = np.reshape(values, shape + (spec['num_actions'],))
+            return np.argmax(values, axis=-1)
+
+        elif spec['type'] == 'categorical':
+            logits = linear(x=x, **self.layer_kwargs(spec['logits']))
+            logits = np.reshape(logits, shape + (spec['num_actions'],))
+            probabilities = np.maximum(nonlinearity(x=logits, name='softmax'), self.epsilon)
+            return np.argmax(np.log(probabilities), axis=-1)
+
+        elif spec['type'] == 'gaussian':
+            mean = linear(x=x, **self.layer_kwargs(spec['mean']))
+            return np.reshape(mean, shape)
+
+        elif spec['type'] == 'beta':
+            alpha = linear(x=x, **self.layer_kwargs(spec['alpha']))
+            alpha = np.log(np.exp(np.clip(alpha, log_eps, -log_eps)) + 1.0)
+            beta = linear(x=x, **self.layer_kwargs(spec['beta']))
+            beta = np.log(np.exp(np.clip(beta, log_eps, -log_eps)) + 1.0)
+            mean = np.reshape(beta, shape) / np.maximum(np.reshape(alpha + beta, shape), self.epsilon)
+            return spec['min_value'] + mean * (spec['max_value'] - spec['min_value'])
+
+        else:
+            raise TensorForceError('Invalid action head type: {}'.format(spec['type']))
+
+    def sample_action(self, x, spec):
+        """
+        Samples the action of an action head, as the corresponding distribution does in-graph.
+
+        Args:
+            x: Network output batch
+            spec: Action head specification
+
+        Returns: Action batch and batch of log probabilities per action element
+
+        """
+        shape = (-1,) + tuple(spec['shape'])
+        log_eps = log(self.epsilon)
+
+        if spec['type'] == 'categorical':
+            logits = linear(x=x, **self.layer_kwargs(spec['logits']))
+            logits = np.reshape(logits, shape + (spec['num_actions'],))
+            log_probabilities = np.log(np.maximum(nonlinearity(x=logits, name='softmax'), self.epsilon))
+            uniform = np.random.uniform(low=self.epsilon, high=(1.0 - self.epsilon), size=log_probabilities.shape)
+            action = np.argmax(log_probabilities - np.log(-np.log(uniform)), axis=-1)
+            log_prob = np.take_along_axis(log_probabilities, np.expand_dims(action, axis=-1), axis=-1)[..., 0]
+            return action, log_prob
+
+        elif spec['type'] == 'gaussian':
+            if 'log_stddev' not in spec:
+                raise TensorForceError('Gaussian action head was exported without standard deviation.')
+            mean = np.reshape(linear(x=x, **self.layer_kwargs(spec['mean'])), shape)
+            log_stddev = linear(x=x, **self.layer_kwargs(spec['log_stddev']))
+            log_stddev = np.reshape(np.clip(log_stddev, log_eps, -log_eps), shape)
+            action = mean + np.exp(log_stddev) * np.random.normal(size=mean.shape)
+            log_prob = -0.5 * np.log(2.0 * np.pi) - log_stddev - 0.5 * np.square((action - mean) / np.exp(log_stddev))
+            return action, log_prob
+
+        else:
+            raise TensorForceError('Sampling is not supported for action head type: {}'.format(spec['type']))
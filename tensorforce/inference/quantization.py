@@ -0,0 +1,146 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Post-training int8 quantization of exported policies. Dense, linear and convolutional layers are
+quantized with per output channel weight scales and calibrated per-layer input scales, and executed
+with int32 accumulation. LSTM layers and action heads remain in float precision.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from tensorforce import TensorForceError
+from tensorforce.inference.policy import InferencePolicy
+
+
+def quantize(policy, states, percentile=100.0, calibration_size=1000):
+    """
+    Creates an int8 quantized version of an inference policy.
+
+    Example:
+
+        ```python
+        policy = InferencePolicy.load('policy.npz')
+        quantized = quantize(policy=policy, states=agent.memory)
+        print(quantization_report(reference=policy, policy=quantized, states=held_out_states))
+        quantized.save('policy-int8.npz')
+        ```
+
+    Args:
+        policy: Float `InferencePolicy` to quantize.
+        states: Calibration data, either a dict of state batches or a replay memory from which
+            `calibration_size` states are sampled.
+        percentile: Percentile of absolute layer input values used as quantization range, values
+            below 100 clip outliers.
+        calibration_size: Number of states to sample if a memory is given.
+
+    Returns: Quantized `InferencePolicy`.
+
+    """
+    if hasattr(states, 'get_batch'):
+        states = states.get_batch(batch_size=calibration_size)['states']
+    x = np.asarray(states[policy.state_name], dtype=np.float32)
+    internals = [np.tile(internal, (x.shape[0], 1, 1)) for internal in policy.internal_inits]
+
+    spec = dict(policy.spec)
+    spec['network'] = list()
+    weights = dict(policy.weights)
+    for layer in policy.spec['network']:
+        if layer['type'] in ('linear', 'dense', 'conv1d', 'conv2d'):
+            # Calibrate the input range on the float activations
+            input_range = np.percentile(np.abs(x), percentile) if x.size > 0 else 0.0
+            input_scale = float(input_range) / 127.0 if input_range > 0.0 else 1.0
+
+            # Per output channel scale, output channels are the last weights dimension
+            float_weights = policy.weights[layer['weights']]
+            weights_range = np.max(np.abs(np.reshape(float_weights, (-1, float_weights.shape[-1]))), axis=0)
+            weights_scale = np.where(weights_range > 0.0, weights_range / 127.0, 1.0).astype(np.float32)
+            quantized_weights = np.clip(np.round(float_weights / weights_scale), -127, 127).astype(np.int8)
+
+            quantized_layer = dict(layer)
+            quantized_layer['type'] = 'quantized_' + layer['type']
+            quantized_layer['input_scale'] = input_scale
+            quantized_layer['weights'] = layer['weights'] + '/quantized'
+            quantized_layer['weights_scale'] = layer['weights'] + '/scale'
+            weights.pop(layer['weights'])
+            weights[quantized_layer['weights']] = quantized_weights
+            weights[quantized_layer['weights_scale']] = weights_scale
+            spec['network'].append(quantized_layer)
+
+        else:
+            spec['network'].append(layer)
+
+        if layer['type'] == 'lstm':
+            x, internal = policy.apply_layer(x=x, spec=layer, internal=internals.pop(0))
+        else:
+            x = policy.apply_layer(x=x, spec=layer)
+
+    return InferencePolicy(spec=spec, weights=weights)
+
+
+def agreement_rate(reference, policy, states, tolerance=1e-2):
+    """
+    Fraction of states for which two policies select the same actions. Continuous actions agree
+    if they are within the given relative and absolute tolerance.
+
+    Args:
+        reference: Reference `InferencePolicy`, usually the float policy.
+        policy: `InferencePolicy` to compare, usually the quantized policy.
+        states: Dict of state batches, should be held out from calibration.
+        tolerance: Relative and absolute tolerance for continuous actions.
+
+    Returns: Agreement rate in [0, 1].
+
+    """
+    reference_actions, _ = reference.get_action(states=states)
+    actions, _ = policy.get_action(states=states)
+
+    agreement = None
+    for name, reference_action in reference_actions.items():
+        if reference_action.dtype.kind in 'iu':
+            same = (actions[name] == reference_action)
+        else:
+            same = np.isclose(actions[name], reference_action, rtol=tolerance, atol=tolerance)
+        same = np.all(np.reshape(same, (same.shape[0], -1)), axis=1)
+        agreement = same if agreement is None else (agreement & same)
+
+    if agreement is None:
+        raise TensorForceError('Policy has no actions.')
+    return float(np.mean(agreement))
+
+
+def quantization_report(reference, policy, states, tolerance=1e-2):
+    """
+    Reports action agreement and weights memory of a quantized policy compared to its float
+    reference, to decide whether the quantized policy is safe to deploy.
+
+    Args:
+        reference: Float `InferencePolicy`.
+        policy: Quantized `InferencePolicy`.
+        states: Dict of held out state batches.
+        tolerance: Relative and absolute tolerance for continuous actions.
+
+    Returns: Dict containing `agreement_rate`, `reference_bytes` and `quantized_bytes`.
+
+    """
+    return dict(
+        agreement_rate=agreement_rate(reference=reference, policy=policy, states=states, tolerance=tolerance),
+        reference_bytes=sum(weights.nbytes for weights in reference.weights.values()),
+        quantized_bytes=sum(weights.nbytes for weights in policy.weights.values())
+    )
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
+from tensorforce.models.summary_writer import SummaryWriter
 from tensorforce.models.model import Model
 from tensorforce.models.policy_gradient_model import PolicyGradientModel
 from tensorforce.models.q_model import QModel
@@ -23,6 +24,7 @@ from tensorforce.models.naf_model import NAFModel
 from tensorforce.models.dqfd_model import DQFDModel
 from tensorforce.models.categorical_dqn_model import CategoricalDQNModel
 from tensorforce.models.dqn_nstep_model import DQNNstepModel
+from tensorforce.models.vtrace_model import VTraceModel
 
 
 models = dict(
@@ -33,7 +35,8 @@ models = dict(
     DQFDModel=DQFDModel,
     CategoricalDQNModel=CategoricalDQNModel,
     DQNNstepModel=DQNNstepModel,
+    VTraceModel=VTraceModel,
 )
 
-__all__ = ['Model', 'PolicyGradientModel', 'QModel', 'VPGModel', 'TRPOModel', 'DQNModel', 'NAFModel', 'DQFDModel',
-           'CategoricalDQNModel', 'DQNNstepModel', 'models']
+__all__ = ['SummaryWriter', 'Model', 'PolicyGradientModel', 'QModel', 'VPGModel', 'TRPOModel', 'DQNModel', 'NAFModel', 'DQFDModel',
+           'CategoricalDQNModel', 'DQNNstepModel', 'VTraceModel', 'models']
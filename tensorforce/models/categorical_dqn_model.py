@@ -68,7 +68,7 @@ class CategoricalDQNModel(Model):
         with tf.variable_scope('placeholder'):
             self.next_state = dict()
             for name, state in config.states.items():
-                self.next_state[name] = tf.placeholder(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=name)
+                self.next_state[name] = self.batch_input(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=name)
 
         # setup constants delta_z and z. z represents the discretized scaling over vmin -> vmax
         scaling_increment = (self.distribution_max - self.distribution_min) / (self.num_atoms - 1)  # delta_z in the paper
@@ -210,6 +210,19 @@ class CategoricalDQNModel(Model):
         self.possible_update_target()
         return super(CategoricalDQNModel, self).update(*args, **kwargs)
 
+    def update_many(self, *args, **kwargs):
+        self.possible_update_target()
+        return super(CategoricalDQNModel, self).update_many(*args, **kwargs)
+
+    def get_state(self):
+        state = super(CategoricalDQNModel, self).get_state()
+        state['last_target_update'] = self.last_target_update
+        return state
+
+    def set_state(self, state):
+        super(CategoricalDQNModel, self).set_state(state=state)
+        self.last_target_update = state['last_target_update']
+
     def possible_update_target(self, force=False):
         """
         Updates target network if necessary
@@ -21,6 +21,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 import tensorflow as tf
 
 from tensorforce import util
@@ -51,6 +52,14 @@ class DQFDModel(DQNModel):
         """
         super(DQFDModel, self).create_tf_operations(config)
 
+        with tf.variable_scope('placeholder'):
+            # Marks demo instances, defaults to an online batch
+            self.demo_mask = tf.placeholder_with_default(
+                input=tf.zeros_like(tensor=self.reward),
+                shape=(None,),
+                name='demo-mask'
+            )
+
         with tf.name_scope('supervised-update'):
             deltas = list()
             for name, action in self.action.items():
@@ -71,11 +80,13 @@ class DQFDModel(DQNModel):
 
             delta = tf.reduce_mean(input_tensor=tf.concat(values=deltas, axis=1), axis=1)
             supervised_loss_per_instance = tf.square(delta)
-            supervised_loss = tf.reduce_mean(input_tensor=supervised_loss_per_instance)
+
+            # Supervised loss only applies to demo instances, mean over these
+            num_demos = tf.maximum(x=tf.reduce_sum(input_tensor=self.demo_mask), y=1.0)
+            supervised_loss = tf.reduce_sum(input_tensor=(self.demo_mask * supervised_loss_per_instance)) / num_demos
 
             # Combining double q loss with supervised loss
-            dqfd_loss = self.q_loss + supervised_loss * config.supervised_weight
-            self.dqfd_optimize = self.optimizer.minimize(dqfd_loss)
+            tf.losses.add_loss(supervised_loss * config.supervised_weight)
 
     def demonstration_update(self, batch):
         """Computes the demonstration update.
@@ -86,7 +97,15 @@ class DQFDModel(DQNModel):
         Returns:
 
         """
-        self.possible_update_target()
-        fetches = self.dqfd_optimize
-        feed_dict = self.update_feed_dict(batch=batch)
-        self.session.run(fetches=fetches, feed_dict=feed_dict)
+        batch = dict(batch)
+        batch['demo_mask'] = np.ones_like(batch['rewards'], dtype=np.float32)
+        self.update(batch=batch)
+
+    def update_feed_dict(self, batch):
+        feed_dict = super(DQFDModel, self).update_feed_dict(batch=batch)
+        if 'demo_mask' in batch:
+            if 'next_states' in batch:
+                feed_dict[self.demo_mask] = batch['demo_mask']
+            else:
+                feed_dict[self.demo_mask] = batch['demo_mask'][:-1]
+        return feed_dict
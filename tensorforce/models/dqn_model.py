@@ -47,6 +47,10 @@ class DQNModel(QModel):
         config.default(DQNModel.default_config)
         super(DQNModel, self).__init__(config)
 
+        # Double DQN target values depend on the training network, overrides the class attribute
+        if config.double_dqn:
+            self.allows_target_value_cache = False
+
     def create_training_operations(self, config):
         self.training_output = dict()
         q_values = dict()
@@ -101,3 +105,20 @@ class DQNModel(QModel):
                     target_values[name] = tf.reduce_max(input_tensor=output, axis=-1)
 
         return target_values
+
+    def create_inference_spec(self):
+        network, variables = self.training_network.inference_spec()
+        actions = dict()
+        for name in self.action:
+            scope = name if not self.training_network.scope else self.training_network.scope + '/' + name
+            names, action_variables = util.layer_variables(scope=(scope + '/linear'))
+            values = dict(type='linear')
+            values.update(names)
+            actions[name] = dict(
+                type='q_values',
+                shape=self.training_output[name].get_shape().as_list()[1:-1],
+                num_actions=self.training_output[name].get_shape().as_list()[-1],
+                values=values
+            )
+            variables.update(action_variables)
+        return dict(network=network, actions=actions), variables
@@ -29,50 +29,41 @@ from tensorforce.models import DQNModel
 
 class DQNNstepModel(DQNModel):
 
-    def create_tf_operations(self, config):
-        # create a nstep reward placeholder for each action
-        with tf.variable_scope('placeholder'):
-            self.nstep_rewards = dict()
-            for name, action in config.actions.items():
-                # if shaped multi action (IE: action shape like (?, 2)) make a shaped nstep reward
-                if util.prod(action.shape) > 1:
-                    shape = (None, util.prod(action.shape))
-                else:
-                    shape = (None,)
-                self.nstep_rewards[name] = tf.placeholder(dtype=tf.float32, shape=shape,
-                                                          name='nstep-reward-{}'.format(name))
-
-        super(DQNNstepModel, self).create_tf_operations(config)
-
     def create_q_deltas(self, config):
         """
-        Nstep rewards are calculated in update_feed_dict and passed into self.nstep_rewards
-        So we just calculate the delta between training output and rewards
+        Nstep rewards are computed in-graph by a reverse scan over rewards and terminals,
+        bootstrapped from the target values of the state following the batch, which is the only
+        next state fed. So we just calculate the delta between training output and nstep rewards
         """
         deltas = list()
+        self.nstep_rewards = dict()
+        nonterminal = 1.0 - tf.cast(x=self.terminal, dtype=tf.float32)
         for name, action in self.action.items():
-            reward = self.nstep_rewards[name]
-            delta = reward - self.q_values[name]
+            def discount_step(cumulative, elements):
+                reward, nonterminal = elements
+                return reward + nonterminal * config.discount * cumulative
+
+            # Reverse scan via reversed sequences, as older TensorFlow versions lack tf.scan(reverse=True)
+            nstep_rewards = tf.scan(
+                fn=discount_step,
+                elems=(tf.reverse(tensor=self.reward, axis=(0,)), tf.reverse(tensor=nonterminal, axis=(0,))),
+                initializer=self.target_values[name][0]
+            )
+            nstep_rewards = tf.reverse(tensor=nstep_rewards, axis=(0,))
+            self.nstep_rewards[name] = nstep_rewards
+
+            delta = tf.stop_gradient(nstep_rewards) - self.q_values[name]
             delta = tf.reshape(tensor=delta, shape=(-1, util.prod(config.actions[name].shape)))
             deltas.append(delta)
         return deltas
 
     def update_feed_dict(self, batch):
-        # assume temporally consistent sequence
-        # get state time + 1
-        feed_dict = {next_state: [batch['states'][name][-1]] for name, next_state in self.next_state.items()}
-        feed_dict.update({internal: [batch['internals'][n][-1]] for n, internal in enumerate(self.next_internal_inputs, self.network_internal_index)})
-        # calcualte nstep rewards
-        target_q_vals = self.session.run(self.target_values, feed_dict=feed_dict)
-        nstep_rewards = dict()
-
-        for name, value in target_q_vals.items():
-            nstep_rewards[name] = util.cumulative_discount(values=batch['rewards'][:-1], terminals=batch['terminals'][:-1],
-                                                           discount=self.discount, cumulative_start=target_q_vals[name][0])
-
-        # create update feed dict
+        # assume temporally consistent sequence, the last state is only used for bootstrapping
         feed_dict = {state: batch['states'][name][:-1] for name, state in self.state.items()}
+        feed_dict.update({next_state: batch['states'][name][-1:] for name, next_state in self.next_state.items()})
         feed_dict.update({action: batch['actions'][name][:-1] for name, action in self.action.items()})
+        feed_dict[self.reward] = batch['rewards'][:-1]
+        feed_dict[self.terminal] = batch['terminals'][:-1]
         feed_dict.update({internal: batch['internals'][n][:-1] for n, internal in enumerate(self.internal_inputs)})
-        feed_dict.update({self.nstep_rewards[name]: nstep_rewards[name] for name, reward in nstep_rewards.items()})
+        feed_dict.update({internal: batch['internals'][n][-1:] for n, internal in enumerate(self.next_internal_inputs, self.network_internal_index)})
         return feed_dict
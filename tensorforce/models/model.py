@@ -23,11 +23,14 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import json
 import logging
+import numpy as np
 import tensorflow as tf
 
 from tensorforce import TensorForceError, util
 from tensorforce.core.optimizers import Optimizer
+from tensorforce.models.summary_writer import SummaryWriter
 
 
 class Model(object):
@@ -43,6 +46,10 @@ class Model(object):
     * `tf_summary`: string directory to write tensorflow summaries. Default None
     * `tf_summary_level`: int indicating which tensorflow summaries to create.
     * `tf_summary_interval`: int number of calls to get_action until writing tensorflow summaries on update.
+    * `tf_histogram_interval`: float number of seconds between trainable variable histogram summaries, which are
+        written in the background independent of updates.
+    * `fused_updates`: boolean indicating whether batch inputs are staged in variables, so that multiple
+        optimization steps via `update_many` only feed row indices.
     * `log_level`: string containing log level (e.g. 'info').
     * `distributed`: boolean indicating whether to use distributed tensorflow.
     * `global_model`: global model.
@@ -51,6 +58,7 @@ class Model(object):
     """
     allows_discrete_actions = None
     allows_continuous_actions = None
+    allows_target_value_cache = False
 
     default_config = dict(
         discount=0.97,
@@ -60,6 +68,8 @@ class Model(object):
         tf_summary=None,
         tf_summary_level=0,
         tf_summary_interval=1000,
+        tf_histogram_interval=60.0,
+        fused_updates=False,
         distributed=False,
         global_model=False,
         session=None
@@ -78,8 +88,12 @@ class Model(object):
 
         self.discount = config.discount
         self.distributed = config.distributed
+        self.fused_updates = config.fused_updates
         self.session = None
 
+        if config.fused_updates and config.distributed:
+            raise TensorForceError("Fused updates are not supported for distributed models.")
+
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(util.log_levels[config.log_level])
 
@@ -99,7 +113,11 @@ class Model(object):
             self.global_variables = self.global_model.variables
 
         self.optimizer_args = None
+        self.staged_inputs = dict()
         with tf.device(config.device):
+            if config.fused_updates:
+                self.stage_indices = tf.placeholder(dtype=tf.int32, shape=(None,), name='stage-indices')
+
             if config.distributed:
                 if config.global_model:
                     self.global_timestep = tf.get_variable(name='timestep', dtype=tf.int32, initializer=0, trainable=False)
@@ -130,8 +148,7 @@ class Model(object):
                 else:
                     self.loss = tf.losses.get_total_loss()
                     if self.optimizer_args is not None:
-                        self.optimizer_args['loss'] = self.loss
-                        self.optimize = self.optimizer.minimize(self.optimizer_args)
+                        self.optimize = self.optimizer.minimize(fn_loss=self.loss, **self.optimizer_args)
                     else:
                         self.optimize = self.optimizer.minimize(self.loss)
 
@@ -143,32 +160,41 @@ class Model(object):
             # create a summary for total loss
             tf.summary.scalar('total-loss', self.loss)
 
-            # create summary writer
-            self.writer = tf.summary.FileWriter(config.tf_summary, graph=tf.get_default_graph())
-            self.last_summary_step = -float('inf')
-
-            # create summaries based on summary level
+            # create summaries based on summary level, variable histograms do not depend on update
+            # inputs and are hence kept out of the update fetches
             if config.tf_summary_level >= 2:  # trainable variables
                 for v in tf.trainable_variables():
-                    tf.summary.histogram(v.name, v)
+                    tf.summary.histogram(v.name, v, collections=['variable_histograms'])
+                histograms = tf.summary.merge_all(key='variable_histograms')
+            else:
+                histograms = None
 
             # merge all summaries
             self.tf_summaries = tf.summary.merge_all()
 
-            # create a separate summary for episode rewards
-            self.tf_episode_reward = tf.placeholder(tf.float32, name='episode-reward-placeholder')
-            self.episode_reward_summary = tf.summary.scalar('episode-reward', self.tf_episode_reward)
+            # create background summary writer
+            self.writer = SummaryWriter(
+                logdir=config.tf_summary,
+                graph=tf.get_default_graph(),
+                histograms=histograms,
+                histogram_interval=config.tf_histogram_interval
+            )
+            self.last_summary_step = -float('inf')
         else:
             self.writer = None
             config.tf_summary_level
             config.tf_summary_interval
+            config.tf_histogram_interval
 
         self.timestep = 0
+        self.updates = 0
         self.summary_interval = config.tf_summary_interval
 
         if not config.distributed:
             self.set_session(tf.Session())
             self.session.run(tf.global_variables_initializer())
+            if config.fused_updates:
+                self.session.run(tf.local_variables_initializer())
             # tf.get_default_graph().finalize()
 
     def create_tf_operations(self, config):
@@ -191,7 +217,7 @@ class Model(object):
             # States
             self.state = dict()
             for name, state in config.states.items():
-                self.state[name] = tf.placeholder(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=name)
+                self.state[name] = self.batch_input(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=name)
 
             # Actions
             self.action = dict()
@@ -201,15 +227,15 @@ class Model(object):
                 if action.continuous:
                     if not self.__class__.allows_continuous_actions:
                         raise TensorForceError("Error: Model does not support continuous actions.")
-                    self.action[name] = tf.placeholder(dtype=util.tf_dtype('float'), shape=(None,) + tuple(action.shape), name=name)
+                    self.action[name] = self.batch_input(dtype=util.tf_dtype('float'), shape=(None,) + tuple(action.shape), name=name)
                 else:
                     if not self.__class__.allows_discrete_actions:
                         raise TensorForceError("Error: Model does not support discrete actions.")
-                    self.action[name] = tf.placeholder(dtype=util.tf_dtype('int'), shape=(None,) + tuple(action.shape), name=name)
+                    self.action[name] = self.batch_input(dtype=util.tf_dtype('int'), shape=(None,) + tuple(action.shape), name=name)
 
             # Reward & terminal
-            self.reward = tf.placeholder(dtype=tf.float32, shape=(None,), name='reward')
-            self.terminal = tf.placeholder(dtype=tf.bool, shape=(None,), name='terminal')
+            self.reward = self.batch_input(dtype=tf.float32, shape=(None,), name='reward')
+            self.terminal = self.batch_input(dtype=tf.bool, shape=(None,), name='terminal')
 
             # Deterministic action flag
             self.deterministic = tf.placeholder(dtype=tf.bool, shape=(), name='deterministic')
@@ -224,9 +250,70 @@ class Model(object):
         else:
             self.optimizer = None
 
+    def batch_input(self, dtype, shape, name):
+        """
+        Creates a placeholder for a batch input. If fused updates are enabled, the input instead
+        defaults to the rows of a staging variable selected by `stage_indices`, and the staging
+        variable is assigned via `stage_inputs`.
+
+        Args:
+            dtype: Input data type
+            shape: Input shape, with batch dimension None
+            name: Input name
+
+        Returns: Input tensor
+
+        """
+        if not self.fused_updates:
+            return tf.placeholder(dtype=dtype, shape=shape, name=name)
+
+        # Staging variables are local, hence neither saved nor synchronized
+        stage_input = tf.placeholder(dtype=dtype, shape=shape, name=(name + '-stage'))
+        staged = tf.Variable(
+            initial_value=tf.zeros(shape=((0,) + tuple(shape[1:])), dtype=dtype),
+            trainable=False,
+            collections=[tf.GraphKeys.LOCAL_VARIABLES],
+            validate_shape=False,
+            name=(name + '-staged')
+        )
+        stage = tf.assign(ref=staged, value=stage_input, validate_shape=False)
+        batch_input = tf.placeholder_with_default(
+            input=tf.gather(params=staged, indices=self.stage_indices),
+            shape=shape,
+            name=name
+        )
+        self.staged_inputs[batch_input] = (stage_input, stage)
+        return batch_input
+
+    def stage_inputs(self, feed_dict):
+        """
+        Assigns the values of staged batch inputs to their staging variables in one session call.
+
+        Args:
+            feed_dict: Dict of batch inputs to values
+
+        Returns: Dict of the remaining inputs which are not staged
+
+        """
+        fetches = list()
+        stage_feed_dict = dict()
+        remaining = dict()
+        for batch_input, value in feed_dict.items():
+            if batch_input in self.staged_inputs:
+                stage_input, stage = self.staged_inputs[batch_input]
+                fetches.append(stage.op)
+                stage_feed_dict[stage_input] = value
+            else:
+                remaining[batch_input] = value
+        if fetches:
+            self.session.run(fetches=fetches, feed_dict=stage_feed_dict)
+        return remaining
+
     def set_session(self, session):
         assert self.session is None
         self.session = session
+        if self.writer is not None:
+            self.writer.session = session
 
     def reset(self):
         """
@@ -237,19 +324,34 @@ class Model(object):
         return list(self.internal_inits)
 
     def get_action(self, state, internal, deterministic=False):
-        self.timestep += 1
+        actions, internals = self.get_actions(states=(state,), internals=(internal,), deterministic=deterministic)
+        return actions[0], internals[0]
+
+    def get_actions(self, states, internals, deterministic=False):
+        """
+        Computes actions for a batch of independent states in a single session call.
+
+        Args:
+            states: List of state dicts
+            internals: List of internal state lists, one per state
+            deterministic: Whether to select deterministic actions
+
+        Returns: List of action dicts and list of internal state lists
+
+        """
+        self.timestep += len(states)
         fetches = {action: action_taken for action, action_taken in self.action_taken.items()}
         fetches.update({n: internal_output for n, internal_output in enumerate(self.internal_outputs)})
 
-        feed_dict = {state_input: (state[name],) for name, state_input in self.state.items()}
-        feed_dict.update({internal_input: (internal[n],) for n, internal_input in enumerate(self.internal_inputs)})
+        feed_dict = {state_input: [state[name] for state in states] for name, state_input in self.state.items()}
+        feed_dict.update({internal_input: [internal[n] for internal in internals] for n, internal_input in enumerate(self.internal_inputs)})
         feed_dict[self.deterministic] = deterministic
 
         fetched = self.session.run(fetches=fetches, feed_dict=feed_dict)
 
-        action = {name: fetched[name][0] for name in self.action}
-        internal = [fetched[n][0] for n in range(len(self.internal_outputs))]
-        return action, internal
+        actions = [{name: fetched[name][k] for name in self.action} for k in range(len(states))]
+        internals = [[fetched[n][k] for n in range(len(self.internal_outputs))] for k in range(len(states))]
+        return actions, internals
 
     def update(self, batch):
         """Generic batch update operation for Q-learning and policy gradient algorithms.
@@ -264,8 +366,64 @@ class Model(object):
         if self.optimizer is None:
             return
 
-        fetches = [self.optimize, self.loss, self.loss_per_instance]
         feed_dict = self.update_feed_dict(batch=batch)
+        return self.optimization_step(feed_dict=feed_dict, terminals=batch['terminals'])
+
+    def update_many(self, batches):
+        """
+        Performs one optimization step per batch, equivalent to calling `update` for each batch.
+        If fused updates are enabled, all batches are staged in a single session call and each
+        optimization step only feeds row indices and inputs which cannot be staged.
+
+        Args:
+            batches: List of batches of experiences.
+
+        Returns: Lists of per-step losses and losses per instance.
+
+        """
+        if self.optimizer is None:
+            return
+
+        feed_dicts = [self.update_feed_dict(batch=batch) for batch in batches]
+
+        if self.fused_updates:
+            # Inputs are staged if they contain one row per instance in every batch
+            batch_input = next(iter(self.state.values()))
+            sizes = [len(feed_dict[batch_input]) for feed_dict in feed_dicts]
+            staged = [
+                batch_input for batch_input in feed_dicts[0] if batch_input in self.staged_inputs and
+                all(len(feed_dict[batch_input]) == size for feed_dict, size in zip(feed_dicts, sizes))
+            ]
+            self.stage_inputs(feed_dict={
+                batch_input: np.concatenate([feed_dict[batch_input] for feed_dict in feed_dicts]) for batch_input in staged
+            })
+            offsets = np.cumsum([0] + sizes)
+            for n, feed_dict in enumerate(feed_dicts):
+                for batch_input in staged:
+                    feed_dict.pop(batch_input)
+                feed_dict[self.stage_indices] = np.arange(offsets[n], offsets[n + 1])
+
+        losses = list()
+        losses_per_instance = list()
+        for batch, feed_dict in zip(batches, feed_dicts):
+            loss, loss_per_instance = self.optimization_step(feed_dict=feed_dict, terminals=batch['terminals'])
+            losses.append(loss)
+            losses_per_instance.append(loss_per_instance)
+
+        return losses, losses_per_instance
+
+    def optimization_step(self, feed_dict, terminals):
+        """
+        Runs a single optimization step, writing summaries if required.
+
+        Args:
+            feed_dict: Update feed dict.
+            terminals: Terminals of the batch.
+
+        Returns: Loss and loss per instance.
+
+        """
+        fetches = [self.optimize, self.loss, self.loss_per_instance]
 
         # check if we should write summaries
         write_summaries = self.should_write_summaries(self.timestep)
@@ -274,9 +432,10 @@ class Model(object):
             fetches.append(self.tf_summaries)
 
         if self.distributed:
-            fetches.extend(self.increment_global_episode for terminal in batch['terminals'] if terminal)
+            fetches.extend(self.increment_global_episode for terminal in terminals if terminal)
 
         returns = self.session.run(fetches=fetches, feed_dict=feed_dict)
+        self.updates += 1
         loss, loss_per_instance = returns[1:3]
         if write_summaries:
             self.write_summaries(returns[3])
@@ -293,9 +452,49 @@ class Model(object):
         feed_dict.update({internal: batch['internals'][n] for n, internal in enumerate(self.internal_inputs)})
         return feed_dict
 
+    def get_state(self):
+        """
+        Returns the complete model state, i.e. counters and the values of all variables including
+        optimizer slots, fetched in a single session call.
+
+        Returns: Dict of the model state, for `set_state`.
+
+        """
+        with self.session.graph.as_default():
+            variables = tf.global_variables()
+        values = self.session.run(fetches=variables)
+        return dict(
+            timestep=self.timestep,
+            updates=self.updates,
+            variables={variable.name: value for variable, value in zip(variables, values)}
+        )
+
+    def set_state(self, state):
+        """
+        Restores a model state returned by `get_state`, assigning all variables in a single
+        session call.
+
+        Args:
+            state: Model state dict
+
+        """
+        with self.session.graph.as_default():
+            variables = tf.global_variables()
+        missing = [variable.name for variable in variables if variable.name not in state['variables']]
+        if missing:
+            raise TensorForceError("Model state misses variables {}.".format(', '.join(missing)))
+        # Assigns all variables in one call by feeding their initializer values
+        fetches = [variable.initializer for variable in variables]
+        feed_dict = {variable.initializer.inputs[1]: state['variables'][variable.name] for variable in variables}
+        self.session.run(fetches=fetches, feed_dict=feed_dict)
+        self.timestep = state['timestep']
+        self.updates = state['updates']
+
     def load_model(self, path):
         """
-        Import model from path using tf.train.Saver.
+        Import model from path using tf.train.Saver. Checkpoints written by a `CheckpointManager`
+        (`.npz` files) are restored by assigning the variable values instead, the timestep is not
+        part of these checkpoints and remains unchanged.
 
         Args:
             path: Path to checkpoint
@@ -303,7 +502,12 @@ class Model(object):
         Returns:
 
         """
-        self.saver.restore(self.session, path)
+        if path.endswith('.npz'):
+            with np.load(path) as checkpoint:
+                variables = {name: checkpoint[name] for name in checkpoint.files}
+            self.set_state(state=dict(timestep=self.timestep, updates=self.updates, variables=variables))
+        else:
+            self.saver.restore(self.session, path)
 
     def save_model(self, path, use_global_step=True):
         """
@@ -324,13 +528,60 @@ class Model(object):
             self.saver.save(self.session, path)
 
 
+    def create_inference_spec(self):
+        """
+        Creates the specification of the network and action heads required for deterministic
+        action selection. Models supporting `export_inference` override this method.
+
+        Returns: Specification dict and dict of weight names to variables.
+
+        """
+        raise TensorForceError('Model {} does not support inference export.'.format(self.__class__.__name__))
+
+    def export_inference(self, path, spec=None):
+        """
+        Export the weights and layer specification required for deterministic action selection
+        to a single `.npz` file, which can be loaded and executed without TensorFlow by
+        `tensorforce.inference.InferencePolicy`.
+
+        Args:
+            path: Export file path
+            spec: Optional dict of additional specification values
+
+        Returns:
+
+        """
+        inference_spec, weights = self.inference_snapshot(spec=spec)
+        weights['__spec__'] = np.array(json.dumps(inference_spec))
+        np.savez(path, **weights)
+
+    def inference_snapshot(self, spec=None):
+        """
+        Fetches the current weights required for deterministic action selection in a single
+        session call, as used by `tensorforce.inference.InferencePolicy(spec, weights)`.
+
+        Args:
+            spec: Optional dict of additional specification values
+
+        Returns: Specification dict and dict of weight names to arrays.
+
+        """
+        inference_spec, variables = self.create_inference_spec()
+        inference_spec['states'] = {name: list(util.shape(state)[1:]) for name, state in self.state.items()}
+        inference_spec['epsilon'] = util.epsilon
+        if spec is not None:
+            inference_spec.update(spec)
+
+        names = sorted(variables)
+        values = self.session.run(fetches=[variables[name] for name in names])
+        return inference_spec, dict(zip(names, values))
+
     def should_write_summaries(self, num_updates):
         return self.writer is not None and self.timestep > self.last_summary_step + self.summary_interval
 
     def write_summaries(self, summaries):
-        self.writer.add_summary(summaries, global_step=self.timestep)
+        self.writer.add_summary(summaries, step=self.timestep)
 
     def write_episode_reward_summary(self, episode_reward):
         if self.writer is not None:
-            reward_summary = self.session.run(self.episode_reward_summary, feed_dict={self.tf_episode_reward: episode_reward})
-            self.writer.add_summary(reward_summary, global_step=self.timestep)
+            self.writer.add_scalar(tag='episode-reward', value=episode_reward, step=self.timestep)
@@ -21,15 +21,18 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import copy
+
 import numpy as np
 import tensorflow as tf
 
-from tensorforce import util
+from tensorforce import util, TensorForceError
 from tensorforce.core.distributions.beta import Beta
 from tensorforce.models import Model
 from tensorforce.core.networks import NeuralNetwork
-from tensorforce.core.baselines import Baseline
+from tensorforce.core.baselines import Baseline, CombinedBaseline, NetworkBaseline
 from tensorforce.core.distributions import Distribution, Categorical, Gaussian
+from tensorforce.core.optimizers import NaturalGradient
 
 
 class PolicyGradientModel(Model):
@@ -39,9 +42,12 @@ class PolicyGradientModel(Model):
 
     A Policy Gradient Model expects the following additional configuration parameters:
 
-    * `baseline`: string indicating the baseline value function (currently 'linear' or 'mlp').
+    * `baseline`: string indicating the baseline value function (currently 'linear', 'mlp', 'cnn' or
+      'network', a value head on the policy network).
     * `baseline_args`: list of arguments for the baseline value function.
     * `baseline_kwargs`: dict of keyword arguments for the baseline value function.
+    * `combined_baseline`: boolean indicating whether the baselines of all state inputs are predicted
+      and trained together, requires a TensorFlow baseline.
     * `gae_rewards`: boolean indicating whether to use GAE reward estimation.
     * `gae_lambda`: GAE lambda.
     * `normalize_rewards`: boolean indicating whether to normalize rewards.
@@ -49,6 +55,7 @@ class PolicyGradientModel(Model):
     """
     default_config = dict(
         baseline=None,
+        combined_baseline=False,
         gae_rewards=False,
         gae_lambda=0.97,
         normalize_rewards=False
@@ -80,6 +87,12 @@ class PolicyGradientModel(Model):
             self.baseline = dict()
             for name, state in config.states:
                 self.baseline[name] = Baseline.from_config(config=config.baseline)
+                if isinstance(self.baseline[name], NetworkBaseline):
+                    # A single value head on the policy network covers all state inputs
+                    self.baseline = self.baseline[name]
+                    break
+            if config.combined_baseline:
+                self.baseline = CombinedBaseline(baselines=self.baseline)
 
         # advantage estimation
         self.gae_rewards = config.gae_rewards
@@ -91,6 +104,9 @@ class PolicyGradientModel(Model):
     def create_tf_operations(self, config):
         super(PolicyGradientModel, self).create_tf_operations(config)
 
+        # Distributions before creating their operations, copied for additional policy passes
+        self.distribution_templates = {name: copy.deepcopy(distribution) for name, distribution in self.distribution.items()}
+
         with tf.variable_scope('value_function'):
             network_builder = util.get_function(fct=config.network)
             self.network = NeuralNetwork(network_builder=network_builder, inputs=self.state)
@@ -104,19 +120,102 @@ class PolicyGradientModel(Model):
                     distribution.create_tf_operations(x=self.network.output, deterministic=self.deterministic)
                 self.action_taken[action] = distribution.sample()
 
-        if self.baseline:
+        if isinstance(self.baseline, NetworkBaseline):
+            with tf.variable_scope('baseline'):
+                # The value loss is part of the model loss if the model optimizes its loss
+                self.baseline.create_tf_operations(
+                    x=self.network.output,
+                    returns=self.batch_input(dtype=tf.float32, shape=(None,), name='returns'),
+                    network_variables=self.network.variables,
+                    joint_loss=(self.optimizer is not None or config.global_model)
+                )
+        elif isinstance(self.baseline, CombinedBaseline):
+            self.baseline.create_tf_operations(config.states, scope='baseline')
+        elif self.baseline:
             with tf.variable_scope('baseline'):
                 # Generate one baseline per state input, later average their predictions
                 for name, state in config.states:
                     self.baseline[name].create_tf_operations(state, scope='baseline_' + name)
 
+        scope = tf.get_variable_scope()
+        self.fn_kl_divergence = (lambda fisher_subsample=1.0: self.create_kl_divergence(
+            config=config,
+            scope=scope,
+            fisher_subsample=fisher_subsample
+        ))
+        if isinstance(self.optimizer, NaturalGradient):
+            self.optimizer_args = dict(fn_kl_divergence=self.fn_kl_divergence)
+
+    def create_kl_divergence(self, config, scope, fisher_subsample=1.0):
+        """
+        Creates the KL divergence per instance between the fixed and the current policy, whose
+        Hessian is the Fisher information matrix. For a subsample of the batch, the policy network
+        and distributions are evaluated a second time on the subsampled states only, so
+        Fisher-vector products do not backpropagate through the full batch.
+
+        Args:
+            config: Model configuration
+            scope: Variable scope of the policy network and distributions
+            fisher_subsample: Fraction of the batch
+
+        Returns: KL divergence per instance
+
+        """
+        if fisher_subsample < 1.0:
+            if self.network.internal_inputs:
+                raise TensorForceError("Fisher subsampling is not supported for networks with internal states.")
+            indices = NaturalGradient.subsample_indices(
+                batch_size=tf.shape(input=self.reward)[0],
+                fisher_subsample=fisher_subsample
+            )
+            states = {name: tf.gather(params=state, indices=indices) for name, state in self.state.items()}
+
+            # Regularization losses of the second pass would duplicate those of the policy network
+            losses = tf.get_collection_ref(tf.GraphKeys.LOSSES)
+            num_losses = len(losses)
+            network_builder = util.get_function(fct=config.network)
+            distributions = dict()
+            with tf.variable_scope(scope, reuse=True):
+                with tf.variable_scope('value_function'):
+                    network = NeuralNetwork(network_builder=network_builder, inputs=states)
+                with tf.variable_scope('distribution'):
+                    for name, distribution in self.distribution_templates.items():
+                        distribution = copy.deepcopy(distribution)
+                        with tf.variable_scope(name):
+                            distribution.create_tf_operations(x=network.output, deterministic=self.deterministic)
+                        distributions[name] = distribution
+            del losses[num_losses:]
+        else:
+            distributions = self.distribution
+
+        kl_divergences = list()
+        for name, distribution in distributions.items():
+            fixed_distribution = distribution.__class__.from_tensors(
+                tensors=[tf.stop_gradient(x) for x in distribution.get_tensors()],
+                deterministic=self.deterministic
+            )
+            kl_divergence = fixed_distribution.kl_divergence(other=distribution)
+            kl_divergence = tf.reshape(tensor=kl_divergence, shape=(-1, util.prod(config.actions[name].shape)))
+            kl_divergences.append(kl_divergence)
+        return tf.reduce_mean(input_tensor=tf.concat(values=kl_divergences, axis=1), axis=1)
+
     def set_session(self, session):
         super(PolicyGradientModel, self).set_session(session)
 
-        if self.baseline is not None:
+        if isinstance(self.baseline, (NetworkBaseline, CombinedBaseline)):
+            self.baseline.session = session
+        elif self.baseline is not None:
             for baseline in self.baseline.values():
                 baseline.session = session
 
+    def create_inference_spec(self):
+        network, variables = self.network.inference_spec()
+        actions = dict()
+        for name, distribution in self.distribution.items():
+            actions[name], distribution_variables = distribution.inference_spec()
+            variables.update(distribution_variables)
+        return dict(network=network, actions=actions), variables
+
     def update(self, batch):
         """Generic policy gradient update on a batch of experiences. Each model needs to update its specific
         logic.
@@ -130,24 +229,80 @@ class PolicyGradientModel(Model):
         batch['rewards'], discounted_rewards = self.reward_estimation(
             states=batch['states'],
             rewards=batch['rewards'],
-            terminals=batch['terminals']
+            terminals=batch['terminals'],
+            internals=batch['internals']
         )
         if self.baseline:
-            for name, state in batch['states'].items():
-                self.baseline[name].update(
-                    states=state,
-                    returns=discounted_rewards
-                )
+            batch['returns'] = discounted_rewards
+            self.update_baseline(states=batch['states'], returns=discounted_rewards, internals=batch['internals'])
 
         super(PolicyGradientModel, self).update(batch)
 
-    def reward_estimation(self, states, rewards, terminals):
+    def update_feed_dict(self, batch):
+        feed_dict = super(PolicyGradientModel, self).update_feed_dict(batch=batch)
+        if isinstance(self.baseline, NetworkBaseline) and self.baseline.optimize is None:
+            feed_dict[self.baseline.returns] = batch['returns']
+        return feed_dict
+
+    def network_feed_dict(self, states, internals=None):
+        feed_dict = {state_input: states[name] for name, state_input in self.state.items()}
+        if internals is not None:
+            feed_dict.update({internal_input: internals[n] for n, internal_input in enumerate(self.network.internal_inputs)})
+        return feed_dict
+
+    def predict_baseline(self, states, internals=None):
+        """
+        Predicts state values as the mean over the baselines of all state inputs.
+
+        Args:
+            states: Dict of state batches
+            internals: Internal states of the policy network, required for a network baseline
+
+        Returns: State values
+
+        """
+        if isinstance(self.baseline, NetworkBaseline):
+            return self.baseline.predict(states=self.network_feed_dict(states=states, internals=internals))
+        elif isinstance(self.baseline, CombinedBaseline):
+            return self.baseline.predict(states=states)
+
+        state_values = list()
+        for name, state in states.items():
+            state_value = self.baseline[name].predict(states=state)
+            state_values.append(state_value)
+        return np.mean(state_values, axis=0)
+
+    def update_baseline(self, states, returns, internals=None):
+        """
+        Fits the baselines of all state inputs to returns.
+
+        Args:
+            states: Dict of state batches
+            returns: Returns for states
+            internals: Internal states of the policy network, required for a network baseline
+
+        """
+        if isinstance(self.baseline, NetworkBaseline):
+            self.baseline.update(states=self.network_feed_dict(states=states, internals=internals), returns=returns)
+            return
+        elif isinstance(self.baseline, CombinedBaseline):
+            self.baseline.update(states=states, returns=returns)
+            return
+
+        for name, state in states.items():
+            self.baseline[name].update(
+                states=state,
+                returns=returns
+            )
+
+    def reward_estimation(self, states, rewards, terminals, internals=None):
         """Process rewards according to the configuration.
 
         Args:
             states:
             rewards:
             terminals:
+            internals: Internal states of the policy network, required for a network baseline
 
         Returns:
 
@@ -159,16 +314,15 @@ class PolicyGradientModel(Model):
         )
 
         if self.baseline:
-            state_values = list()
-            for name, state in states.items():
-                state_value = self.baseline[name].predict(states=state)
-                state_values.append(state_value)
-
-            state_values = np.mean(state_values, axis=0)
+            state_values = self.predict_baseline(states=states, internals=internals)
 
             if self.gae_rewards:
-                td_residuals = rewards + np.array(
-                    [self.discount * state_values[n + 1] - state_values[n] if (n < len(state_values) - 1 and not terminal) else 0.0 for n, terminal in enumerate(terminals)])
+                td_residuals = util.gae_td_residuals(
+                    rewards=rewards,
+                    terminals=terminals,
+                    state_values=state_values,
+                    discount=self.discount
+                )
                 rewards = util.cumulative_discount(
                     values=td_residuals,
                     terminals=terminals,
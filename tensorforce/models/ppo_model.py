@@ -22,10 +22,10 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import numpy as np
 import tensorflow as tf
 from six.moves import xrange
 from tensorforce import util
-from tensorforce.core.memories import Replay
 from tensorforce.models import PolicyGradientModel
 
 
@@ -38,17 +38,17 @@ class PPOModel(PolicyGradientModel):
         loss_clipping=0.2,  # Trust region clipping
         epochs=10,  # Number of training epochs for SGD,
         optimizer_batch_size=128,  # Batch size for optimiser
-        random_sampling=True  # Sampling strategy for replay memory
+        random_sampling=True  # Shuffle instances each epoch, otherwise minibatches are sequential
     )
 
     def __init__(self, config):
         config.default(PPOModel.default_config)
+        # Epoch data is staged in variables once per update, unless distributed
+        config.default(dict(fused_updates=not ('distributed' in config and config.distributed)))
         super(PPOModel, self).__init__(config)
         self.optimizer_batch_size = config.optimizer_batch_size
-        # Use replay memory so memory logic can be used to sample batches
-
-        self.updates = int(config.batch_size / self.optimizer_batch_size) * config.epochs
-        self.memory = Replay(config.batch_size, config.states, config.actions, config.random_sampling)
+        self.epochs = config.epochs
+        self.random_sampling = config.random_sampling
 
     def create_tf_operations(self, config):
         """
@@ -134,55 +134,71 @@ class PPOModel(PolicyGradientModel):
         batch['rewards'], discounted_rewards = self.reward_estimation(
             states=batch['states'],
             rewards=batch['rewards'],
-            terminals=batch['terminals']
-        )
-        if self.baseline:
-            self.baseline.update(
-                states=batch['states'],
-                returns=discounted_rewards
-            )
-
-        # Set memory contents to batch contents
-        self.memory.set_memory(
-            states=batch['states'],
-            actions=batch['actions'],
-            rewards=batch['rewards'],
             terminals=batch['terminals'],
             internals=batch['internals']
         )
-
-        # PPO takes multiple passes over the on-policy batch.
-        # We use a memory sampling random ranges (as opposed to keeping
-        # track of indices and e.g. first taking elems 0-15, then 16-32, etc).
-        for i in xrange(self.updates):
+        if self.baseline:
+            batch['returns'] = discounted_rewards
+            self.update_baseline(states=batch['states'], returns=discounted_rewards, internals=batch['internals'])
+
+        # PPO takes multiple passes over the on-policy batch. The batch is staged once, afterwards
+        # minibatches are selected in-graph by feeding their indices
+        feed_dict = self.update_feed_dict(batch=batch)
+        if self.fused_updates:
+            feed_dict = self.stage_inputs(feed_dict=feed_dict)
+        feed_dict = {batch_input: np.asarray(value) for batch_input, value in feed_dict.items()}
+
+        batch_size = len(batch['rewards'])
+        minibatches = list()
+        for _ in xrange(self.epochs):
+            minibatches.extend(self.epoch_minibatches(batch_size=batch_size))
+        updates = len(minibatches)
+
+        # Fetch the distribution before the update on the full batch, minibatches feed their slices
+        full_feed_dict = dict(feed_dict)
+        if self.fused_updates:
+            full_feed_dict[self.stage_indices] = np.arange(batch_size)
+        prev_distribution_tensors = self.session.run(fetches=self.distribution_tensors, feed_dict=full_feed_dict)
+
+        for i, indices in enumerate(minibatches):
             self.logger.debug('Optimising PPO, update = {}'.format(i))
-            batch = self.memory.get_batch(self.optimizer_batch_size)
-
-            feed_dict = {state: batch['states'][name] for name, state in self.state.items()}
-            feed_dict.update({action: batch['actions'][name] for name, action in self.action.items()})
-            feed_dict[self.reward] = batch['rewards']
-            feed_dict[self.terminal] = batch['terminals']
-            feed_dict.update({internal: batch['internals'][n] for n, internal in enumerate(self.internal_inputs)})
-
-            if i == 0:  # First update, fetch previous distribution tensors
-                assert self.updates >= 2
-                assert 'optimize' not in self.distribution_tensors
-                fetches = dict(optimize=self.optimize)
-                fetches.update(self.distribution_tensors)
-                prev_distribution_tensors = self.session.run(fetches=fetches, feed_dict=feed_dict)
-                prev_distribution_tensors.pop('optimize')
-
-            elif i == self.updates - 1:  # Last update, fetch return and diagnostics values
+            minibatch_feed_dict = {batch_input: value.take(indices, axis=0) for batch_input, value in feed_dict.items()}
+            if self.fused_updates:
+                minibatch_feed_dict[self.stage_indices] = indices
+
+            if i == updates - 1:  # Last update, fetch return and diagnostics values
                 fetches = (self.optimize, self.loss, self.loss_per_instance, self.kl_divergence, self.entropy)
-                prev_distribution_tensors = {placeholder: tensor for name, placeholders in self.prev_distribution_tensors.items() for placeholder, tensor in zip(placeholders, prev_distribution_tensors[name])}
-                feed_dict.update(prev_distribution_tensors)
-                loss, loss_per_instance, kl_divergence, entropy = self.session.run(fetches=fetches, feed_dict=feed_dict)[1:]
+                minibatch_feed_dict.update({
+                    placeholder: tensor.take(indices, axis=0)
+                    for name, placeholders in self.prev_distribution_tensors.items()
+                    for placeholder, tensor in zip(placeholders, prev_distribution_tensors[name])
+                })
+                loss, loss_per_instance, kl_divergence, entropy = self.session.run(fetches=fetches, feed_dict=minibatch_feed_dict)[1:]
 
             else:  # Otherwise just optimize
-                self.session.run(fetches=self.optimize, feed_dict=feed_dict)
+                self.session.run(fetches=self.optimize, feed_dict=minibatch_feed_dict)
+            self.updates += 1
 
         self.logger.debug('Loss = {}'.format(loss))
         self.logger.debug('KL divergence = {}'.format(kl_divergence))
         self.logger.debug('Entropy = {}'.format(entropy))
 
         return loss, loss_per_instance
+
+    def epoch_minibatches(self, batch_size):
+        """
+        Splits the batch indices into minibatches for one epoch, so that each instance is used
+        exactly once per epoch.
+
+        Args:
+            batch_size: Size of the on-policy batch
+
+        Returns: List of minibatch indices
+
+        """
+        if self.random_sampling:
+            indices = np.random.permutation(batch_size)
+        else:
+            indices = np.arange(batch_size)
+        num_minibatches = max(batch_size // self.optimizer_batch_size, 1)
+        return np.array_split(indices, num_minibatches)
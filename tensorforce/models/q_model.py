@@ -21,15 +21,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 import tensorflow as tf
 
-from tensorforce import util
+from tensorforce import TensorForceError, util
 from tensorforce.models import Model
 from tensorforce.core.networks import NeuralNetwork
 
 
 class QModel(Model):
 
+    allows_target_value_cache = True
+
     default_config = dict(
         target_update_frequency=10000,
         update_target_weight=1.0,
@@ -45,6 +48,7 @@ class QModel(Model):
         config.default(QModel.default_config)
         self.last_target_update = 0
         self.target_update_frequency = config.target_update_frequency
+        self.target_version = 0
         super(QModel, self).__init__(config)
 
         # Synchronise target with training network
@@ -57,7 +61,7 @@ class QModel(Model):
         with tf.variable_scope('placeholder'):
             self.next_state = dict()
             for name, state in config.states.items():
-                self.next_state[name] = tf.placeholder(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=('next_' + name))
+                self.next_state[name] = self.batch_input(dtype=util.tf_dtype(state.type), shape=(None,) + tuple(state.shape), name=('next_' + name))
 
         network_builder = util.get_function(fct=config.network)
 
@@ -149,6 +153,9 @@ class QModel(Model):
             feed_dict[self.terminal] = batch['terminals']
             feed_dict.update({internal: batch['internals'][n] for n, internal in enumerate(self.internal_inputs)})
             feed_dict.update({internal: batch['next_internals'][n] for n, internal in enumerate(self.next_internal_inputs, self.network_internal_index)})
+            if batch.get('target_values') is not None:
+                # Cached target values replace the target network forward pass
+                feed_dict.update({target_value: batch['target_values'][name] for name, target_value in self.target_values.items()})
         else:
             # if 'next_states' not explicitly given, assume temporally consistent sequence
             feed_dict = {state: batch['states'][name][:-1] for name, state in self.state.items()}
@@ -160,9 +167,55 @@ class QModel(Model):
             feed_dict.update({internal: batch['internals'][n][1:] for n, internal in enumerate(self.next_internal_inputs, self.network_internal_index)})
         return feed_dict
 
-    def update(self, *args, **kwargs):
+    def update(self, batch):
+        self.possible_update_target()
+        if 'target_versions' in batch:
+            self.update_target_values(batch=batch)
+        return super(QModel, self).update(batch)
+
+    def update_many(self, batches):
         self.possible_update_target()
-        return super(QModel, self).update(*args, **kwargs)
+        for batch in batches:
+            if 'target_versions' in batch:
+                self.update_target_values(batch=batch)
+        return super(QModel, self).update_many(batches)
+
+    def update_target_values(self, batch):
+        """
+        Computes the target values of batch instances whose cached values are missing or stem
+        from a previous target network version, and updates the batch accordingly.
+
+        Args:
+            batch: Batch with next states, cached target values and target versions
+
+        """
+        if not self.allows_target_value_cache:
+            raise TensorForceError("Model {} does not support cached target values.".format(self.__class__.__name__))
+
+        stale = np.nonzero(batch['target_versions'] != self.target_version)[0]
+        if len(stale) == 0:
+            return
+
+        feed_dict = {next_state: batch['next_states'][name].take(stale, axis=0) for name, next_state in self.next_state.items()}
+        feed_dict.update({internal: batch['next_internals'][n].take(stale, axis=0) for n, internal in enumerate(self.next_internal_inputs, self.network_internal_index)})
+        target_values = self.session.run(fetches=self.target_values, feed_dict=feed_dict)
+
+        if batch['target_values'] is None:
+            batch['target_values'] = {name: np.zeros((len(batch['target_versions']),) + value.shape[1:], dtype=value.dtype) for name, value in target_values.items()}
+        for name, value in target_values.items():
+            batch['target_values'][name][stale] = value
+        batch['target_versions'][stale] = self.target_version
+
+    def get_state(self):
+        state = super(QModel, self).get_state()
+        state['last_target_update'] = self.last_target_update
+        state['target_version'] = self.target_version
+        return state
+
+    def set_state(self, state):
+        super(QModel, self).set_state(state=state)
+        self.last_target_update = state['last_target_update']
+        self.target_version = state['target_version']
 
     def possible_update_target(self, force=False):
         """
@@ -172,3 +225,5 @@ class QModel(Model):
         if self.timestep > self.last_target_update + self.target_update_frequency or force:
             self.last_target_update = self.timestep
             self.session.run(self.target_network_update)
+            # Invalidates all cached target values
+            self.target_version += 1
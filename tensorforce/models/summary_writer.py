@@ -0,0 +1,110 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+TensorBoard summary writer. Scalar summaries are built directly as protocol buffers, file I/O
+happens on the event writer thread of `tf.summary.FileWriter`, and variable histograms are
+computed by a timer thread on a fixed time interval independent of model updates.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import logging
+import threading
+
+import tensorflow as tf
+
+
+class SummaryWriter(object):
+
+    def __init__(self, logdir, graph=None, histograms=None, histogram_interval=60.0):
+        """
+        Creates a summary writer.
+
+        Args:
+            logdir: Summary directory
+            graph: Optional graph to write
+            histograms: Optional merged histogram summary tensor, evaluated every
+                `histogram_interval` seconds by a timer thread once a session is set
+            histogram_interval: Seconds between histogram summaries
+        """
+        # The file writer already queues events and writes them on its own thread
+        self.writer = tf.summary.FileWriter(logdir, graph=graph)
+        self.histograms = histograms
+        self.histogram_interval = histogram_interval
+        self.session = None
+        self.step = 0
+
+        self.logger = logging.getLogger(__name__)
+
+        self.stop = threading.Event()
+        if histograms is None:
+            self.thread = None
+        else:
+            self.thread = threading.Thread(target=self._write_histograms)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def add_summary(self, summary, step):
+        """
+        Schedules writing a serialized summary.
+
+        Args:
+            summary: Serialized `tf.Summary` as returned by a session call
+            step: Global step
+        """
+        self.step = step
+        self.writer.add_summary(summary, global_step=step)
+
+    def add_scalar(self, tag, value, step):
+        """
+        Schedules writing a scalar summary, without requiring a session call.
+
+        Args:
+            tag: Summary tag
+            value: Scalar value
+            step: Global step
+        """
+        self.step = step
+        summary = tf.Summary(value=[tf.Summary.Value(tag=tag, simple_value=float(value))])
+        self.writer.add_summary(summary, global_step=step)
+
+    def flush(self):
+        """
+        Blocks until all scheduled summaries are written.
+        """
+        self.writer.flush()
+
+    def close(self):
+        """
+        Stops the histogram timer thread and writes all scheduled summaries.
+        """
+        self.stop.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.writer.close()
+
+    def _write_histograms(self):
+        while not self.stop.wait(timeout=self.histogram_interval):
+            if self.session is None:
+                continue
+            try:
+                self.writer.add_summary(self.session.run(self.histograms), global_step=self.step)
+            except Exception as error:
+                # E.g. the session was closed, stop histogram summaries
+                self.logger.warning('Stopping histogram summaries: {}'.format(error))
+                return
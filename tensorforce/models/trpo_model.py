@@ -27,12 +27,15 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import copy
+
 import numpy as np
 import tensorflow as tf
 
 from tensorforce import util
 from tensorforce.models import PolicyGradientModel
-from tensorforce.core.optimizers import ConjugateGradientOptimizer
+from tensorforce.core.networks import NeuralNetwork
+from tensorforce.core.optimizers import NaturalGradient
 
 
 class TRPOModel(PolicyGradientModel):
@@ -45,19 +48,21 @@ class TRPOModel(PolicyGradientModel):
         max_kl_divergence=0.1,
         cg_iterations=20,
         cg_damping=0.001,
+        fisher_subsample=1.0,
         ls_max_backtracks=10,
         ls_accept_ratio=0.9,
-        ls_override=False
+        ls_override=False,
+        ls_batched=False
     )
 
     def __init__(self, config):
         config.default(TRPOModel.default_config)
         super(TRPOModel, self).__init__(config)
         self.max_kl_divergence = config.max_kl_divergence
-        self.cg_damping = config.cg_damping
         self.ls_max_backtracks = config.ls_max_backtracks
         self.ls_accept_ratio = config.ls_accept_ratio
         self.ls_override = config.ls_override
+        self.ls_batched = config.ls_batched
 
     def create_tf_operations(self, config):
         """
@@ -70,7 +75,6 @@ class TRPOModel(PolicyGradientModel):
         with tf.variable_scope('update'):
             log_probs = list()
             prob_ratios = list()
-            kl_divs = list()
 
             # for diagnostics
             kl_divergences = list()
@@ -97,10 +101,6 @@ class TRPOModel(PolicyGradientModel):
                 prob_ratio = tf.exp(x=log_prob_diff)
                 prob_ratios.append(prob_ratio)
 
-                kl_div = fixed_distribution.kl_divergence(other=distribution)
-                kl_div = tf.reshape(tensor=kl_div, shape=(-1, shape_size))
-                kl_divs.append(kl_div)
-
                 self.distribution_tensors[name] = list(distribution.get_tensors())
                 prev_distribution = list(tf.placeholder(dtype=tf.float32, shape=util.shape(tensor, unknown=None)) for tensor in distribution.get_tensors())
                 self.prev_distribution_tensors[name] = prev_distribution
@@ -120,8 +120,6 @@ class TRPOModel(PolicyGradientModel):
             self.loss_per_instance = -prob_ratio * self.reward
             self.surrogate_loss = tf.reduce_mean(input_tensor=self.loss_per_instance, axis=0)
 
-            kl_div = tf.reduce_mean(input_tensor=tf.concat(values=kl_divs, axis=1), axis=1)
-
             # Get symbolic gradient expressions
             variables = list(tf.trainable_variables())  # TODO: ideally not value function (see also for "gradients" below)
             gradients = tf.gradients(self.surrogate_loss, variables)
@@ -130,23 +128,21 @@ class TRPOModel(PolicyGradientModel):
             gradients = [grad for grad in gradients if grad is not None]
             self.policy_gradient = tf.concat(values=[tf.reshape(grad, (-1,)) for grad in gradients], axis=0)  # util.prod(util.shape(v))
 
-            self.tangent = tf.placeholder(tf.float32, shape=(None,))
-            offset = 0
-            tangents = []
-            for variable in variables:
-                shape = util.shape(variable)
-                size = util.prod(shape)
-                tangents.append(tf.reshape(self.tangent[offset:offset + size], shape))
-                offset += size
-
-            gradients = tf.gradients(kl_div, variables)
-            gradient_vector_product = [tf.reduce_sum(g * t) for (g, t) in zip(gradients, tangents)]
-
             self.flat_variable_helper = FlatVarHelper(variables)
-            gradients = tf.gradients(gradient_vector_product, variables)
-            self.fisher_vector_product = tf.concat(values=[tf.reshape(grad, (-1,)) for grad in gradients], axis=0)
 
-            self.cg_optimizer = ConjugateGradientOptimizer(self.logger, config.cg_iterations)
+            # Conjugate gradient solution x = F^(-1) * -dL computed in-graph, where F is the Fisher
+            # matrix given by the Hessian of the KL divergence
+            self.natural_gradient = NaturalGradient(
+                cg_iterations=config.cg_iterations,
+                cg_damping=config.cg_damping,
+                fisher_subsample=config.fisher_subsample,
+                variables=variables
+            )
+            self.search_direction, self.shs = self.natural_gradient.solve(
+                gradient=-self.policy_gradient,
+                kl_divergence=self.fn_kl_divergence,
+                variables=variables
+            )
 
             kl_divergence = tf.reduce_mean(input_tensor=tf.concat(values=kl_divergences, axis=1), axis=1)
             self.kl_divergence = tf.reduce_mean(input_tensor=kl_divergence, axis=0)
@@ -154,6 +150,58 @@ class TRPOModel(PolicyGradientModel):
             entropy = tf.reduce_mean(input_tensor=tf.concat(values=entropies, axis=1), axis=1)
             self.entropy = tf.reduce_mean(input_tensor=entropy, axis=0)
 
+        if config.ls_batched:
+            self.create_line_search_operations(config=config, variables=variables, distributions=self.distribution_templates)
+
+    def create_line_search_operations(self, config, variables, distributions):
+        """
+        Creates the batched line search, which evaluates the surrogate objective for all
+        backtracking step fractions in one session call. Each candidate is a copy of the policy
+        whose variables are offset by the scaled natural gradient step, so the variables
+        themselves are only assigned once the accepted step is known.
+
+        Args:
+            config: Model configuration
+            variables: Policy variables updated by the natural gradient step
+            distributions: Copies of the distributions before their operations were created
+        """
+        self.natural_gradient_step = tf.placeholder(dtype=tf.float32, shape=(None,))
+        steps = NaturalGradient.unflatten(vector=self.natural_gradient_step, variables=variables)
+        steps = {variable.name: step for variable, step in zip(variables, steps)}
+
+        def candidate_getter(step_fraction):
+            def getter(getter, name, *args, **kwargs):
+                variable = getter(name, *args, **kwargs)
+                if variable.name in steps:
+                    return variable + step_fraction * steps[variable.name]
+                return variable
+            return getter
+
+        network_builder = util.get_function(fct=config.network)
+        self.ls_internal_inputs = list()
+        values = list()
+        for backtrack in range(config.ls_max_backtracks):
+            custom_getter = candidate_getter(step_fraction=(0.5 ** backtrack))
+            with tf.variable_scope(tf.get_variable_scope(), reuse=True, custom_getter=custom_getter):
+                with tf.variable_scope('value_function'):
+                    network = NeuralNetwork(network_builder=network_builder, inputs=self.state)
+                    self.ls_internal_inputs.append(network.internal_inputs)
+
+                log_probs = list()
+                with tf.variable_scope('distribution'):
+                    for name, distribution in distributions.items():
+                        distribution = copy.deepcopy(distribution)
+                        with tf.variable_scope(name):
+                            distribution.create_tf_operations(x=network.output, deterministic=self.deterministic)
+                        log_prob = distribution.log_probability(action=self.action[name])
+                        log_probs.append(tf.reshape(tensor=log_prob, shape=(-1, util.prod(config.actions[name].shape))))
+
+            log_prob = tf.reduce_mean(input_tensor=tf.concat(values=log_probs, axis=1), axis=1)
+            prob_ratio = tf.exp(x=(log_prob - self.log_prob))
+            values.append(tf.reduce_mean(input_tensor=(prob_ratio * self.reward), axis=0))
+
+        self.ls_values = tf.stack(values=values)
+
     def set_session(self, session):
         super(TRPOModel, self).set_session(session)
         self.flat_variable_helper.session = session
@@ -168,8 +216,13 @@ class TRPOModel(PolicyGradientModel):
         """
         super(TRPOModel, self).update(batch)
 
-        assert 'policy_gradient' not in self.distribution_tensors
-        fetches = dict(policy_gradient=self.policy_gradient)
+        assert not {'policy_gradient', 'search_direction', 'shs', 'parameters'} & set(self.distribution_tensors)
+        fetches = dict(
+            policy_gradient=self.policy_gradient,
+            search_direction=self.search_direction,
+            shs=self.shs,
+            parameters=self.flat_variable_helper.get_op
+        )
         fetches.update(self.distribution_tensors)
 
         self.feed_dict = {state: batch['states'][name] for name, state in self.state.items()}
@@ -178,8 +231,12 @@ class TRPOModel(PolicyGradientModel):
         self.feed_dict[self.terminal] = batch['terminals']
         self.feed_dict.update({internal: batch['internals'][n] for n, internal in enumerate(self.internal_inputs)})
 
-        prev_distribution_tensors = self.session.run(fetches=fetches, feed_dict=self.feed_dict)  # dL
-        gradient = prev_distribution_tensors.pop('policy_gradient')
+        # Gradient, conjugate gradient solution and current parameters in a single call
+        prev_distribution_tensors = self.session.run(fetches=fetches, feed_dict=self.feed_dict)
+        gradient = prev_distribution_tensors.pop('policy_gradient')  # dL
+        search_direction = prev_distribution_tensors.pop('search_direction')  # x = ddKL(=F)^(-1) * -dL
+        shs = prev_distribution_tensors.pop('shs')  # (c lambda^2) = 0.5 * xT * F * x
+        parameters = prev_distribution_tensors.pop('parameters')
 
         if np.allclose(gradient, np.zeros_like(gradient)):
             self.logger.debug('Gradient zero, skipping update.')
@@ -187,13 +244,9 @@ class TRPOModel(PolicyGradientModel):
 
         # The details of the approximations used here to solve the constrained
         # optimisation can be found in Appendix C of the TRPO paper
-        # Note that no subsampling is used, which would improve computational performance
-        search_direction = self.cg_optimizer.solve(self.compute_fvp, -gradient)  # x = ddKL(=F)^(-1) * -dL
-
-        # Search direction has now been approximated as cg-solution s= A^-1g where A is
+        # Search direction has been approximated as cg-solution s= A^-1g where A is
         # Fisher matrix, which is a local approximation of the
         # KL divergence constraint
-        shs = 0.5 * search_direction.dot(self.compute_fvp(search_direction))  # (c lambda^2) = 0.5 * xT * F * x
         if shs < 0:
             self.logger.debug('Computing search direction failed, skipping update.')
             return
@@ -205,8 +258,11 @@ class TRPOModel(PolicyGradientModel):
 
         # Improve update step through simple backtracking line search
         # N.b. some implementations skip the line search
-        parameters = self.flat_variable_helper.get()
-        new_parameters = self.line_search(
+        if self.ls_batched:
+            line_search = self.batched_line_search
+        else:
+            line_search = self.line_search
+        new_parameters = line_search(
             rewards=batch['rewards'],
             parameters=parameters,
             natural_gradient_step=natural_gradient_step,
@@ -218,12 +274,15 @@ class TRPOModel(PolicyGradientModel):
         if new_parameters is not None:
             self.logger.debug('Updating with line search result.')
             self.flat_variable_helper.set(new_parameters)
+            self.updates += 1
         elif self.ls_override:
             self.logger.debug('Updating with full step.')
             self.flat_variable_helper.set(parameters + natural_gradient_step)
+            self.updates += 1
         else:
             self.logger.debug('Failed to find line search solution, skipping update.')
-            self.flat_variable_helper.set(parameters)
+            if not self.ls_batched:
+                self.flat_variable_helper.set(parameters)
 
         # Get loss values for progress monitoring
         fetches = (self.surrogate_loss, self.kl_divergence, self.entropy, self.loss_per_instance)
@@ -239,10 +298,6 @@ class TRPOModel(PolicyGradientModel):
 
         return (surrogate_loss, kl_divergence, entropy), loss_per_instance
 
-    def compute_fvp(self, p):
-        self.feed_dict[self.tangent] = p
-        return self.session.run(self.fisher_vector_product, self.feed_dict) + p * self.cg_damping
-
     def compute_log_prob(self, theta):
         self.flat_variable_helper.set(theta)
         return self.session.run(self.log_prob, self.feed_dict)
@@ -282,6 +337,39 @@ class TRPOModel(PolicyGradientModel):
 
         return None
 
+    def batched_line_search(self, rewards, parameters, natural_gradient_step, estimated_improvement):
+        """
+        Line search for TRPO which evaluates all backtracking steps in a single session call
+        without assigning the variables, and returns the largest accepted step.
+
+        :param rewards:
+        :param parameters:
+        :param natural_gradient_step:
+        :param estimated_improvement:
+
+        :return:
+        """
+        feed_dict = dict(self.feed_dict)
+        feed_dict[self.natural_gradient_step] = natural_gradient_step
+        for internal_inputs in self.ls_internal_inputs:
+            feed_dict.update({internal: self.feed_dict[network_internal] for internal, network_internal in zip(internal_inputs, self.network.internal_inputs)})
+        new_values = self.session.run(fetches=self.ls_values, feed_dict=feed_dict)
+
+        old_value = sum(rewards) / len(rewards)
+        estimated_improvement = max(estimated_improvement, util.epsilon)
+
+        step_fraction = 1.0
+        for backtrack, new_value in enumerate(new_values):
+            improvement_ratio = (new_value - old_value) / estimated_improvement
+            if improvement_ratio > self.ls_accept_ratio:
+                self.logger.debug('Line search successful after {} backtracking steps.'.format(backtrack))
+                return parameters + step_fraction * natural_gradient_step
+
+            step_fraction /= 2.0
+            estimated_improvement /= 2.0
+
+        return None
+
 
 class FlatVarHelper(object):
 
@@ -0,0 +1,149 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Actor-critic with V-trace off-policy correction (Espeholt et al., 2018). Batches consist of
+fixed-length trajectories, possibly generated by a slightly stale behaviour policy, and the
+V-trace targets are computed in-graph.
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+import tensorflow as tf
+
+from tensorforce import util, TensorForceError
+from tensorforce.core.networks import layers
+from tensorforce.models import PolicyGradientModel
+
+
+class VTraceModel(PolicyGradientModel):
+    """
+    V-trace actor-critic model. A batch consists of trajectories of `trajectory_length + 1`
+    consecutive timesteps, the last timestep of each trajectory only provides the bootstrap state.
+    Behaviour log probabilities can be given as `behaviour_log_probs` batch entry, otherwise the
+    batch is assumed to be on-policy.
+
+    A V-trace model expects the following additional configuration parameters:
+
+    * `trajectory_length`: number of timesteps per trajectory.
+    * `rho_clip`: truncation of importance ratios in the temporal differences.
+    * `c_clip`: truncation of importance ratios in the trace.
+    * `value_loss_weight`: weight of the value loss.
+    * `entropy_penalty`: weight of the entropy regularization.
+
+    """
+
+    allows_discrete_actions = True
+    allows_continuous_actions = True
+
+    default_config = dict(
+        trajectory_length=20,
+        rho_clip=1.0,
+        c_clip=1.0,
+        value_loss_weight=0.5,
+        entropy_penalty=0.01
+    )
+
+    def __init__(self, config):
+        config.default(VTraceModel.default_config)
+        config.default(dict(baseline=None))
+        if config.baseline is not None:
+            raise TensorForceError("V-trace model has its own value head and does not support a baseline.")
+        super(VTraceModel, self).__init__(config)
+        self.trajectory_length = config.trajectory_length
+
+    def create_tf_operations(self, config):
+        super(VTraceModel, self).create_tf_operations(config)
+
+        with tf.variable_scope('state_value'):
+            self.state_value = tf.squeeze(input=layers['linear'](x=self.network.output, size=1), axis=1)
+
+        with tf.variable_scope('update'):
+            self.behaviour_log_probability = self.batch_input(dtype=tf.float32, shape=(None,), name='behaviour-log-probability')
+            self.on_policy = tf.placeholder_with_default(input=False, shape=(), name='on-policy')
+
+            log_probs = list()
+            entropies = list()
+            for name, action in self.action.items():
+                shape_size = util.prod(config.actions[name].shape)
+                distribution = self.distribution[name]
+                log_prob = distribution.log_probability(action=action)
+                log_probs.append(tf.reshape(tensor=log_prob, shape=(-1, shape_size)))
+                entropy = distribution.entropy()
+                entropies.append(tf.reshape(tensor=entropy, shape=(-1, shape_size)))
+
+            # Joint log probability of all actions, mean entropy
+            log_prob = tf.reduce_sum(input_tensor=tf.concat(values=log_probs, axis=1), axis=1)
+            entropy = tf.reduce_mean(input_tensor=tf.concat(values=entropies, axis=1), axis=1)
+            behaviour_log_prob = tf.where(
+                condition=self.on_policy,
+                x=tf.stop_gradient(input=log_prob),
+                y=self.behaviour_log_probability
+            )
+
+            def trajectories(tensor):
+                return tf.reshape(tensor=tensor, shape=(-1, config.trajectory_length + 1))
+
+            # The last timestep of each trajectory is only used for its state value
+            values = trajectories(self.state_value)
+            log_prob = trajectories(log_prob)[:, :-1]
+            log_rhos = log_prob - trajectories(behaviour_log_prob)[:, :-1]
+            rewards = trajectories(self.reward)[:, :-1]
+            terminals = tf.cast(x=trajectories(self.terminal)[:, :-1], dtype=tf.float32)
+
+            vs, advantages = util.tf_vtrace(
+                log_rhos=tf.stop_gradient(input=log_rhos),
+                discounts=(self.discount * (1.0 - terminals)),
+                rewards=rewards,
+                values=tf.stop_gradient(input=values),
+                rho_clip=config.rho_clip,
+                c_clip=config.c_clip
+            )
+
+            policy_loss = -log_prob * advantages
+            value_loss = 0.5 * tf.square(x=(vs - values[:, :-1]))
+            entropy_penalty = -trajectories(entropy)[:, :-1]
+            loss = policy_loss + config.value_loss_weight * value_loss + config.entropy_penalty * entropy_penalty
+
+            self.loss_per_instance = tf.reshape(
+                tensor=tf.concat(values=(loss, tf.zeros_like(tensor=values[:, -1:])), axis=1),
+                shape=(-1,)
+            )
+            tf.losses.add_loss(tf.reduce_mean(input_tensor=loss))
+
+    def update(self, batch):
+        """
+        V-trace update on a batch of trajectories. Unlike other policy gradient models, rewards
+        are not estimated beforehand, since the V-trace targets are computed in-graph.
+
+        Args:
+            batch: Batch of trajectories, optionally with behaviour log probabilities
+
+        Returns: Loss and loss per instance.
+
+        """
+        return super(PolicyGradientModel, self).update(batch)
+
+    def update_feed_dict(self, batch):
+        feed_dict = super(VTraceModel, self).update_feed_dict(batch=batch)
+        if 'behaviour_log_probs' in batch:
+            feed_dict[self.behaviour_log_probability] = batch['behaviour_log_probs']
+        else:
+            feed_dict[self.behaviour_log_probability] = np.zeros(shape=(len(batch['rewards']),))
+            feed_dict[self.on_policy] = True
+        return feed_dict
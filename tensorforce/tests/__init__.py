@@ -13,5 +13,31 @@
 # limitations under the License.
 # ==============================================================================
 
+import numpy as np
+
+from tensorforce.inference import InferencePolicy
+
 # Pass thresholds for all tests
 reward_threshold = 0.8
+
+
+def policy_reward(agent, environment, deterministic=True, timesteps=100):
+    """
+    Mean reward per timestep of the policy of an agent with a single state and action, evaluated
+    via its inference policy, for runners whose actors always explore.
+    """
+    spec, weights = agent.inference_snapshot()
+    policy = InferencePolicy(spec=spec, weights=weights)
+    state = environment.reset()
+    reward = 0.0
+    for _ in range(timesteps):
+        if deterministic:
+            action = policy.act(state=state)
+        else:
+            actions, _, _ = policy.sample(states={policy.state_name: np.expand_dims(state, axis=0)})
+            action = actions['action'][0]
+        state, step_reward, terminal = environment.execute(action=action)
+        reward += step_reward
+        if terminal:
+            state = environment.reset()
+    return reward / timesteps
@@ -0,0 +1,76 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from functools import partial
+import unittest
+from six.moves import xrange
+
+import numpy as np
+
+from tensorforce import Configuration
+from tensorforce.agents import DQNAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import ApeXRunner
+from tensorforce.execution.apex_runner import SumTree
+from tensorforce.tests import policy_reward, reward_threshold
+
+
+class TestApeXRunner(unittest.TestCase):
+
+    def test_sum_tree(self):
+        tree = SumTree(capacity=5)
+        tree.update(indices=np.arange(5), priorities=np.array([1.0, 0.0, 0.0, 0.0, 3.0]))
+        self.assertEqual(tree.total, 4.0)
+        samples = tree.sample(batch_size=1000)
+        self.assertTrue(set(samples) <= {0, 4})
+        self.assertTrue(200 < np.sum(samples == 0) < 300)
+
+    def test_discrete(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                first_update=80,
+                target_update_frequency=20,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = DQNAgent(config=config)
+            runner = ApeXRunner(agent=agent, environment_fn=partial(MinimalTest, definition=False), num_actors=2, memory_capacity=800)
+
+            def episode_finished(r):
+                # Actors always explore, hence the learner is evaluated deterministically
+                environment = MinimalTest(definition=False)
+                return r.episode % 20 != 0 or policy_reward(agent=r.agent, environment=environment) < reward_threshold
+
+            runner.run(updates=5000, episode_finished=episode_finished)
+            print('Ape-X runner: ' + str(runner.updates))
+            if runner.updates < 5000:
+                passed += 1
+
+        print('Ape-X runner passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
@@ -0,0 +1,110 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import sys
+import threading
+import time
+import unittest
+from six.moves import xrange
+
+from tensorforce import Configuration
+from tensorforce.agents import VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.tests import reward_threshold
+
+
+class LatencyTest(MinimalTest):
+    """
+    Minimal test environment with artificial latency, which records the maximum number of
+    concurrently executing steps.
+    """
+
+    lock = threading.Lock()
+    executing = 0
+    max_executing = 0
+
+    def __init__(self, definition, latency):
+        super(LatencyTest, self).__init__(definition=definition)
+        self.latency = latency
+
+    def execute(self, action):
+        with LatencyTest.lock:
+            LatencyTest.executing += 1
+            LatencyTest.max_executing = max(LatencyTest.max_executing, LatencyTest.executing)
+        time.sleep(self.latency)
+        with LatencyTest.lock:
+            LatencyTest.executing -= 1
+        return super(LatencyTest, self).execute(action=action)
+
+
+def create_agents(environments):
+    agents = list()
+    model = None
+    for environment in environments:
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = VPGAgent(config=config, model=model)
+        model = agent.model
+        agents.append(agent)
+    return agents
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "AsyncRunner requires Python 3.5+")
+class TestAsyncRunner(unittest.TestCase):
+
+    def test_concurrent_steps(self):
+        from tensorforce.execution import AsyncRunner
+
+        LatencyTest.max_executing = 0
+        environments = [LatencyTest(definition=False, latency=0.01) for _ in xrange(4)]
+        runner = AsyncRunner(agents=create_agents(environments), environments=environments)
+        runner.run(episodes=20)
+
+        self.assertEqual(runner.episode, 20)
+        self.assertEqual(len(runner.episode_rewards), 20)
+        self.assertGreater(LatencyTest.max_executing, 1)
+
+    def test_discrete(self):
+        from tensorforce.execution import AsyncRunner
+
+        passed = 0
+
+        for _ in xrange(5):
+            environments = [LatencyTest(definition=False, latency=0.001) for _ in xrange(4)]
+            runner = AsyncRunner(agents=create_agents(environments), environments=environments)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1500, episode_finished=episode_finished)
+            print('Async runner (discrete): ' + str(runner.episode))
+            if runner.episode < 1500:
+                passed += 1
+
+        print('Async runner (discrete) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
@@ -0,0 +1,100 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from tensorforce import Configuration
+from tensorforce.agents import DQNAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import CheckpointManager, Runner
+
+
+class TestCheckpointManager(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            memory_capacity=800,
+            first_update=80,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32)
+            ])
+        )
+        self.agent = DQNAgent(config=config)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_restore(self):
+        manager = CheckpointManager(model=self.agent.model, directory=self.directory, keep_last=2)
+        values = self.agent.model.session.run(fetches=manager.variables)
+
+        for step in range(4):
+            manager.save(step=step)
+        manager.wait()
+        self.assertEqual(sorted(os.listdir(self.directory)), ['checkpoint-2.npz', 'checkpoint-3.npz'])
+
+        self.agent.model.session.run(tf.global_variables_initializer())
+        self.assertEqual(manager.restore(), os.path.join(self.directory, 'checkpoint-3.npz'))
+        for value, restored in zip(values, self.agent.model.session.run(fetches=manager.variables)):
+            self.assertTrue(np.all(value == restored))
+
+        manager.close()
+
+    def test_load_model(self):
+        manager = CheckpointManager(model=self.agent.model, directory=self.directory)
+        values = self.agent.model.session.run(fetches=manager.variables)
+        path = manager.save(step=0)
+        manager.close()
+
+        # Checkpoints are restored by the agent without the manager
+        self.agent.model.session.run(tf.global_variables_initializer())
+        self.agent.load_model(path)
+        for value, restored in zip(values, self.agent.model.session.run(fetches=manager.variables)):
+            self.assertTrue(np.all(value == restored))
+
+    def test_runner_failure(self):
+        environment = MinimalTest(definition=False)
+        runner = Runner(
+            agent=self.agent,
+            environment=environment,
+            save_path=os.path.join(self.directory, 'checkpoint'),
+            save_episodes=1,
+            save_async=True
+        )
+
+        def episode_finished(r):
+            raise RuntimeError()
+
+        # The scheduled checkpoint is written and the manager closed although the run fails
+        self.assertRaises(RuntimeError, runner.run, episodes=10, episode_finished=episode_finished)
+        self.assertIsNone(runner.checkpoint_manager)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
@@ -0,0 +1,96 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from functools import partial
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from tensorforce.execution import DistributedLauncher
+
+
+def listen_task(cluster_spec, task_index, directory):
+    """
+    Listens on the task port like a TensorFlow server. Workers fail on their first attempt and
+    finish after a few seconds on the second one.
+    """
+    if task_index == -1:
+        address = cluster_spec.as_dict()['ps'][0]
+    else:
+        address = cluster_spec.as_dict()['worker'][task_index]
+    host, port = address.split(':')
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, int(port)))
+    sock.listen(5)
+
+    def accept():
+        try:
+            while True:
+                connection, _ = sock.accept()
+                connection.close()
+        except socket.error:
+            pass
+
+    if task_index == -1:
+        accept()
+
+    thread = threading.Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+
+    marker = os.path.join(directory, 'worker-{}'.format(task_index))
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        sys.exit(1)
+    time.sleep(2.0)
+
+    # Like a finished worker, close the server some time before exiting
+    sock.shutdown(socket.SHUT_RDWR)
+    sock.close()
+    time.sleep(1.0)
+
+
+class TestDistributedLauncher(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_restart(self):
+        launcher = DistributedLauncher(
+            task_fn=partial(listen_task, directory=self.directory),
+            num_workers=2,
+            health_interval=0.2,
+            startup_timeout=30.0,
+            exit_timeout=5.0,
+            logdir=os.path.join(self.directory, 'logs')
+        )
+        launcher.run(timeout=60.0)
+
+        self.assertEqual(len(set(launcher.cluster['worker'] + launcher.cluster['ps'])), 3)
+        self.assertEqual(launcher.restarts, {'ps': 0, 'worker-0': 1, 'worker-1': 1})
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, 'logs', 'worker-0.log')))
@@ -20,6 +20,7 @@ from __future__ import division
 from six.moves import xrange
 
 import unittest
+import numpy as np
 
 from tensorforce import Configuration
 from tensorforce.agents import DQFDAgent
@@ -143,3 +144,107 @@ class TestDQFDAgent(unittest.TestCase):
 
         print('DQFD agent (multi-state/action) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
+
+    def test_mixed_batch(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                memory_capacity=800,
+                first_update=80,
+                target_update_frequency=20,
+                demo_memory_capacity=100,
+                demo_sampling_ratio=0.2,
+                demo_mixed_batch=True,
+                memory=dict(
+                    type='replay',
+                    random_sampling=True
+                ),
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = DQFDAgent(config=config)
+
+            # First generate demonstration data and pretrain
+            demonstrations = list()
+            terminal = True
+
+            for n in xrange(50):
+                if terminal:
+                    state = environment.reset()
+                action = 1
+                state, reward, terminal = environment.execute(action=action)
+                demonstration = dict(state=state, action=action, reward=reward, terminal=terminal, internal=[])
+                demonstrations.append(demonstration)
+
+            agent.import_demonstrations(demonstrations)
+            agent.pretrain(steps=1000)
+
+            # Normal training with mixed demo and online batches
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1000, episode_finished=episode_finished)
+            print('DQFD agent (mixed batch): ' + str(runner.episode))
+            if runner.episode < 1000:
+                passed += 1
+
+        print('DQFD agent (mixed batch) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
+    def test_mixed_batch_cached_target_values(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            memory_capacity=800,
+            first_update=20,
+            target_update_frequency=20,
+            demo_memory_capacity=100,
+            demo_sampling_ratio=0.2,
+            demo_mixed_batch=True,
+            memory=dict(
+                type='replay',
+                random_sampling=True,
+                cache_target_values=True
+            ),
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQFDAgent(config=config)
+
+        demonstrations = list()
+        terminal = True
+        for n in xrange(50):
+            if terminal:
+                state = environment.reset()
+            state, reward, terminal = environment.execute(action=1)
+            demonstrations.append(dict(state=state, action=1, reward=reward, terminal=terminal, internal=[]))
+        agent.import_demonstrations(demonstrations)
+
+        runner = Runner(agent=agent, environment=environment)
+        runner.run(episodes=50)
+
+        # Target values computed by mixed updates are written back to the replay memory
+        self.assertTrue(np.any(agent.memory.target_versions >= 0))
+
+        # The mixed batch carries the online cache, demo samples have no cached values
+        batch = agent.memory.get_batch(batch_size=8, next_states=True)
+        demo_batch = agent.demo_memory.get_batch(batch_size=2, next_states=True)
+        mixed_batch = DQFDAgent.mix_batches(batch=batch, demo_batch=demo_batch)
+        self.assertTrue(np.all(mixed_batch['indices'] == batch['indices']))
+        self.assertTrue(np.all(mixed_batch['target_versions'][:8] == batch['target_versions']))
+        self.assertTrue(np.all(mixed_batch['target_versions'][8:] == -1))
@@ -19,6 +19,8 @@ from __future__ import division
 
 import unittest
 from six.moves import xrange
+import numpy as np
+import tensorflow as tf
 
 
 from tensorforce import Configuration
@@ -150,3 +152,81 @@ class TestDQNAgent(unittest.TestCase):
 
         print('DQN agent (LSTM) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
+
+    def test_fused_updates(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                memory_capacity=800,
+                first_update=80,
+                target_update_frequency=20,
+                repeat_update=4,
+                fused_updates=True,
+                memory=dict(
+                    type='replay',
+                    random_sampling=True
+                ),
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = DQNAgent(config=config)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:],
+                                                                                            r.episode_lengths[-100:]))
+
+            runner.run(episodes=1000, episode_finished=episode_finished)
+            print('DQN agent (fused updates): ' + str(runner.episode))
+            if runner.episode < 1000:
+                passed += 1
+
+        print('DQN agent (fused updates) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
+    def test_update_many(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            memory_capacity=800,
+            first_update=80,
+            target_update_frequency=100000,
+            repeat_update=4,
+            fused_updates=True,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQNAgent(config=config)
+        runner = Runner(agent=agent, environment=environment)
+        runner.run(episodes=20)
+
+        model = agent.model
+        batches = [agent.memory.get_batch(batch_size=8, next_states=True) for _ in xrange(4)]
+        with model.session.graph.as_default():
+            variables = tf.trainable_variables()
+        state = model.get_state()
+
+        # Staged optimization steps are equivalent to separate updates
+        fused_losses, _ = model.update_many(batches=batches)
+        fused_values = model.session.run(fetches=variables)
+        model.set_state(state=state)
+        losses = [model.update(batch=batch)[0] for batch in batches]
+        values = model.session.run(fetches=variables)
+
+        self.assertEqual(len(fused_losses), 4)
+        self.assertTrue(np.allclose(fused_losses, losses, atol=1e-5))
+        for fused_value, value in zip(fused_values, values):
+            self.assertTrue(np.allclose(fused_value, value, atol=1e-5))
@@ -19,9 +19,10 @@ from __future__ import division
 
 import unittest
 from six.moves import xrange
+import numpy as np
 
 
-from tensorforce import Configuration
+from tensorforce import Configuration, util
 from tensorforce.agents import DQNNstepAgent
 from tensorforce.core.networks import layered_network_builder, layers
 from tensorforce.environments.minimal_test import MinimalTest
@@ -98,3 +99,42 @@ class TestDQNNstepAgent(unittest.TestCase):
 
         print('DQN Nstep agent (multi-state/action) passed = {}'.format(passed))
         self.assertTrue(passed >= 2)
+
+    def test_nstep_rewards(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            discount=0.9,
+            learning_rate=0.001,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQNNstepAgent(config=config)
+        model = agent.model
+
+        # Eight transitions and the bootstrap state, with episodes ending within the batch
+        batch = dict(
+            states={name: np.random.randn(*((9,) + tuple(state.get_shape().as_list()[1:]))) for name, state in model.state.items()},
+            actions={name: np.zeros((9,) + tuple(action.get_shape().as_list()[1:]), dtype=np.int32) for name, action in model.action.items()},
+            rewards=np.random.randn(9),
+            terminals=np.array([False, False, True, False, False, False, True, False, False]),
+            internals=[]
+        )
+        feed_dict = model.update_feed_dict(batch=batch)
+
+        for name in model.action:
+            nstep_rewards, target_values = model.session.run(
+                fetches=(model.nstep_rewards[name], model.target_values[name]),
+                feed_dict=feed_dict
+            )
+            expected = util.cumulative_discount(
+                values=batch['rewards'][:-1],
+                terminals=batch['terminals'][:-1],
+                discount=0.9,
+                cumulative_start=target_values[0]
+            )
+            self.assertTrue(np.allclose(nstep_rewards, expected, atol=1e-5))
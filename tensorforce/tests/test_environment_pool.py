@@ -0,0 +1,81 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import unittest
+
+import numpy as np
+
+from tensorforce.environments import EnvironmentPool
+from tensorforce.environments.minimal_test import MinimalTest
+
+
+class CrashingTest(MinimalTest):
+
+    def __init__(self):
+        super(CrashingTest, self).__init__(definition=False)
+        self.steps = 0
+
+    def execute(self, action):
+        self.steps += 1
+        if self.steps == 2:
+            os._exit(1)
+        return super(CrashingTest, self).execute(action=action)
+
+
+class TestEnvironmentPool(unittest.TestCase):
+
+    def test_execute(self):
+        pool = EnvironmentPool(environment_fn=(lambda: MinimalTest(definition=False)), num_environments=3)
+        states = pool.reset()
+        self.assertEqual(len(states), 3)
+        self.assertTrue(all(np.allclose(state, (1.0, 0.0)) for state in states))
+
+        results = pool.execute(actions=[1, 1, 0])
+        self.assertTrue(np.allclose(results[0][0], (0.0, 1.0)))
+        self.assertEqual(results[0][1], 1.0)
+        self.assertTrue(np.allclose(results[2][0], (1.0, 0.0)))
+        self.assertEqual(results[2][1], -1.0)
+
+        # Asynchronous step
+        pool.send(index=1, action=1)
+        self.assertEqual(pool.ready(timeout=10.0), [1])
+        state, reward, _ = pool.receive(index=1)
+        self.assertTrue(np.allclose(state, (0.0, 1.0)))
+
+        # Synchronous environment interface
+        environment = pool.environments[2]
+        self.assertTrue(np.allclose(environment.reset(), (1.0, 0.0)))
+        self.assertEqual(environment.states, dict(shape=2, type='float'))
+
+        pool.close()
+        self.assertTrue(all(process is None for process in pool.processes))
+
+    def test_restart(self):
+        pool = EnvironmentPool(environment_fn=CrashingTest, num_environments=2, max_restarts=1)
+        pool.reset()
+        pool.execute(actions=[1, 1])
+
+        # Crashed workers are restarted and the interrupted episode is terminal
+        results = pool.execute(actions=[1, 1])
+        for state, reward, terminal in results:
+            self.assertTrue(np.allclose(state, (1.0, 0.0)))
+            self.assertTrue(terminal)
+        self.assertEqual(pool.restarts, [1, 1])
+        pool.close()
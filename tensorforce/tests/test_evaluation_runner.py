@@ -0,0 +1,64 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from functools import partial
+import unittest
+
+from tensorforce import Configuration
+from tensorforce.agents import VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import EvaluationRunner, Runner
+
+
+class TestEvaluationRunner(unittest.TestCase):
+
+    def test_evaluate(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = VPGAgent(config=config)
+        runner = Runner(agent=agent, environment=environment)
+        evaluation = EvaluationRunner(agent=agent, environment_fn=partial(MinimalTest, definition=False), num_workers=2)
+
+        futures = list()
+
+        def episode_finished(r):
+            if r.episode % 50 == 0:
+                futures.append(evaluation.evaluate(episodes=5, max_timesteps=20))
+            return True
+
+        runner.run(episodes=100, episode_finished=episode_finished)
+        results = [future.result(timeout=60) for future in futures]
+        evaluation.close()
+
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(result['episodes'], 5)
+            self.assertEqual(len(result['episode_lengths']), 5)
+            self.assertTrue(all(0 < length <= 20 for length in result['episode_lengths']))
+        self.assertLess(results[0]['timestep'], results[1]['timestep'])
@@ -0,0 +1,64 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from functools import partial
+import unittest
+from six.moves import xrange
+
+from tensorforce import Configuration
+from tensorforce.agents import VTraceAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import ImpalaRunner
+from tensorforce.tests import policy_reward, reward_threshold
+
+
+class TestImpalaRunner(unittest.TestCase):
+
+    def test_discrete(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                trajectory_length=8,
+                batch_size=36,
+                learning_rate=0.001,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = VTraceAgent(config=config)
+            runner = ImpalaRunner(agent=agent, environment_fn=partial(MinimalTest, definition=False), num_actors=2)
+
+            def episode_finished(r):
+                # Evaluates the current learner policy, since actors use stale weights
+                environment = MinimalTest(definition=False)
+                return r.episode % 20 != 0 or policy_reward(agent=r.agent, environment=environment, deterministic=False) < reward_threshold
+
+            runner.run(updates=1000, episode_finished=episode_finished)
+            print('IMPALA runner: ' + str(runner.updates))
+            if runner.updates < 1000:
+                passed += 1
+
+        print('IMPALA runner passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
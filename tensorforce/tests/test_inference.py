@@ -0,0 +1,181 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from tensorforce import Configuration
+from tensorforce.agents import DQNAgent, VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.inference import InferencePolicy, quantize, quantization_report
+
+
+class TestInference(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assert_same_actions(self, agent, states):
+        path = os.path.join(self.directory, 'policy.npz')
+        agent.export_inference(path)
+        policy = InferencePolicy.load(path)
+
+        agent.reset()
+        policy.reset()
+        for state in states:
+            action = agent.act(state=state, deterministic=True)
+            self.assertTrue(np.allclose(policy.act(state=state), action, atol=1e-5))
+
+    def test_dqn(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            memory_capacity=800,
+            first_update=80,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32, activation='tanh')
+            ])
+        )
+        agent = DQNAgent(config=config)
+        self.assert_same_actions(agent=agent, states=np.random.uniform(size=(20, 2)))
+
+    def test_lstm(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            memory_capacity=800,
+            first_update=80,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='lstm')
+            ])
+        )
+        agent = DQNAgent(config=config)
+        self.assert_same_actions(agent=agent, states=np.random.uniform(size=(20, 2)))
+
+    def test_conv2d(self):
+        config = Configuration(
+            batch_size=8,
+            states=dict(shape=(8, 8, 3)),
+            actions=dict(continuous=False, num_actions=4),
+            network=layered_network_builder([
+                dict(type='conv2d', size=8, window=5, stride=2),
+                dict(type='conv2d', size=8, padding='VALID', bias=True),
+                dict(type='flatten'),
+                dict(type='dense', size=16)
+            ])
+        )
+        agent = VPGAgent(config=config)
+        self.assert_same_actions(agent=agent, states=np.random.uniform(size=(20, 8, 8, 3)))
+
+    def test_gaussian(self):
+        environment = MinimalTest(definition=True)
+        config = Configuration(
+            batch_size=8,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = VPGAgent(config=config)
+        self.assert_same_actions(agent=agent, states=np.random.uniform(size=(20, 2)))
+
+    def test_beta(self):
+        environment = MinimalTest(definition=True)
+        actions = environment.actions
+        actions['min_value'] = -0.5
+        actions['max_value'] = 1.5
+        config = Configuration(
+            batch_size=8,
+            states=environment.states,
+            actions=actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = VPGAgent(config=config)
+        self.assert_same_actions(agent=agent, states=np.random.uniform(size=(20, 2)))
+
+    def test_multi(self):
+        environment = MinimalTest(definition=[(False, 2), (True, 3)])
+        config = Configuration(
+            batch_size=8,
+            states=dict(state=dict(shape=(2,))),
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = VPGAgent(config=config)
+
+        path = os.path.join(self.directory, 'policy.npz')
+        agent.export_inference(path)
+        policy = InferencePolicy.load(path)
+
+        states = np.random.uniform(size=(20, 2))
+        actions, _ = policy.get_action(states=dict(state=states))
+        for n, state in enumerate(states):
+            action = agent.act(state=dict(state=state), deterministic=True)
+            for name in action:
+                self.assertTrue(np.allclose(actions[name][n], action[name], atol=1e-5))
+
+    def test_quantize(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            memory_capacity=800,
+            first_update=80,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQNAgent(config=config)
+
+        path = os.path.join(self.directory, 'policy.npz')
+        agent.export_inference(path)
+        policy = InferencePolicy.load(path)
+
+        quantized = quantize(policy=policy, states=dict(state=np.random.uniform(size=(200, 2))))
+        quantized_path = os.path.join(self.directory, 'policy-int8.npz')
+        quantized.save(quantized_path)
+        quantized = InferencePolicy.load(quantized_path)
+
+        report = quantization_report(reference=policy, policy=quantized, states=dict(state=np.random.uniform(size=(200, 2))))
+        self.assertGreater(report['agreement_rate'], 0.9)
+        self.assertLess(report['quantized_bytes'], report['reference_bytes'])
@@ -0,0 +1,69 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import threading
+import unittest
+
+from tensorforce import Configuration
+from tensorforce.agents import VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import InferenceServer
+
+
+class TestInferenceServer(unittest.TestCase):
+
+    def test_concurrent_requests(self):
+        environment = MinimalTest(definition=False)
+        agents = list()
+        model = None
+        for _ in range(4):
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = VPGAgent(config=config, model=model)
+            model = agent.model
+            agents.append(agent)
+
+        # A long wait lets concurrent requests of all agents form one batch
+        server = InferenceServer(model=model, max_batch_size=4, max_wait=1.0)
+        actions = [list() for _ in agents]
+
+        def act(n):
+            state = environment.reset()
+            for _ in range(10):
+                actions[n].append(server.act(agent=agents[n], state=state))
+
+        threads = [threading.Thread(target=act, args=(n,)) for n in range(len(agents))]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        server.close()
+
+        self.assertEqual(server.requests, 40)
+        self.assertLess(server.batches, server.requests)
+        for n, agent in enumerate(agents):
+            self.assertEqual(len(actions[n]), 10)
+            self.assertEqual(agent.timestep, 10)
@@ -0,0 +1,64 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import unittest
+import numpy as np
+
+from tensorforce.core.baselines import LinearBaseline
+
+
+class TestLinearBaseline(unittest.TestCase):
+
+    def test_incremental(self):
+        random = np.random.RandomState(0)
+        baseline = LinearBaseline()
+        incremental_baseline = LinearBaseline(incremental=True)
+
+        states = random.randn(50, 3)
+        returns = random.randn(50)
+        baseline.update(states=states, returns=returns)
+        incremental_baseline.update(states=states, returns=returns)
+        self.assertTrue(np.allclose(baseline.coefficients, incremental_baseline.coefficients))
+
+        # Incremental statistics equal a full solve over all batches
+        next_states = random.randn(40, 3)
+        next_returns = random.randn(40)
+        incremental_baseline.predict(states=next_states)
+        incremental_baseline.update(states=next_states, returns=next_returns)
+
+        features = np.concatenate([baseline.features(states), baseline.features(next_states)])
+        coefficients = np.linalg.solve(
+            features.T.dot(features) + 2.0 * np.identity(features.shape[1]),
+            features.T.dot(np.concatenate([returns, next_returns]))
+        )
+        self.assertTrue(np.allclose(coefficients, incremental_baseline.coefficients))
+
+    def test_forgetting(self):
+        random = np.random.RandomState(0)
+        baseline = LinearBaseline(incremental=True, forgetting=0.0)
+        baseline.update(states=random.randn(50, 3), returns=random.randn(50))
+
+        states = random.randn(40, 3)
+        returns = random.randn(40)
+        baseline.update(states=states, returns=returns)
+
+        # Without memory, the coefficients only depend on the last batch
+        fresh_baseline = LinearBaseline(incremental=True)
+        fresh_baseline.update(states=states, returns=returns)
+        self.assertTrue(np.allclose(baseline.coefficients, fresh_baseline.coefficients))
@@ -19,6 +19,7 @@ from __future__ import division
 
 import unittest
 from six.moves import xrange
+import numpy as np
 
 from tensorforce import Configuration
 from tensorforce.agents import DQNAgent
@@ -83,3 +84,55 @@ class TestMemoryDQN(unittest.TestCase):
 
         runner.run(episodes=1000, episode_finished=episode_finished)
         print('Prioritized replay memory DQN: ' + str(runner.episode))
+
+    def test_replay_cached_target_values(self):
+        environment = MinimalTest(definition=[(False, (1, 2))])
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            memory_capacity=50,
+            memory=dict(
+                type='replay',
+                random_sampling=True,
+                cache_target_values=True
+            ),
+            first_update=20,
+            target_update_frequency=10,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQNAgent(config=config)
+        self.assertTrue(agent.model.allows_target_value_cache)
+        runner = Runner(agent=agent, environment=environment)
+        runner.run(episodes=50)
+
+        model = agent.model
+        batch = agent.memory.get_batch(batch_size=8, next_states=True)
+        model.update_target_values(batch=batch)
+        self.assertTrue(np.all(batch['target_versions'] == model.target_version))
+
+        # Values of the current target network version are reused
+        for value in batch['target_values'].values():
+            value.fill(-1.0)
+        model.update_target_values(batch=batch)
+        for value in batch['target_values'].values():
+            self.assertTrue(np.all(value == -1.0))
+
+        # A target network update invalidates the cached values
+        target_version = model.target_version
+        model.possible_update_target(force=True)
+        self.assertEqual(model.target_version, target_version + 1)
+        model.update_target_values(batch=batch)
+        self.assertTrue(np.all(batch['target_versions'] == model.target_version))
+        feed_dict = {next_state: batch['next_states'][name] for name, next_state in model.next_state.items()}
+        target_values = model.session.run(fetches=model.target_values, feed_dict=feed_dict)
+        for name, value in batch['target_values'].items():
+            self.assertTrue(np.allclose(value, target_values[name]))
+
+        # The memory caches the values written back by the agent
+        agent.update_target_values(batch=batch)
+        self.assertTrue(np.all(agent.memory.target_versions.take(batch['indices']) == model.target_version))
@@ -0,0 +1,111 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tensorforce import Configuration, TensorForceError
+from tensorforce.agents import PPOAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import MetricsRegistry, PrometheusExporter, JsonLinesExporter, Runner
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_registry(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('steps_total')
+        counter.inc()
+        counter.inc(2)
+        self.assertIs(registry.counter('steps_total'), counter)
+        self.assertRaises(TensorForceError, registry.gauge, 'steps_total')
+
+        gauge = registry.gauge('fill')
+        gauge.set(0.5)
+
+        histogram = registry.histogram('seconds', buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['steps_total']['value'], 3)
+        self.assertEqual(snapshot['fill']['value'], 0.5)
+        self.assertEqual(snapshot['seconds']['value']['counts'], [2, 1, 1])
+        self.assertEqual(snapshot['seconds']['value']['count'], 4)
+        self.assertAlmostEqual(snapshot['seconds']['value']['sum'], 2.65)
+
+    def test_exporters(self):
+        prometheus_path = os.path.join(self.directory, 'metrics.prom')
+        json_path = os.path.join(self.directory, 'metrics.jsonl')
+        registry = MetricsRegistry(
+            exporters=[PrometheusExporter(path=prometheus_path), JsonLinesExporter(path=json_path)],
+            interval=60.0
+        )
+        registry.counter('steps_total', 'Steps').inc(5)
+        registry.histogram('seconds', buckets=(0.1, 1.0)).observe(0.5)
+        registry.export()
+        registry.close()
+
+        with open(prometheus_path) as prometheus_file:
+            lines = prometheus_file.read().splitlines()
+        self.assertIn('# HELP steps_total Steps', lines)
+        self.assertIn('# TYPE steps_total counter', lines)
+        self.assertIn('steps_total 5.0', lines)
+        self.assertIn('seconds_bucket{le="0.1"} 0', lines)
+        self.assertIn('seconds_bucket{le="1.0"} 1', lines)
+        self.assertIn('seconds_bucket{le="+Inf"} 1', lines)
+        self.assertIn('seconds_count 1', lines)
+
+        with open(json_path) as json_file:
+            records = [json.loads(line) for line in json_file]
+        # Explicit export and final export on close
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[-1]['metrics']['steps_total'], 5)
+        self.assertEqual(records[-1]['metrics']['seconds']['counts'], [0, 1, 0])
+
+    def test_ppo_updates(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=20,
+            epochs=2,
+            optimizer_batch_size=10,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([dict(type='dense', size=32)])
+        )
+        agent = PPOAgent(config=config)
+        registry = MetricsRegistry()
+        runner = Runner(agent=agent, environment=environment, metrics=registry)
+        runner.run(episodes=50)
+
+        # PPO updates bypass the generic optimization step, one update per minibatch step
+        updates = (runner.total_timesteps // 20) * 4
+        self.assertEqual(agent.model.updates, updates)
+        self.assertEqual(registry.snapshot()['model_updates_total']['value'], updates)
+        self.assertGreater(updates, 0)
@@ -0,0 +1,54 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import unittest
+import numpy as np
+import tensorflow as tf
+
+from tensorforce import Configuration
+from tensorforce.core.baselines import MLPBaseline
+
+
+class TestMLPBaseline(unittest.TestCase):
+
+    def test_fused_updates(self):
+        random = np.random.RandomState(0)
+        states = random.randn(64, 3)
+        returns = states.dot(np.array([1.0, -2.0, 0.5]))
+
+        with tf.Graph().as_default():
+            baseline = MLPBaseline(sizes=[16], epochs=20, update_batch_size=16, learning_rate=0.01, fused_updates=True)
+            baseline.create_tf_operations(state=Configuration(shape=(3,)))
+            baseline.session = tf.Session()
+            baseline.session.run(tf.global_variables_initializer())
+
+            # One loss per in-graph optimization step
+            losses = baseline.session.run(
+                fetches=baseline.fused_losses,
+                feed_dict={baseline.state: states, baseline.returns: returns, baseline.num_updates: 5}
+            )
+            self.assertEqual(losses.shape, (5,))
+
+            error = np.mean(np.square(baseline.predict(states=states) - returns))
+            for _ in range(5):
+                baseline.update(states=states, returns=returns)
+            fitted_error = np.mean(np.square(baseline.predict(states=states) - returns))
+            baseline.session.close()
+
+        self.assertLess(fitted_error, 0.5 * error)
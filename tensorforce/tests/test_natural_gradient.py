@@ -0,0 +1,72 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import unittest
+from six.moves import xrange
+
+from tensorforce import Configuration, TensorForceError
+from tensorforce.agents import VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.core.optimizers import NaturalGradient
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import Runner
+from tensorforce.tests import reward_threshold
+
+
+class TestNaturalGradient(unittest.TestCase):
+
+    def test_requires_kl_divergence(self):
+        optimizer = NaturalGradient()
+        self.assertRaises(TensorForceError, optimizer.minimize, fn_loss=(lambda: None))
+
+    def test_discrete(self):
+        self.run_vpg(fisher_subsample=1.0)
+
+    def test_fisher_subsample(self):
+        self.run_vpg(fisher_subsample=0.5)
+
+    def run_vpg(self, fisher_subsample):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                optimizer=dict(type='natural_gradient', max_kl_divergence=0.01, fisher_subsample=fisher_subsample),
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32, activation='tanh'),
+                    dict(type='dense', size=32, activation='tanh')
+                ])
+            )
+            agent = VPGAgent(config=config)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1000, episode_finished=episode_finished)
+            print('VPG agent with natural gradient (fisher_subsample={}): {}'.format(fisher_subsample, runner.episode))
+
+            if runner.episode < 1000:
+                passed += 1
+
+        print('VPG agent with natural gradient (fisher_subsample={}) passed = {}'.format(fisher_subsample, passed))
+        self.assertTrue(passed >= 4)
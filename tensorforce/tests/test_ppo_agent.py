@@ -18,6 +18,8 @@ from __future__ import print_function
 from __future__ import division
 
 import unittest
+
+import numpy as np
 from six.moves import xrange
 
 from tensorforce import Configuration
@@ -176,3 +178,71 @@ class TestPPOAgent(unittest.TestCase):
         print('PPO agent (beta) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
 
+    def test_epoch_minibatches(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=25,
+            optimizer_batch_size=10,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([dict(type='dense', size=32)])
+        )
+        agent = PPOAgent(config=config)
+        minibatches = agent.model.epoch_minibatches(batch_size=25)
+
+        # Every instance is used exactly once per epoch
+        self.assertEqual(len(minibatches), 2)
+        self.assertTrue(np.array_equal(np.sort(np.concatenate(minibatches)), np.arange(25)))
+
+    def test_uneven_minibatches(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=25,
+                entropy_penalty=0.01,
+                loss_clipping=0.1,
+                epochs=10,
+                optimizer_batch_size=10,
+                learning_rate=0.0005,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = PPOAgent(config=config)
+            self.assertTrue(agent.model.fused_updates)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:],
+                                                                                            r.episode_lengths[-100:]))
+
+            runner.run(episodes=2000, episode_finished=episode_finished)
+            print('PPO agent (uneven minibatches): ' + str(runner.episode))
+            if runner.episode < 2000:
+                passed += 1
+
+        print('PPO agent (uneven minibatches) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
+    def test_unfused(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=25,
+            epochs=3,
+            optimizer_batch_size=10,
+            random_sampling=False,
+            fused_updates=False,
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([dict(type='dense', size=32)])
+        )
+        agent = PPOAgent(config=config)
+        self.assertFalse(agent.model.fused_updates)
+        runner = Runner(agent=agent, environment=environment)
+        runner.run(episodes=50)
+        self.assertEqual(runner.episode, 50)
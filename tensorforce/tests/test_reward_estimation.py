@@ -19,15 +19,60 @@ from __future__ import division
 
 import unittest
 import numpy as np
+import tensorflow as tf
 
-from tensorforce import Configuration
+from tensorforce import Configuration, util
 from tensorforce.agents import VPGAgent
 from tensorforce.core.networks import layered_network_builder
 from tensorforce.core.baselines import Baseline
 
 
+def loop_cumulative_discount(values, terminals, discount, cumulative_start=0.0):
+    # Reference implementation
+    discounted_values = np.zeros((len(values),) + np.shape(cumulative_start))
+    cumulative = cumulative_start
+    for n, (value, terminal) in reversed(list(enumerate(zip(values, terminals)))):
+        if terminal:
+            cumulative = np.zeros_like(cumulative_start, dtype=np.float64)
+        cumulative = value + cumulative * discount
+        discounted_values[n] = cumulative
+    return discounted_values
+
+
 class TestRewardEstimation(unittest.TestCase):
 
+    def test_cumulative_discount(self):
+        random = np.random.RandomState(0)
+        for _ in range(100):
+            values = random.randn(random.randint(1, 100))
+            terminals = random.uniform(size=values.shape) < 0.1
+            discount = random.uniform()
+
+            result = util.cumulative_discount(values=values, terminals=terminals, discount=discount)
+            expected = loop_cumulative_discount(values=values, terminals=terminals, discount=discount)
+            self.assertTrue((result == expected).all())
+
+            cumulative_start = random.randn(3)
+            result = util.cumulative_discount(values=values, terminals=terminals, discount=discount, cumulative_start=cumulative_start)
+            expected = loop_cumulative_discount(values=values, terminals=terminals, discount=discount, cumulative_start=cumulative_start)
+            self.assertEqual(result.shape, expected.shape)
+            self.assertTrue(np.allclose(result, expected, rtol=1e-12, atol=1e-12))
+
+    def test_tf_cumulative_discount(self):
+        random = np.random.RandomState(0)
+        values = random.randn(100).astype(np.float32)
+        terminals = random.uniform(size=values.shape) < 0.1
+
+        with tf.Graph().as_default():
+            values_input = tf.placeholder(dtype=tf.float32, shape=(None,))
+            terminals_input = tf.placeholder(dtype=tf.bool, shape=(None,))
+            discounted_values = util.tf_cumulative_discount(values=values_input, terminals=terminals_input, discount=0.75, cumulative_start=0.5)
+            with tf.Session() as session:
+                result = session.run(fetches=discounted_values, feed_dict={values_input: values, terminals_input: terminals})
+
+        expected = loop_cumulative_discount(values=values, terminals=terminals, discount=0.75, cumulative_start=0.5)
+        self.assertTrue(np.allclose(result, expected, rtol=1e-5, atol=1e-5))
+
     def test_basic(self):
         config = Configuration(
             discount=0.75,
@@ -0,0 +1,75 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import tensorflow as tf
+
+from tensorforce.models.summary_writer import SummaryWriter
+
+
+class TestSummaryWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.logdir)
+
+    def events(self):
+        events = list()
+        for path in glob.glob(os.path.join(self.logdir, 'events.*')):
+            for event in tf.train.summary_iterator(path):
+                events.extend((value.tag, event.step) for value in event.summary.value)
+        return events
+
+    def test_summaries(self):
+        with tf.Graph().as_default():
+            loss = tf.placeholder(dtype=tf.float32, shape=())
+            summaries = tf.summary.merge(inputs=[tf.summary.scalar(name='loss', tensor=loss)])
+            with tf.Session() as session:
+                writer = SummaryWriter(logdir=self.logdir)
+                writer.add_summary(session.run(summaries, feed_dict={loss: 1.0}), step=1)
+                writer.add_scalar(tag='episode-reward', value=2.0, step=2)
+                writer.flush()
+                self.assertIn(('loss', 1), self.events())
+                self.assertIn(('episode-reward', 2), self.events())
+                writer.close()
+        self.assertIsNone(writer.thread)
+
+    def test_histograms(self):
+        with tf.Graph().as_default():
+            variable = tf.get_variable(name='variable', shape=(4,), dtype=tf.float32)
+            histograms = tf.summary.merge(inputs=[tf.summary.histogram(name='variable', values=variable)])
+            with tf.Session() as session:
+                session.run(tf.global_variables_initializer())
+                writer = SummaryWriter(logdir=self.logdir, histograms=histograms, histogram_interval=0.1)
+                writer.add_scalar(tag='episode-reward', value=1.0, step=5)
+                writer.session = session
+                time.sleep(1.0)
+                writer.close()
+        self.assertFalse(writer.thread.is_alive())
+
+        # Histograms are written at the step of the latest summary
+        self.assertIn(('variable', 5), self.events())
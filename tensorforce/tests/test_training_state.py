@@ -0,0 +1,96 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from tensorforce import Configuration
+from tensorforce.agents import DQNAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import Runner
+
+
+class TestTrainingState(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_runner(self):
+        environment = MinimalTest(definition=False)
+        config = Configuration(
+            batch_size=8,
+            learning_rate=0.001,
+            memory_capacity=800,
+            first_update=80,
+            target_update_frequency=20,
+            memory=dict(
+                type='replay',
+                random_sampling=True
+            ),
+            exploration=dict(
+                type='epsilon_decay',
+                epsilon_timesteps=1000
+            ),
+            preprocessing=[dict(type='sequence', length=2)],
+            states=environment.states,
+            actions=environment.actions,
+            network=layered_network_builder([
+                dict(type='dense', size=32),
+                dict(type='dense', size=32)
+            ])
+        )
+        agent = DQNAgent(config=config)
+        return Runner(agent=agent, environment=environment)
+
+    def test_identical_continuation(self):
+        path = os.path.join(self.directory, 'checkpoint')
+
+        def episode_finished(r):
+            if r.episode == 30:
+                r.checkpoint(directory=path)
+            return True
+
+        runner = self.create_runner()
+        runner.run(episodes=60, episode_finished=episode_finished)
+
+        resumed_runner = self.create_runner()
+        resumed_runner.resume(directory=path)
+        self.assertEqual(resumed_runner.agent.timestep, sum(runner.episode_lengths[:30]))
+        resumed_runner.run(episodes=60)
+
+        self.assertEqual(resumed_runner.episode, 60)
+        self.assertEqual(resumed_runner.episode_rewards, runner.episode_rewards)
+        self.assertEqual(resumed_runner.episode_lengths, runner.episode_lengths)
+        self.assertEqual(resumed_runner.total_timesteps, runner.total_timesteps)
+        self.assertEqual(resumed_runner.agent.model.updates, runner.agent.model.updates)
+        self.assertEqual(resumed_runner.agent.exploration['action'].epsilon, runner.agent.exploration['action'].epsilon)
+        self.assertEqual(len(resumed_runner.agent.memory), len(runner.agent.memory))
+
+        state = runner.agent.model.get_state()
+        resumed_state = resumed_runner.agent.model.get_state()
+        for name, value in state['variables'].items():
+            self.assertTrue(np.allclose(resumed_state['variables'][name], value))
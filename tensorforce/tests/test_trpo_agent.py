@@ -59,6 +59,37 @@ class TestTRPOAgent(unittest.TestCase):
         print('TRPO agent (discrete) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
 
+    def test_batched_line_search(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                ls_batched=True,
+                fisher_subsample=0.5,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32, activation='tanh'),
+                    dict(type='dense', size=32, activation='tanh')
+                ])
+            )
+            agent = TRPOAgent(config=config)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1000, episode_finished=episode_finished)
+            print('TRPO agent (batched line search): ' + str(runner.episode))
+
+            if runner.episode < 1000:
+                passed += 1
+
+        print('TRPO agent (batched line search) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
     def test_continuous(self):
         passed = 0
 
@@ -0,0 +1,111 @@
+# Copyright 2017 reinforce.io. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+from six.moves import xrange
+
+from tensorforce import Configuration
+from tensorforce.agents import VPGAgent
+from tensorforce.core.networks import layered_network_builder
+from tensorforce.environments.minimal_test import MinimalTest
+from tensorforce.execution import VectorizedRunner
+from tensorforce.tests import reward_threshold
+
+
+class TestVectorizedRunner(unittest.TestCase):
+
+    def test_discrete(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environments = [MinimalTest(definition=False) for _ in xrange(4)]
+            agents = list()
+            model = None
+            for environment in environments:
+                config = Configuration(
+                    batch_size=8,
+                    learning_rate=0.001,
+                    states=environment.states,
+                    actions=environment.actions,
+                    network=layered_network_builder([
+                        dict(type='dense', size=32),
+                        dict(type='dense', size=32)
+                    ])
+                )
+                agent = VPGAgent(config=config, model=model)
+                model = agent.model
+                agents.append(agent)
+            runner = VectorizedRunner(agents=agents, environments=environments)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1500, episode_finished=episode_finished)
+            print('Vectorized runner (discrete): ' + str(runner.episode))
+            self.assertEqual(len(runner.episode_rewards), runner.episode)
+
+            if runner.episode < 1500:
+                passed += 1
+
+        print('Vectorized runner (discrete) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
+    def test_save_async(self):
+        directory = tempfile.mkdtemp()
+        environments = [MinimalTest(definition=False) for _ in xrange(2)]
+        agents = list()
+        model = None
+        for environment in environments:
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                states=environment.states,
+                actions=environment.actions,
+                network=layered_network_builder([
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = VPGAgent(config=config, model=model)
+            model = agent.model
+            agents.append(agent)
+        runner = VectorizedRunner(
+            agents=agents,
+            environments=environments,
+            save_path=os.path.join(directory, 'checkpoint'),
+            save_episodes=5,
+            save_async=True,
+            keep_last=2
+        )
+
+        try:
+            # The checkpoint manager is closed after each run, including failed runs
+            runner.run(episodes=20)
+            self.assertIsNone(runner.checkpoint_manager)
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+            def episode_finished(r):
+                raise RuntimeError()
+
+            self.assertRaises(RuntimeError, runner.run, episodes=20, episode_finished=episode_finished)
+            self.assertIsNone(runner.checkpoint_manager)
+        finally:
+            shutil.rmtree(directory)
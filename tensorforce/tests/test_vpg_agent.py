@@ -162,6 +162,41 @@ class TestVPGAgent(unittest.TestCase):
         print('VPG agent (discrete) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
 
+    def test_network_baseline(self):
+        passed = 0
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=False)
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                states=environment.states,
+                actions=environment.actions,
+                baseline=dict(
+                    type="network",
+                    loss_weight=0.5
+                ),
+                network=layered_network_builder([
+                    dict(type='dense', size=32),
+                    dict(type='dense', size=32)
+                ])
+            )
+            agent = VPGAgent(config=config)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(
+                    x / l >= 0.9 for x, l in zip(r.episode_rewards[-100:], r.episode_lengths[-100:]))
+
+            runner.run(episodes=1500, episode_finished=episode_finished)
+            print('VPG agent (network baseline): ' + str(runner.episode))
+
+            if runner.episode < 1500:
+                passed += 1
+
+        print('VPG agent (network baseline) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
     def test_multi_baseline(self):
         passed = 0
 
@@ -203,6 +238,48 @@ class TestVPGAgent(unittest.TestCase):
         print('VPG agent (multi-state/action) passed = {}'.format(passed))
         self.assertTrue(passed >= 4)
 
+    def test_multi_combined_baseline(self):
+        passed = 0
+
+        def network_builder(inputs, **kwargs):
+            layer = layers['dense']
+            state0 = layer(x=layer(x=inputs['state0'], size=32, scope='state0-1'), size=32, scope='state0-2')
+            state1 = layer(x=layer(x=inputs['state1'], size=32, scope='state1-1'), size=32, scope='state1-2')
+            state2 = layer(x=layer(x=inputs['state2'], size=32, scope='state2-1'), size=32, scope='state2-2')
+            return state0 * state1 * state2
+
+        for _ in xrange(5):
+            environment = MinimalTest(definition=[False, (False, 2), (True, 2)])
+            config = Configuration(
+                batch_size=8,
+                learning_rate=0.001,
+                baseline=dict(
+                    type="mlp",
+                    sizes=[32, 32],
+                    epochs=5,
+                    update_batch_size=8,
+                    learning_rate=0.01
+                ),
+                combined_baseline=True,
+                states=environment.states,
+                actions=environment.actions,
+                network=network_builder
+            )
+            agent = VPGAgent(config=config)
+            runner = Runner(agent=agent, environment=environment)
+
+            def episode_finished(r):
+                return r.episode < 100 or not all(x / l >= reward_threshold for x, l in zip(r.episode_rewards[-100:],
+                                                                                            r.episode_lengths[-100:]))
+
+            runner.run(episodes=4000, episode_finished=episode_finished)
+            print('VPG agent (multi-state/action, combined baseline): ' + str(runner.episode))
+            if runner.episode < 4000:
+                passed += 1
+
+        print('VPG agent (multi-state/action, combined baseline) passed = {}'.format(passed))
+        self.assertTrue(passed >= 4)
+
     def test_lstm(self):
         passed = 0
 
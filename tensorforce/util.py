@@ -15,11 +15,19 @@
 
 import importlib
 import logging
+import select
 import numpy as np
+from scipy.signal import lfilter
 import tensorflow as tf
 
 from tensorforce import TensorForceError, Configuration
 
+try:
+    from multiprocessing.connection import wait as _wait
+except ImportError:
+    # Only available from Python 3.3 on, see wait_connections
+    _wait = None
+
 
 epsilon = 1e-6
 
@@ -56,9 +64,31 @@ def shape(x, unknown=-1):
     return tuple(unknown if dims is None else dims for dims in x.get_shape().as_list())
 
 
+def layer_variables(scope):
+    """
+    Collects the trainable weights and bias of a layer, e.g. for exporting a model.
+
+    Args:
+        scope: Full variable scope name of the layer.
+
+    Returns: Dict mapping 'weights' and 'bias' to variable names, and dict of variable names to variables.
+
+    """
+    names = dict()
+    variables = dict()
+    for variable in tf.contrib.framework.get_variables(scope=(scope + '/'), collection=tf.GraphKeys.TRAINABLE_VARIABLES):
+        # Weights are rank >= 2, biases rank 1 (also covers LSTM cell kernel/bias names)
+        key = 'weights' if len(variable.get_shape()) > 1 else 'bias'
+        names[key] = variable.op.name
+        variables[variable.op.name] = variable
+    return names, variables
+
+
 def cumulative_discount(values, terminals, discount, cumulative_start=0.0):
     """
-    Compute cumulative discounts.
+    Compute cumulative discounts. The batch is split into episode segments at terminals, and each
+    segment is discounted by a reverse linear filter.
+
     Args:
         values: Values to discount
         terminals: Booleans indicating terminal states
@@ -71,22 +101,123 @@ def cumulative_discount(values, terminals, discount, cumulative_start=0.0):
     if discount == 0.0:
         return np.asarray(values)
 
+    values = np.asarray(values, dtype=np.float64)
+    terminals = np.asarray(terminals, dtype=np.bool_)
+    discounted_values = np.zeros_like(values)
+
+    # Segments end after each terminal, the last one is bootstrapped with the cumulative start
+    segment_ends = np.flatnonzero(terminals) + 1
+    segment_start = 0
+    for segment_end in np.append(segment_ends, len(values)):
+        if segment_end > segment_start:
+            # y[n] = x[n] + discount * y[n + 1]
+            segment = values[segment_start:segment_end][::-1]
+            discounted_values[segment_start:segment_end] = lfilter([1.0], [1.0, -discount], segment, axis=0)[::-1]
+        segment_start = segment_end
+
     # cumulative start can either be a number or ndarray
     if type(cumulative_start) is np.ndarray:
-        discounted_values = np.zeros((len(values),) + (cumulative_start.shape))
-    else:
-        discounted_values = np.zeros(len(values))
-
-    cumulative = cumulative_start
-    for n, (value, terminal) in reversed(list(enumerate(zip(values, terminals)))):
-        if terminal:
-            cumulative = np.zeros_like(cumulative_start, dtype=np.float32)
-        cumulative = value + cumulative * discount
-        discounted_values[n] = cumulative
+        discounted_values = np.reshape(discounted_values, discounted_values.shape + (1,) * cumulative_start.ndim) + np.zeros_like(cumulative_start)
+    if np.any(cumulative_start):
+        last_segment = len(values) - segment_ends[-1] if len(segment_ends) > 0 else len(values)
+        start_discounts = discount ** np.arange(last_segment, 0, -1, dtype=np.float64)
+        start_discounts = np.reshape(start_discounts, (last_segment,) + (1,) * (discounted_values.ndim - 1))
+        discounted_values[len(values) - last_segment:] += start_discounts * cumulative_start
 
     return discounted_values
 
 
+def tf_cumulative_discount(values, terminals, discount, cumulative_start=0.0):
+    """
+    In-graph variant of `cumulative_discount` for rank 1 tensors.
+
+    Args:
+        values: Values to discount
+        terminals: Booleans indicating terminal states
+        discount: Discount factor
+        cumulative_start: Float or scalar tensor, estimated reward for state t + 1. Default 0.0
+
+    Returns:
+        dicounted_values: The cumulative discounted rewards.
+    """
+    if discount == 0.0:
+        return values
+
+    def discount_step(cumulative, value_terminal):
+        value, terminal = value_terminal
+        return value + tf.where(condition=terminal, x=tf.zeros_like(tensor=cumulative), y=cumulative) * discount
+
+    discounted_values = tf.scan(
+        fn=discount_step,
+        elems=(tf.reverse(tensor=values, axis=(0,)), tf.reverse(tensor=terminals, axis=(0,))),
+        initializer=tf.convert_to_tensor(value=cumulative_start, dtype=values.dtype)
+    )
+    return tf.reverse(tensor=discounted_values, axis=(0,))
+
+
+def tf_vtrace(log_rhos, discounts, rewards, values, rho_clip=1.0, c_clip=1.0):
+    """
+    In-graph V-trace targets and policy gradient advantages (Espeholt et al., 2018) for a batch of
+    trajectories. All tensors have shape (batch, time), values have one more timestep for the
+    bootstrap state after each trajectory.
+
+    Args:
+        log_rhos: Log importance ratios of target and behaviour policy
+        discounts: Discount factors, zero after terminal states
+        rewards: Rewards
+        values: Estimated state values, including the bootstrap value
+        rho_clip: Truncation of importance ratios in the temporal differences
+        c_clip: Truncation of importance ratios in the trace
+
+    Returns:
+        vs: V-trace value targets.
+        advantages: Policy gradient advantages.
+    """
+    rhos = tf.exp(x=log_rhos)
+    clipped_rhos = tf.minimum(x=rhos, y=rho_clip)
+    cs = tf.minimum(x=rhos, y=c_clip)
+    deltas = clipped_rhos * (rewards + discounts * values[:, 1:] - values[:, :-1])
+
+    def vtrace_step(accumulated, delta_discount_c):
+        # v_s - V(x_s) = delta_s + discount_s * c_s * (v_s+1 - V(x_s+1))
+        delta, discount_c = delta_discount_c
+        return delta + discount_c * accumulated
+
+    # Scan backwards over the time dimension
+    vs_minus_values = tf.scan(
+        fn=vtrace_step,
+        elems=(tf.reverse(tensor=tf.transpose(a=deltas), axis=(0,)), tf.reverse(tensor=tf.transpose(a=(discounts * cs)), axis=(0,))),
+        initializer=tf.zeros_like(tensor=values[:, -1]),
+        back_prop=False
+    )
+    vs = tf.transpose(a=tf.reverse(tensor=vs_minus_values, axis=(0,))) + values[:, :-1]
+
+    next_vs = tf.concat(values=(vs[:, 1:], values[:, -1:]), axis=1)
+    advantages = clipped_rhos * (rewards + discounts * next_vs - values[:, :-1])
+    return tf.stop_gradient(input=vs), tf.stop_gradient(input=advantages)
+
+
+def gae_td_residuals(rewards, terminals, state_values, discount):
+    """
+    Compute the temporal difference residuals for general advantage estimation. Residuals are
+    not bootstrapped for terminal states and the last state of the batch.
+
+    Args:
+        rewards: Rewards
+        terminals: Booleans indicating terminal states
+        state_values: Estimated state values
+        discount: Discount factor
+
+    Returns:
+        td_residuals: The temporal difference residuals.
+    """
+    state_values = np.asarray(state_values)
+    bootstrap = np.logical_not(terminals)
+    bootstrap[-1:] = False
+    next_state_values = np.append(state_values[1:], np.zeros_like(state_values[:1]), axis=0)
+    return rewards + np.where(bootstrap, discount * next_state_values - state_values, 0.0)
+
+
 def np_dtype(dtype):
     """Translates dtype specifications in configurations to numpy data types.
     Args:
@@ -171,3 +302,22 @@ def get_object(obj, predefined=None, kwargs=None):
     if kwargs is not None:
         full_kwargs.update(kwargs)
     return obj(**full_kwargs)
+
+
+def wait_connections(connections, timeout=None):
+    """
+    Waits until at least one multiprocessing connection has data to receive or has reached end of
+    file, as `multiprocessing.connection.wait` which is only available from Python 3.3 on. On
+    Python 2, the connections are selected on their file descriptors.
+
+    Args:
+        connections: List of connections
+        timeout: Seconds to wait, None to block
+
+    Returns: List of ready connections
+
+    """
+    if _wait is not None:
+        return _wait(connections, timeout=timeout)
+    readable, _, _ = select.select(connections, [], [], timeout)
+    return readable